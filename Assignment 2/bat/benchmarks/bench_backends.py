@@ -0,0 +1,72 @@
+'''
+Benchmark the JSON and SQLite storage backends.
+
+For each backend, measures the time to start up (loading all data for
+JSON; only opening the database for SQLite, which is then queried as
+patrons and items are looked up), and the time to persist a single loan (a full save for JSON without a journal; a single
+transaction for SQLite).
+
+Run from the bat directory with:
+    python -m benchmarks.bench_backends [number of patrons]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+from src.data_mgmt import DataManager
+from src.sqlite_store import migrate_json
+import src.business_logic as logic
+import src.config as config
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def time_backend(backend):
+    '''
+    Load data with the given backend, then loan an item and persist the
+    change. Returns (load seconds, loan and persist seconds).
+    '''
+    config.STORAGE_BACKEND = backend
+
+    start = time.perf_counter()
+    manager = DataManager()
+    load_time = time.perf_counter() - start
+
+    patron = manager._patron_data[0]
+    patron._outstanding_fees = 0.0
+    item = next(i for i in manager._catalogue_data if i._type == "Book" and patron.find_loan(i._id) is None)
+
+    start = time.perf_counter()
+    logic.process_loan(patron, item, 7, manager)
+    manager.save_changes()
+    loan_time = time.perf_counter() - start
+
+    return load_time, loan_time
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 10))
+    manager = make_data_manager(make_patrons(num_patrons, catalogue), catalogue)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.PATRON_DATA = os.path.join(tmp, "patrons.json")
+        config.CATALOGUE_DATA = os.path.join(tmp, "catalogue.json")
+        config.SQLITE_DATA = os.path.join(tmp, "bat.db")
+        manager.save_patrons()
+        manager.save_catalogue()
+        manager = None
+
+        start = time.perf_counter()
+        migrate_json(config.PATRON_DATA, config.CATALOGUE_DATA, config.SQLITE_DATA)
+        migrate_time = time.perf_counter() - start
+
+        results = {backend: time_backend(backend) for backend in ["json", "sqlite"]}
+
+    print(f"{num_patrons} patrons (migration took {migrate_time:.3f}s)")
+    for backend, (load_time, loan_time) in results.items():
+        print(f"  {backend:6}: load {load_time:.3f}s, loan and persist {loan_time * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,70 @@
+'''
+Benchmark the memory used by patron objects against a memory mapped
+columnar patron file, and the time taken to search each.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_columnar [number of patrons]
+'''
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import src.search as search
+import src.business_logic as logic
+from src.columnar import write_columnar, ColumnarPatrons
+from benchmarks.synthetic import make_catalogue, make_patrons
+
+
+def retained(build):
+    '''
+    Run build, returning (bytes retained, result).
+    '''
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def timed(run):
+    '''
+    Run run, returning (seconds taken, result).
+    '''
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(10)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "patrons.col")
+        object_size, patrons = retained(lambda: make_patrons(num_patrons, catalogue, loans_per_patron=0))
+        write_columnar(path, patrons)
+        columnar_size, columnar = retained(lambda: ColumnarPatrons(path))
+
+        name = patrons[num_patrons // 2]._name.upper()
+        object_name, named = timed(lambda: search.find_patron_by_name(name, patrons))
+        columnar_name, named = timed(lambda: columnar.find_by_name(name))
+        object_scan, found = timed(lambda: search.find_patron_by_age_range(18, 64, patrons))
+        columnar_scan, found = timed(lambda: columnar.find_by_age_range(18, 64))
+        object_check, eligible = timed(lambda: [p for p in patrons if logic.can_use_makerspace(p._age, p._outstanding_fees, p._makerspace_training)])
+        columnar_check, eligible = timed(columnar.find_makerspace_eligible)
+
+        print(f"{num_patrons} patrons (without loans)")
+        print(f"  patron objects: {object_size / 2**20:.1f} MiB in Python objects")
+        print(f"  columnar file:  {columnar_size / 2**20:.3f} MiB in Python objects, {os.path.getsize(path) / 2**20:.1f} MiB mapped")
+        print(f"  name search:       objects {object_name:.3f}s, columnar {columnar_name:.3f}s ({len(named)} found)")
+        print(f"  age range search:  objects {object_scan:.3f}s, columnar {columnar_scan:.3f}s ({len(found)} found)")
+        print(f"  makerspace check:  objects {object_check:.3f}s, columnar {columnar_check:.3f}s ({len(eligible)} eligible)")
+
+        named = found = eligible = None
+        columnar.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,74 @@
+'''
+Profile loading loan-heavy patron data with due dates parsed by
+datetime.strptime (the previous implementation of Patron.load_loans)
+and by parse_due_date.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_due_dates [number of patrons]
+'''
+
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+import src.search as search
+import src.config as config
+from src.loan import Loan
+from src.patron import Patron
+from src.data_mgmt import load_patron_shard
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def load_loans_strptime(self, json_record, library_catalogue, catalogue_index=None):
+    '''
+    The previous implementation of Patron.load_loans.
+    '''
+    loans = []
+    for loan_info in json_record:
+        item_id = int(loan_info["item"])
+        item = search.find_item_by_id(item_id, library_catalogue, catalogue_index)
+        if item is not None:
+            due_date = datetime.strptime(loan_info["due"], '%d/%m/%Y')
+            new_loan = Loan(item, due_date)
+            loans.append(new_loan)
+
+    return loans
+
+
+def profile(load):
+    '''
+    Run load under the profiler, returning (total seconds, seconds in load_loans).
+    '''
+    profiler = cProfile.Profile()
+    profiler.runcall(load)
+    stats = pstats.Stats(profiler)
+    loan_time = sum(cumulative for (filename, line, name), (calls, primitive, total, cumulative, callers)
+                    in stats.stats.items() if name in ("load_loans", "load_loans_strptime"))
+    return stats.total_tt, loan_time
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 20))
+    manager = make_data_manager(make_patrons(num_patrons, catalogue, loans_per_patron=10), catalogue)
+    catalogue_index = manager._catalogue_index
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "patrons.json")
+        config.PATRON_DATA = path
+        manager.save_patrons()
+
+        with mock.patch.object(Patron, 'load_loans', load_loans_strptime):
+            old_total, old_loans = profile(lambda: load_patron_shard(path, catalogue_index))
+        new_total, new_loans = profile(lambda: load_patron_shard(path, catalogue_index))
+
+    print(f"{num_patrons} patrons, 10 loans each (times include profiler overhead)")
+    print(f"  strptime:       total {old_total:.3f}s, load_loans {old_loans:.3f}s")
+    print(f"  parse_due_date: total {new_total:.3f}s, load_loans {new_loans:.3f}s ({old_loans / new_loans:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
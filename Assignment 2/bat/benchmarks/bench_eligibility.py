@@ -0,0 +1,44 @@
+'''
+Benchmark checking loan eligibility for every item type one decision at
+a time with can_borrow, against can_borrow_batch (with NumPy if it is
+installed, otherwise in pure Python).
+
+Run from the bat directory with:
+    python -m benchmarks.bench_eligibility [number of rows]
+'''
+
+import random
+import sys
+import time
+from array import array
+
+import src.batch_eligibility as batch
+from src.business_logic import can_borrow
+
+
+def main(num_rows):
+    rng = random.Random(0)
+    ages = array('h', (rng.randint(0, 100) for i in range(num_rows)))
+    lengths = array('h', (rng.randint(1, 60) for i in range(num_rows)))
+    fees = array('d', (rng.choice([0.0, 0.0, round(rng.uniform(0, 10), 2)]) for i in range(num_rows)))
+    gardening = array('B', (rng.random() < 0.5 for i in range(num_rows)))
+    carpentry = array('B', (rng.random() < 0.5 for i in range(num_rows)))
+    decisions = num_rows * len(batch.ITEM_TYPES)
+
+    start = time.perf_counter()
+    for item_type in batch.ITEM_TYPES:
+        for row in zip(ages, lengths, fees, gardening, carpentry):
+            can_borrow(item_type, *row)
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch.can_borrow_batch(ages, lengths, fees, gardening, carpentry)
+    batched = time.perf_counter() - start
+
+    print(f"{num_rows} rows x {len(batch.ITEM_TYPES)} item types, NumPy {'installed' if batch.numpy is not None else 'not installed'}")
+    print(f"  can_borrow:       {scalar:.3f}s, {decisions / scalar / 1e6:.2f} million decisions/s")
+    print(f"  can_borrow_batch: {batched:.3f}s, {decisions / batched / 1e6:.2f} million decisions/s ({scalar / batched:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
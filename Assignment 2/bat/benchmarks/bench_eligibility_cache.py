@@ -0,0 +1,58 @@
+'''
+Benchmark repeated loan and makerspace checks for the same patrons,
+through the eligibility cache against applying the rules every time.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_eligibility_cache [number of patrons]
+'''
+
+import sys
+import time
+
+import src.business_logic as logic
+from src.eligibility import EligibilityCache
+from benchmarks.synthetic import make_catalogue, make_patrons
+
+# checks made for each patron, as when a patron borrows several items in a session
+CHECKS = [("Book", 14), ("Gardening tool", 7), ("Carpentry tool", 7), ("Book", 14), ("Book", 28)]
+ROUNDS = 20
+
+
+def check_with_rules(patrons):
+    for p in patrons:
+        for item_type, length in CHECKS:
+            logic.can_borrow(item_type, p._age, length, p._outstanding_fees,
+                             p._gardening_tool_training, p._carpentry_tool_training)
+        logic.can_use_makerspace(p._age, p._outstanding_fees, p._makerspace_training)
+
+
+def check_with_cache(patrons, cache):
+    for p in patrons:
+        for item_type, length in CHECKS:
+            cache.can_borrow(p, item_type, length)
+        cache.can_use_makerspace(p)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    patrons = make_patrons(count, make_catalogue(100), 0)
+    cache = EligibilityCache()
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        check_with_rules(patrons)
+    rules_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        check_with_cache(patrons, cache)
+    cache_time = time.perf_counter() - start
+
+    checks = count * (len(CHECKS) + 1) * ROUNDS
+    print(f"{checks} checks of {count} patrons")
+    print(f"rules: {rules_time * 1e9 / checks:.0f}ns per check")
+    print(f"cache: {cache_time * 1e9 / checks:.0f}ns per check ({cache.get_stats()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+'''
+Benchmark the time from starting BAT to finding one patron, with and
+without lazy loading.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_lazy [number of patrons]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+import src.search as search
+from src.data_mgmt import DataManager
+import src.config as config
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def time_first_lookup(name, age):
+    '''
+    Create a data manager and look up one patron, returning the number of seconds taken.
+    '''
+    start = time.perf_counter()
+    manager = DataManager()
+    search.find_patron_by_name_and_age(name, age, manager._patron_data, manager._patron_index)
+    return time.perf_counter() - start
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 10))
+    patrons = make_patrons(num_patrons, catalogue)
+    manager = make_data_manager(patrons, catalogue)
+    target = patrons[num_patrons // 2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.PATRON_DATA = os.path.join(tmp, "patrons.json")
+        config.CATALOGUE_DATA = os.path.join(tmp, "catalogue.json")
+        config.PATRON_OFFSETS_DATA = os.path.join(tmp, "patrons.offsets")
+        config.SNAPSHOT_DATA = None
+        manager.save_patrons()
+        manager.save_catalogue()
+        manager = patrons = None
+
+        eager = time_first_lookup(target._name, target._age)
+        config.LAZY_LOADING = True
+        first = time_first_lookup(target._name, target._age)
+        later = time_first_lookup(target._name, target._age)
+
+    print(f"{num_patrons} patrons, time to start and find one patron")
+    print(f"  load every patron:                      {eager:.3f}s")
+    print(f"  lazy, first start (finds positions):    {first:.3f}s")
+    print(f"  lazy, later start (positions from file): {later:.3f}s ({eager / later:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
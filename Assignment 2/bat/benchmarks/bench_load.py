@@ -0,0 +1,74 @@
+'''
+Benchmark the peak memory used when loading patron data.
+
+Compares loading the whole file with json.load before building patrons
+(the previous implementation of DataManager.load_patrons) with the
+streaming loader used by DataManager, using tracemalloc.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_load [number of patrons]
+'''
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.patron import Patron
+import src.config as config
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def load_patrons_whole_file(path, catalogue, catalogue_index):
+    '''
+    The previous implementation of DataManager.load_patrons, without indexing.
+    '''
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    patrons = []
+    for d in data:
+        new_patron = Patron()
+        new_patron.load_data(d, catalogue, catalogue_index)
+        patrons.append(new_patron)
+
+    return patrons
+
+
+def measure(load):
+    '''
+    Run load, returning (seconds taken, bytes retained, peak bytes allocated, result).
+    '''
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, peak, result
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 10))
+    manager = make_data_manager(make_patrons(num_patrons, catalogue), catalogue)
+    catalogue_index = manager._catalogue_index
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.PATRON_DATA = os.path.join(tmp, "patrons.json")
+        manager.save_patrons()
+        manager._patron_data = None
+
+        old_time, old_retained, old_peak, patrons = measure(lambda: load_patrons_whole_file(config.PATRON_DATA, catalogue, catalogue_index))
+        patrons = None
+        new_time, new_retained, new_peak, patrons = measure(manager.load_patrons)
+
+    print(f"{num_patrons} patrons")
+    print("  (times include tracemalloc overhead; the streaming load also builds the indexes)")
+    print(f"  whole file load: {old_time:.3f}s, retained {old_retained / 2**20:.1f} MiB, peak {old_peak / 2**20:.1f} MiB")
+    print(f"  streaming load:  {new_time:.3f}s, retained {new_retained / 2**20:.1f} MiB, peak {new_peak / 2**20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
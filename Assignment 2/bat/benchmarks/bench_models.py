@@ -0,0 +1,107 @@
+'''
+Benchmark the memory used per Patron, BorrowableItem and Loan, against
+the previous (unslotted) implementations of the classes.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_models [number of objects]
+'''
+
+import sys
+import tracemalloc
+from datetime import date
+
+from src.patron import Patron
+from src.borrowable_item import BorrowableItem
+from src.loan import Loan
+
+
+class DictPatron():
+    '''
+    The previous implementation of Patron's attributes.
+    '''
+    def __init__(self, record):
+        self._loans = []
+        self._id = record["patron_id"]
+        self._name = record["name"]
+        self._age = record["age"]
+        self._outstanding_fees = record["outstanding_fees"]
+        self._gardening_tool_training = record["gardening_tool_training"]
+        self._carpentry_tool_training = record["carpentry_tool_training"]
+        self._makerspace_training = record["makerspace_training"]
+
+
+class DictItem():
+    '''
+    The previous implementation of BorrowableItem's attributes.
+    '''
+    def __init__(self, record):
+        self._id = record["item_id"]
+        self._name = record["item_name"]
+        self._type = record["item_type"]
+        self._year = record["year"]
+        self._number_owned = record["number_owned"]
+        self._on_loan = record["on_loan"]
+
+
+class DictLoan():
+    '''
+    The previous implementation of Loan.
+    '''
+    def __init__(self, item, due_date):
+        self._item = item
+        self._due_date = due_date
+
+
+def patron_record(i):
+    # names and types are built at run time, as they would be when parsed from file
+    return {"patron_id": i, "name": " ".join(["Jane", "Smith"]), "age": 30, "outstanding_fees": 1.5,
+            "gardening_tool_training": True, "carpentry_tool_training": False, "makerspace_training": True, "loans": []}
+
+
+def item_record(i):
+    return {"item_id": i, "item_name": f"Item {i}", "item_type": " ".join(["Gardening", "tool"]),
+            "year": 2000, "number_owned": 2, "on_loan": 0}
+
+
+def new_patron(record):
+    patron = Patron()
+    patron.load_data(record, None, {})
+    return patron
+
+
+def new_item(record):
+    item = BorrowableItem()
+    item.load_data(record)
+    return item
+
+
+def bytes_per_object(make, record, count):
+    '''
+    Create count objects, each from a new record (which is then discarded,
+    as when loading from file), returning the bytes retained per object.
+    '''
+    tracemalloc.start()
+    objects = [make(record(i)) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(objects)
+
+
+def main(count):
+    item = BorrowableItem()
+    due_date = date(2024, 1, 1)
+
+    rows = [
+        ("Patron", bytes_per_object(DictPatron, patron_record, count), bytes_per_object(new_patron, patron_record, count)),
+        ("BorrowableItem", bytes_per_object(DictItem, item_record, count), bytes_per_object(new_item, item_record, count)),
+        ("Loan", bytes_per_object(lambda r: DictLoan(item, due_date), int, count),
+         bytes_per_object(lambda r: Loan(item, due_date), int, count)),
+    ]
+
+    print(f"bytes per object, averaged over {count} objects (including strings and the list holding them)")
+    for name, before, after in rows:
+        print(f"  {name:15} before {before:6.0f}, after {after:6.0f} ({before / after:.1f}x smaller)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,65 @@
+'''
+Benchmark saving patron and catalogue data.
+
+Compares the previous save implementation (one json.dumps call through a
+custom encoder, plus one write, per record) with the streaming writer used
+by DataManager, and checks both produce identical files.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_save [number of patrons]
+'''
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from src.data_mgmt import DataManager
+import src.config as config
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def save_patrons_per_record(patron_data, path):
+    '''
+    The previous implementation of DataManager.save_patrons.
+    '''
+    with open(path, 'w') as f:
+        f.write("[")
+        for p in patron_data:
+            f.write(json.dumps(p, cls=DataManager.PatronEncoder))
+            if p != patron_data[-1]:
+                f.write(",")
+        f.write("]")
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 10))
+    patrons = make_patrons(num_patrons, catalogue)
+
+    manager = make_data_manager(patrons, catalogue)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.json")
+        new_path = os.path.join(tmp, "new.json")
+
+        start = time.perf_counter()
+        save_patrons_per_record(patrons, old_path)
+        old_time = time.perf_counter() - start
+
+        config.PATRON_DATA = new_path
+        start = time.perf_counter()
+        manager.save_patrons()
+        new_time = time.perf_counter() - start
+
+        with open(old_path, 'rb') as f_old, open(new_path, 'rb') as f_new:
+            identical = f_old.read() == f_new.read()
+
+    print(f"{num_patrons} patrons")
+    print(f"  per-record save: {old_time:.3f}s")
+    print(f"  streaming save:  {new_time:.3f}s ({old_time / new_time:.1f}x)")
+    print(f"  identical output: {identical}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,49 @@
+'''
+Benchmark loading patron data from one file against loading it split
+across several files in parallel.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_shards [number of patrons]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+import src.config as config
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def time_load(manager, shards):
+    '''
+    Load patron data split across shards files, returning the number of seconds taken.
+    '''
+    config.PATRON_SHARDS = shards
+    start = time.perf_counter()
+    manager.load_patrons()
+    return time.perf_counter() - start
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 10))
+    manager = make_data_manager(make_patrons(num_patrons, catalogue), catalogue)
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.PATRON_DATA = os.path.join(tmp, "patrons.json")
+        counts = sorted({1, 2, 4, cpus})
+        for shards in counts:
+            config.PATRON_SHARDS = shards
+            manager.save_patrons()
+
+        print(f"{num_patrons} patrons, {cpus} CPUs")
+        single = time_load(manager, 1)
+        print(f"  1 file:   {single:.3f}s")
+        for shards in counts[1:]:
+            elapsed = time_load(manager, shards)
+            print(f"  {shards} files:  {elapsed:.3f}s ({single / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
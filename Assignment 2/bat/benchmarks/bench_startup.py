@@ -0,0 +1,51 @@
+'''
+Benchmark starting BAT with and without the snapshot cache.
+
+Run from the bat directory with:
+    python -m benchmarks.bench_startup [number of patrons]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+from src.data_mgmt import DataManager
+import src.config as config
+from benchmarks.synthetic import make_catalogue, make_patrons, make_data_manager
+
+
+def time_start():
+    '''
+    Create a data manager, returning the number of seconds taken.
+    '''
+    start = time.perf_counter()
+    DataManager()
+    return time.perf_counter() - start
+
+
+def main(num_patrons):
+    catalogue = make_catalogue(max(num_patrons // 10, 10))
+    manager = make_data_manager(make_patrons(num_patrons, catalogue), catalogue)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.PATRON_DATA = os.path.join(tmp, "patrons.json")
+        config.CATALOGUE_DATA = os.path.join(tmp, "catalogue.json")
+        config.SNAPSHOT_DATA = os.path.join(tmp, "snapshot.pickle")
+        manager.save_patrons()
+        manager.save_catalogue()
+        manager = None
+
+        cold = time_start()
+        warm = time_start()
+        config.SNAPSHOT_DATA = None
+        uncached = time_start()
+
+    print(f"{num_patrons} patrons")
+    print(f"  no snapshot:                   {uncached:.3f}s")
+    print(f"  first start (saves snapshot):  {cold:.3f}s")
+    print(f"  later start (loads snapshot):  {warm:.3f}s ({uncached / warm:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
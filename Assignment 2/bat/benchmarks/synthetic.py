@@ -0,0 +1,77 @@
+'''
+Synthetic patron and catalogue data for benchmarks.
+'''
+
+import random
+from datetime import date, timedelta
+
+from src.patron import Patron
+from src.borrowable_item import BorrowableItem
+from src.loan import Loan
+from src.data_mgmt import DataManager
+from src.eligibility import EligibilityCache
+
+FIRST_NAMES = ["Adam", "Betty", "Diane", "Gavin", "Holly", "Isaac", "Jane", "Kay", "Leon", "Mark",
+               "Nancy", "Oscar", "Paul", "Rachel", "Sam", "Tina", "Uma", "Victor", "Wanda", "Zoe"]
+LAST_NAMES = ["Adams", "Brown", "Carter", "Fox", "Hayes", "Jacobs", "King", "Lewis", "Morgan", "Owens",
+              "Price", "Quinn", "Roberts", "Thomas", "Underwood", "Walters", "Wilson", "Zimmerman"]
+ITEM_TYPES = ["Book", "Gardening tool", "Carpentry tool"]
+
+
+def make_catalogue(num_items, seed=0):
+    '''
+    Create a list of num_items borrowable items with IDs 1 to num_items.
+    '''
+    rng = random.Random(seed)
+    items = []
+    for i in range(1, num_items + 1):
+        item = BorrowableItem()
+        item.load_data({
+            "item_id": i,
+            "item_name": f"Item {i}",
+            "item_type": rng.choice(ITEM_TYPES),
+            "year": rng.randint(1950, 2024),
+            "number_owned": rng.randint(1, 10),
+            "on_loan": 0,
+        })
+        items.append(item)
+    return items
+
+
+def make_patrons(num_patrons, catalogue, loans_per_patron=2, seed=0):
+    '''
+    Create a list of num_patrons patrons, each borrowing loans_per_patron
+    random items from the catalogue.
+    '''
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    patrons = []
+    for i in range(1, num_patrons + 1):
+        patron = Patron()
+        patron.set_new_patron_data(i, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.randint(0, 100))
+        patron._outstanding_fees = rng.choice([0.0, 0.0, round(rng.uniform(0, 10), 2)])
+        patron._gardening_tool_training = rng.random() < 0.5
+        patron._carpentry_tool_training = rng.random() < 0.5
+        patron._makerspace_training = rng.random() < 0.5
+        for item in rng.sample(catalogue, loans_per_patron):
+            patron._loans.append(Loan(item, start + timedelta(days=rng.randint(0, 365))))
+        patrons.append(patron)
+    return patrons
+
+
+def make_data_manager(patrons, catalogue):
+    '''
+    Create a data manager holding the given patrons and catalogue, without
+    loading any files or building any indexes.
+    '''
+    manager = DataManager.__new__(DataManager)
+    manager._journal = None
+    manager._store = None
+    manager._patron_data = patrons
+    manager._next_patron_id = max((p._id for p in patrons), default=0) + 1
+    manager._catalogue_data = catalogue
+    manager._catalogue_index = {item._id: item for item in catalogue}
+    manager._patrons_changed = False
+    manager._catalogue_changed = False
+    manager._eligibility = EligibilityCache()
+    return manager
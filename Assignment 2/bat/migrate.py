@@ -0,0 +1,13 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import src.config as config
+from src.sqlite_store import migrate_json
+
+if __name__ == '__main__':
+    num_patrons, num_items = migrate_json(config.PATRON_DATA, config.CATALOGUE_DATA, config.SQLITE_DATA)
+    print(f"Copied {num_patrons} patrons and {num_items} items to {config.SQLITE_DATA}")
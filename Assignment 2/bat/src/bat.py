@@ -7,6 +7,9 @@ Not to be shared or distributed without permission.
 
 from src.bat_ui import BatUI
 from src.data_mgmt import DataManager
+from src.policy import PolicyFile
+import src.business_logic as logic
+import src.config as config
 
 class Bat():
     '''
@@ -18,13 +21,27 @@ class Bat():
         Run BAT.
 
         Creates an instance of the BAT software and a data manager with
-        patron and catalogue data loaded, then runs the main BAT execution
-        loop.
+        patron and catalogue data loaded (and changes from any previous
+        unfinished session replayed from the journal), then runs the main
+        BAT execution loop. If there is a policy file, its policy is
+        applied, and reloaded before each screen if the file has changed.
+        Decision tables are then compiled (from the policy), if turned on
+        in config.
         '''
-        data_manager = DataManager()
+        policy_file = None
+        if config.POLICY_DATA is not None:
+            policy_file = PolicyFile(config.POLICY_DATA)
+        if config.DECISION_TABLES:
+            logic.use_decision_tables()
+        data_manager = DataManager(config.JOURNAL_DATA)
 
         ui = BatUI(data_manager)
         while ui.get_current_screen() != "QUIT":
+            if policy_file is not None:
+                try:
+                    policy_file.reload_if_changed()
+                except (OSError, ValueError) as e:
+                    print(f"Could not reload the policy file, the previous policy is still in use: {e}")
             ui.run_current_screen()
 
         ui.run_current_screen() # run the quit screen
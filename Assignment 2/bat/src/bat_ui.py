@@ -35,7 +35,7 @@ class BatUI():
             Returns:
                 A string representation of the current menu screen. Possible values are
                 "MAIN MENU", "LOAN ITEM", "RETURN ITEM", "SEARCH FOR PATRON", "REGISTER PATRON",
-                "ACCESS MAKERSPACE", and "QUIT".
+                "ACCESS MAKERSPACE", "CHECKOUT ITEMS", and "QUIT".
         '''
         match self._current_screen:
             case self._main_menu:
@@ -50,6 +50,8 @@ class BatUI():
                 return "REGISTER PATRON"
             case self._access_makerspace:
                 return "ACCESS MAKERSPACE"
+            case self._checkout_items:
+                return "CHECKOUT ITEMS"
             case self._quit:
                 return "QUIT"
 
@@ -61,9 +63,10 @@ class BatUI():
 
     def _main_menu(self):
         '''
-        The main menu screen of BAT. Presents the user with 6 options (loan item, return
-        item, search for patron, register patron, validate makerspace access, and quit),
-        and transitions to the menu screen the user selects.
+        The main menu screen of BAT. Presents the user with 7 options (loan item, return
+        item, search for patron, register patron, validate makerspace access, quit, and
+        checkout items), and transitions to the menu screen the user selects. Quit keeps
+        its original number (6), so checkout items is option 7.
 
         Keeps asking the user for a selection until the enter a valid choice.
         '''
@@ -78,9 +81,10 @@ class BatUI():
             4. Register Patron
             5. Validate Makerspace Access
             6. Quit
+            7. Checkout Items
             """)
         
-        choice = user_input.read_integer_range('Enter your choice: ', 1, 6)
+        choice = user_input.read_integer_range('Enter your choice: ', 1, 7)
 
         match choice:
             case 1:
@@ -95,6 +99,8 @@ class BatUI():
                 return self._access_makerspace
             case 6:
                 return self._quit
+            case 7:
+                return self._checkout_items
             case _:
                 return self._main_menu
 
@@ -121,7 +127,7 @@ class BatUI():
             """)
 
         item_id = user_input.read_integer('Enter id of item to loan: ')
-        item = search.find_item_by_id(item_id, self._data_manager._catalogue_data)
+        item = search.find_item_by_id(item_id, self._data_manager._catalogue_data, self._data_manager._catalogue_index)
 
         if item == None:
             print("!!! No such item. CANCELLING LOAN.")
@@ -133,13 +139,13 @@ class BatUI():
                 name = user_input.read_string("Patron's name: ")
                 age = user_input.read_integer("Patron's age: ")
 
-                patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data)
+                patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data, self._data_manager._patron_index)
 
                 if patron == None:
                     print("!!! NO SUCH PATRON. CANCELLING LOAN.")
                 else:
                     length_of_loan = user_input.read_integer_range("How many days is the loan for (1 - 365)? ", 1, 365)
-                    loan_success = logic.process_loan(patron, item, length_of_loan)
+                    loan_success = logic.process_loan(patron, item, length_of_loan, self._data_manager)
 
                     if loan_success:
                         print(f"Loan of {item._name} to {patron._name} successfully recorded")
@@ -176,23 +182,21 @@ class BatUI():
         name = user_input.read_string("Patron's name: ")
         age = user_input.read_integer("Patron's age: ")
 
-        patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data)
+        patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data, self._data_manager._patron_index)
 
         if patron == None:
             print("!!! NO SUCH PATRON. CANCELLING RETURN.")
         else:
             print(f"{patron._name}'s active loans:")
-            loaned_ids = []
             for l in patron._loans:
                 print(l)
-                loaned_ids.append(l._item._id)
 
             choice = user_input.read_integer("Enter the ID of the item to return: ")
-            while choice not in loaned_ids:
+            while patron.find_loan(choice) is None:
                 print(f"That is not an ID of an item currently loaned by {patron._name}")
                 choice = user_input.read_integer("Enter the ID of the item to return: ")
 
-            logic.process_return(patron, choice)
+            logic.process_return(patron, choice, self._data_manager)
             print(f"Return of item from {patron._name} successfully recorded")
 
         return self._main_menu
@@ -201,7 +205,8 @@ class BatUI():
         '''
         The patron search menu screen of BAT. Allows users to enter a name or age (one 
         or the other, not both), and have the details of any patrons with that name or
-        age printed out.
+        age printed out. If no patron has exactly the name entered, patrons with
+        similar names are printed instead.
         '''
         print("""
             --------------------
@@ -220,10 +225,14 @@ class BatUI():
         match choice:
             case 1:
                 name = user_input.read_string("Enter name: ")
-                patrons_found = search.find_patron_by_name(name, self._data_manager._patron_data)
+                patrons_found = self._data_manager.find_patrons_by_name(name)
+                if len(patrons_found) == 0:
+                    patrons_found = search.find_patron_by_similar_name(name, self._data_manager._patron_data, self._data_manager._name_index)
+                    if len(patrons_found) > 0:
+                        print("NO EXACT MATCH. SHOWING PATRONS WITH SIMILAR NAMES.")
             case 2:
                 age = user_input.read_integer("Enter age: ")
-                patrons_found = search.find_patron_by_age(age, self._data_manager._patron_data)
+                patrons_found = self._data_manager.find_patrons_by_age(age)
             case 3:
                 return self._main_menu
             case _:
@@ -277,12 +286,12 @@ class BatUI():
         name = user_input.read_string("Enter name: ")
         age = user_input.read_integer("Enter age: ")
 
-        patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data)
+        patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data, self._data_manager._patron_index)
 
         if (patron == None):
             print("!!! NO SUCH PATRON")
         else:
-            allowed = logic.can_use_makerspace(patron._age, patron._outstanding_fees, patron._makerspace_training)
+            allowed = self._data_manager._eligibility.can_use_makerspace(patron)
             if allowed:
                 print(f"{patron._name} is allowed to use the makerspace")
             else:
@@ -290,13 +299,77 @@ class BatUI():
 
         return self._main_menu
 
+    def _checkout_items(self):
+        '''
+        The checkout items menu screen of BAT. Follows the process:
+        - ask the user for the name and age of the patron loaning the items
+        - repeatedly ask the user for the ID of an item to add to the checkout
+          (or 0 to finish), to confirm if that is the correct item, and for the
+          length of the loan in days (from 1 - 365 inclusive)
+        - loan every item if the patron is allowed to loan all of them
+
+        If a patron with the given name and age can't be found in the patron
+        database, or no items are added, return to the main menu screen. If an
+        item with a given ID can't be found, or is already in the checkout, it
+        is not added.
+
+        Prints a message saying whether the items were loaned (listing those the
+        patron is not able to borrow if they were not), then returns to the main
+        menu screen.
+        '''
+        print("""
+            -----------------------
+            | BAT: Checkout Items |
+            -----------------------
+            """)
+
+        name = user_input.read_string("Patron's name: ")
+        age = user_input.read_integer("Patron's age: ")
+
+        patron = search.find_patron_by_name_and_age(name, age, self._data_manager._patron_data, self._data_manager._patron_index)
+
+        if patron == None:
+            print("!!! NO SUCH PATRON. CANCELLING CHECKOUT.")
+            return self._main_menu
+
+        checkout = []
+        item_id = user_input.read_integer('Enter id of item to add (0 to finish): ')
+        while item_id != 0:
+            item = search.find_item_by_id(item_id, self._data_manager._catalogue_data, self._data_manager._catalogue_index)
+            if item == None:
+                print("!!! No such item.")
+            elif any(added is item for added, _ in checkout):
+                print("!!! That item is already in the checkout.")
+            else:
+                print(f"Found {item._type}: {item._name} ({item._year})")
+                choice = user_input.read_bool("Is this the item (y/n)? ")
+                if choice == 'y':
+                    length_of_loan = user_input.read_integer_range("How many days is the loan for (1 - 365)? ", 1, 365)
+                    checkout.append((item, length_of_loan))
+            item_id = user_input.read_integer('Enter id of item to add (0 to finish): ')
+
+        if len(checkout) == 0:
+            print("No items added. CANCELLING CHECKOUT.")
+            return self._main_menu
+
+        refused = logic.process_loans(patron, checkout, self._data_manager)
+
+        if len(refused) == 0:
+            print(f"Loan of {len(checkout)} items to {patron._name} successfully recorded")
+        else:
+            print(f"Sorry, {patron._name} is not able to borrow:")
+            for item, length_of_loan in refused:
+                print(f"    {item._name} for {length_of_loan} days")
+            print("NO ITEMS LOANED")
+
+        return self._main_menu
+
     def _quit(self):
         '''
-        The quit menu screen of BAT. Saves the current state of patron and
-        catalogue data, overriting any existing data files.
+        The quit menu screen of BAT. Makes sure any changes to patron and
+        catalogue data are saved. If nothing has changed, nothing is saved.
         '''
         print("Bye...")
-        self._data_manager.save_patrons()
-        self._data_manager.save_catalogue()
+        self._data_manager.save_changes()
 
         return self._quit
\ No newline at end of file
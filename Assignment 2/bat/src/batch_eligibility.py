@@ -0,0 +1,244 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+from bisect import bisect_right
+
+import src.business_logic as logic
+from src.business_logic import calculate_discount
+
+# NumPy is optional: without it, batches are checked in pure Python
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the item types in an eligibility matrix, in column order, for the rules
+# in business_logic (under a policy, the policy's item types are used)
+ITEM_TYPES = ("Book", "Gardening tool", "Carpentry tool")
+
+def can_borrow_batch(ages, lengths_of_loans, outstanding_fees, gardening_tool_training, carpentry_tool_training):
+    '''
+    Determine whether many loans can occur, for every type of item.
+    Each row is one patron wanting one length of loan; the result for a row
+    and item type is the same as can_borrow gives for them, under the policy
+    applied (see business_logic.use_policy), if any.
+    With NumPy installed, the rows are checked with array operations;
+    otherwise each patron's discount is calculated once and shared by the
+    item types.
+        Args:
+            ages: the ages of the patrons (a sequence of int, e.g. a list, array, or NumPy array).
+            lengths_of_loans: the number of days each patron wants to loan an item for.
+            outstanding_fees: the fees each patron owes, before any discounts are considered.
+            gardening_tool_training: whether each patron has completed the gardening tool training.
+            carpentry_tool_training: whether each patron has completed the carpentry tool training.
+
+        Returns:
+            a dict mapping each type of item which can be loaned (ITEM_TYPES,
+            or the policy's item types) to a column of bools (a NumPy array
+            if NumPy is installed, otherwise a list), one for each row.
+
+        Raises:
+            TypeError: if can_borrow would raise TypeError for a row with a
+                negative age, for any type of item. The rules in
+                business_logic calculate the discount for gardening and
+                carpentry tools before checking anything else, so any negative
+                age is an error; a policy's rules first refuse loans longer than
+                the type of item allows, so a negative age is only an error
+                for a loan short enough for some type of item.
+            ValueError: if the columns are not all the same length.
+    '''
+    columns = (ages, lengths_of_loans, outstanding_fees, gardening_tool_training, carpentry_tool_training)
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("columns must all be the same length")
+
+    if logic._policy is not None:
+        if numpy is not None:
+            return _can_borrow_policy_numpy(logic._policy._limits, *columns)
+        return _can_borrow_policy_python(logic._policy._limits, *columns)
+    if numpy is not None:
+        return _can_borrow_numpy(*columns)
+    return _can_borrow_python(*columns)
+
+
+def can_use_makerspace_batch(ages, outstanding_fees, makerspace_training):
+    '''
+    Determine whether many patrons can use the makerspace. The result for
+    each patron is the same as can_use_makerspace gives for them, under the
+    policy applied (see business_logic.use_policy), if any.
+        Args:
+            ages: the ages of the patrons (a sequence of int, e.g. a list, array, or NumPy array).
+            outstanding_fees: the fees each patron owes, before any discounts are considered.
+            makerspace_training: whether each patron has completed the makerspace training.
+
+        Returns:
+            a column of bools (a NumPy array if NumPy is installed, otherwise
+            a list), one for each patron.
+
+        Raises:
+            ValueError: if the columns are not all the same length.
+    '''
+    if len({len(ages), len(outstanding_fees), len(makerspace_training)}) > 1:
+        raise ValueError("columns must all be the same length")
+
+    if logic._policy is not None:
+        return _can_use_makerspace_policy(logic._policy._limits, ages, outstanding_fees, makerspace_training)
+    if numpy is not None:
+        ages = numpy.asarray(ages, dtype=numpy.int64)
+        fees = numpy.asarray(outstanding_fees, dtype=numpy.float64)
+        adult = (ages >= 18) & (ages < 90)
+        fees_owed = fees - fees * (_discounts_numpy(ages) / 100)
+        return numpy.asarray(makerspace_training, dtype=bool) & adult & ~(fees_owed > 0)
+
+    result = []
+    for age, fees, training in zip(ages, outstanding_fees, makerspace_training):
+        if (18 <= age < 90) and training:
+            result.append(not (fees - fees * (calculate_discount(age) / 100) > 0))
+        else:
+            result.append(False)
+
+    return result
+
+
+def _discounts_numpy(ages):
+    '''
+    Calculate the discount for each of an array of (non-negative) ages, as calculate_discount does.
+    '''
+    return numpy.select([ages < 50, ages < 65, ages < 90], [0, 10, 15], 100)
+
+
+def _can_borrow_numpy(ages, lengths_of_loans, outstanding_fees, gardening_tool_training, carpentry_tool_training):
+    '''
+    Check a batch of loans with NumPy array operations.
+    '''
+    ages = numpy.asarray(ages, dtype=numpy.int64)
+    lengths = numpy.asarray(lengths_of_loans, dtype=numpy.int64)
+    fees = numpy.asarray(outstanding_fees, dtype=numpy.float64)
+    # the gardening and carpentry tool rules calculate the discount first, so
+    # any negative age is an error (even for a book loan refused for its length)
+    if (ages < 0).any():
+        raise TypeError("can not calculate a discount for a negative age")
+
+    # the same arithmetic as the scalar functions, so results match exactly
+    no_fees_owed = ~(fees - fees * (_discounts_numpy(ages) / 100) > 0)
+
+    return {
+        "Book": (lengths < 56) & no_fees_owed,
+        "Gardening tool": no_fees_owed & (lengths <= 28) & numpy.asarray(gardening_tool_training, dtype=bool),
+        "Carpentry tool": no_fees_owed & (ages > 18) & (ages < 90) & (lengths <= 14)
+                          & numpy.asarray(carpentry_tool_training, dtype=bool),
+    }
+
+
+def _can_borrow_python(ages, lengths_of_loans, outstanding_fees, gardening_tool_training, carpentry_tool_training):
+    '''
+    Check a batch of loans in pure Python.
+    '''
+    books = []
+    gardening_tools = []
+    carpentry_tools = []
+    for age, length, fees, gardening, carpentry in zip(ages, lengths_of_loans, outstanding_fees,
+                                                       gardening_tool_training, carpentry_tool_training):
+        # the gardening and carpentry tool rules calculate the discount first, so
+        # any negative age is an error (even for a book loan refused for its length)
+        if age < 0:
+            raise TypeError("can not calculate a discount for a negative age")
+        no_fees_owed = not (fees - fees * (calculate_discount(age) / 100) > 0)
+        books.append((length < 56) and no_fees_owed)
+        gardening_tools.append(no_fees_owed and (length <= 28) and bool(gardening))
+        carpentry_tools.append(no_fees_owed and (18 < age < 90) and (length <= 14) and bool(carpentry))
+
+    return {"Book": books, "Gardening tool": gardening_tools, "Carpentry tool": carpentry_tools}
+
+
+def _can_borrow_policy_numpy(limits, ages, lengths_of_loans, outstanding_fees, gardening_tool_training, carpentry_tool_training):
+    '''
+    Check a batch of loans against a policy's limits (see policy.Policy) with NumPy array operations.
+    '''
+    ages = numpy.asarray(ages, dtype=numpy.int64)
+    lengths = numpy.asarray(lengths_of_loans, dtype=numpy.int64)
+    fees = numpy.asarray(outstanding_fees, dtype=numpy.float64)
+    gardening = numpy.asarray(gardening_tool_training, dtype=bool)
+    carpentry = numpy.asarray(carpentry_tool_training, dtype=bool)
+    # as in the scalar rules, loans which are too long are refused before the age is checked
+    short_enough = numpy.zeros(len(lengths), dtype=bool)
+    for max_days, *_ in limits["item_types"].values():
+        short_enough |= lengths <= max_days
+    if ((ages < 0) & short_enough).any():
+        raise TypeError("can not calculate a discount for a negative age")
+
+    # rows with a negative age are refused by the length check in every column
+    no_fees_owed = ~(fees - fees * (_policy_discounts_numpy(limits, ages) / 100) > 0)
+    result = {}
+    for item_type, (max_days, min_age, max_age, needs_gardening, needs_carpentry) in limits["item_types"].items():
+        column = no_fees_owed & (lengths <= max_days) & (ages >= min_age) & (ages <= max_age)
+        if needs_gardening:
+            column &= gardening
+        if needs_carpentry:
+            column &= carpentry
+        result[item_type] = column
+
+    return result
+
+
+def _can_borrow_policy_python(limits, ages, lengths_of_loans, outstanding_fees, gardening_tool_training, carpentry_tool_training):
+    '''
+    Check a batch of loans against a policy's limits (see policy.Policy) in pure Python.
+    '''
+    min_ages, percentages = limits["discounts"]
+    item_limits = list(limits["item_types"].items())
+    result = {item_type: [] for item_type, _ in item_limits}
+    for age, length, fees, gardening, carpentry in zip(ages, lengths_of_loans, outstanding_fees,
+                                                       gardening_tool_training, carpentry_tool_training):
+        if age < 0:
+            # as in the scalar rules, loans which are too long are refused before the age is checked
+            if any(length <= max_days for _, (max_days, *_) in item_limits):
+                raise TypeError("can not calculate a discount for a negative age")
+            for item_type, _ in item_limits:
+                result[item_type].append(False)
+            continue
+        no_fees_owed = not (fees - fees * (percentages[bisect_right(min_ages, age)] / 100) > 0)
+        for item_type, (max_days, min_age, max_age, needs_gardening, needs_carpentry) in item_limits:
+            result[item_type].append(no_fees_owed and (length <= max_days) and (min_age <= age <= max_age)
+                                     and (bool(gardening) or not needs_gardening)
+                                     and (bool(carpentry) or not needs_carpentry))
+
+    return result
+
+
+def _can_use_makerspace_policy(limits, ages, outstanding_fees, makerspace_training):
+    '''
+    Check whether many patrons can use the makerspace against a policy's
+    limits (see policy.Policy), with NumPy if it is installed.
+    '''
+    min_age, max_age, needs_training = limits["makerspace"]
+    if numpy is not None:
+        ages = numpy.asarray(ages, dtype=numpy.int64)
+        fees = numpy.asarray(outstanding_fees, dtype=numpy.float64)
+        no_fees_owed = ~(fees - fees * (_policy_discounts_numpy(limits, ages) / 100) > 0)
+        result = (ages >= min_age) & (ages <= max_age) & no_fees_owed
+        if needs_training:
+            result &= numpy.asarray(makerspace_training, dtype=bool)
+        return result
+
+    min_ages, percentages = limits["discounts"]
+    result = []
+    for age, fees, training in zip(ages, outstanding_fees, makerspace_training):
+        if (min_age <= age <= max_age) and (training or not needs_training):
+            result.append(not (fees - fees * (percentages[bisect_right(min_ages, age)] / 100) > 0))
+        else:
+            result.append(False)
+
+    return result
+
+
+def _policy_discounts_numpy(limits, ages):
+    '''
+    Calculate the discount for each of an array of ages under a policy's limits (see policy.Policy).
+    '''
+    min_ages, percentages = limits["discounts"]
+    bands = numpy.searchsorted(numpy.asarray(min_ages, dtype=numpy.int64), ages, side="right")
+    return numpy.asarray(percentages)[bands]
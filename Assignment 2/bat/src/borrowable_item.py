@@ -6,6 +6,7 @@ Not to be shared or distributed without permission.
 '''
 
 import json
+import sys
 
 class BorrowableItem():
     '''
@@ -18,7 +19,11 @@ class BorrowableItem():
     - a year
     - a number owned by AAL
     - a number currently out on loan
+
+    Items are slotted to keep the memory used per item small.
     '''
+    __slots__ = ("_id", "_name", "_type", "_year", "_number_owned", "_on_loan")
+
     def __init__(self):
         '''
         Initialise a new borrowable item with no data.
@@ -34,11 +39,11 @@ class BorrowableItem():
         '''
         Load information about a borrowable item from JSON.
         Sets the item's ID, name, type, year, number owned, and
-        number on loan.
+        number on loan. The type is interned, as there are only a few.
         '''
         self._id = int(json_record["item_id"])
         self._name = json_record["item_name"]
-        self._type = json_record["item_type"]
+        self._type = sys.intern(json_record["item_type"])
         self._year = int(json_record["year"])
         self._number_owned = int(json_record["number_owned"])
         self._on_loan = int(json_record["on_loan"])
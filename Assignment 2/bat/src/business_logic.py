@@ -9,6 +9,142 @@ from datetime import date, timedelta
 
 from src.loan import Loan
 
+# the input domain covered by the decision tables; checks outside it
+# (and with inputs of other types) are made by applying the rules instead
+TABLE_MAX_AGE = 100
+TABLE_MAX_LENGTH_OF_LOAN = 365
+
+# tables of every decision in the domain, while decision tables are on
+# (see use_decision_tables): a table for each type of item which can be
+# loaned, and the makerspace table
+_decision_tables = None
+_makerspace_table = None
+
+# the rule for each type of item which can be loaned, used by can_borrow,
+# and the makerspace rule, used by can_use_makerspace, of the policy
+# applied (see use_policy), and the policy itself (whose limits are used
+# by src.batch_eligibility), or None to use the rules in this module
+_loan_rules = None
+_makerspace_rule = None
+_discount_rule = None
+_policy = None
+# counts the policies applied (and decision tables compiled), so state
+# derived under previous rules can be recognised (see src.eligibility)
+_policy_generation = 0
+
+def use_policy(policy):
+    '''
+    Apply the rules of a compiled policy to can_borrow and
+    can_use_makerspace, in place of the rules in this module. If decision
+    tables are on, they are compiled again from the policy.
+        Args:
+            policy (Policy): the policy to apply (see src.policy), or None
+                to go back to the rules in this module.
+    '''
+    global _loan_rules, _makerspace_rule, _discount_rule, _policy, _policy_generation
+    _policy = policy
+    if policy is None:
+        _loan_rules = _makerspace_rule = _discount_rule = None
+    else:
+        _loan_rules = policy._loan_rules
+        _makerspace_rule = policy._makerspace_rule
+        _discount_rule = policy._discount
+    _policy_generation += 1
+    if _decision_tables is not None:
+        use_decision_tables()
+
+
+def loan_item_types():
+    '''
+    Get the types of item which can be loaned, under the policy applied (see use_policy).
+
+        Returns:
+            a list of item types.
+    '''
+    if _loan_rules is not None:
+        return list(_loan_rules)
+    return ["Book", "Gardening tool", "Carpentry tool"]
+
+
+def patron_discount(age):
+    '''
+    Calculate the discount a patron is entitled to under the policy applied
+    (see use_policy), or as calculate_discount does if there is none.
+        Args:
+            age (int): a patron's age in years.
+        Returns:
+            The discount as a whole number percentage, or "ERROR" if the age is negative.
+    '''
+    if _discount_rule is not None:
+        return _discount_rule(age)
+    return calculate_discount(age)
+
+
+def use_decision_tables(enabled=True):
+    '''
+    Turn decision tables on or off. The tables are compiled from can_borrow
+    and can_use_makerspace, so they follow the policy applied (see
+    use_policy), and hold every decision for an age from 0 to TABLE_MAX_AGE
+    and a loan length from 1 to TABLE_MAX_LENGTH_OF_LOAN. While on, the
+    eligibility cache (see src.eligibility) finds each patron's row of the
+    tables once (see decision_table_row), and reads their decisions from it
+    instead of applying the rules.
+        Args:
+            enabled (bool): whether to use decision tables.
+    '''
+    global _decision_tables, _makerspace_table, _policy_generation
+    _decision_tables = _makerspace_table = None
+    _policy_generation += 1
+    if not enabled:
+        return
+
+    tables = {item_type: bytearray() for item_type in loan_item_types()}
+    makerspace = bytearray()
+    # every fee owed after the discount arithmetic gives the same
+    # decisions, as does every fee not owed, so fees are represented by
+    # 1.0 and 0.0
+    for age in range(TABLE_MAX_AGE + 1):
+        for fees in (0.0, 1.0):
+            for training in (False, True):
+                makerspace.append(can_use_makerspace(age, fees, training))
+            for gardening_tool_training in (False, True):
+                for carpentry_tool_training in (False, True):
+                    for item_type, table in tables.items():
+                        for length in range(1, TABLE_MAX_LENGTH_OF_LOAN + 1):
+                            table.append(can_borrow(item_type, age, length, fees,
+                                                    gardening_tool_training, carpentry_tool_training))
+
+    _decision_tables = {item_type: bytes(table) for item_type, table in tables.items()}
+    _makerspace_table = bytes(makerspace)
+
+
+def decision_table_row(patron_age, fees_owed, gardening_tool_training, carpentry_tool_training, makerspace_training):
+    '''
+    Find a patron's decisions in the decision tables (see use_decision_tables).
+        Args:
+            patron_age (int): the age of the patron, in years.
+            fees_owed (float): the fees the patron owes after discounts are
+                considered, under the policy applied (see patron_discount).
+            gardening_tool_training (bool): whether the patron has completed the gardening tool training or not.
+            carpentry_tool_training (bool): whether the patron has completed the carpentry tool training or not.
+            makerspace_training (bool): whether the patron has completed the makerspace training or not.
+
+        Returns:
+            a (row, makerspace decision) tuple, where the decision for a loan
+            of n days (from 1 to TABLE_MAX_LENGTH_OF_LOAN) is at position
+            row + n of the table for the type of item, or None if decision
+            tables are off or the patron is outside the tables' domain.
+    '''
+    if (_decision_tables is None) or (type(patron_age) is not int) or not (0 <= patron_age <= TABLE_MAX_AGE) \
+            or (type(fees_owed) not in (int, float)) or (type(gardening_tool_training) is not bool) \
+            or (type(carpentry_tool_training) is not bool) or (type(makerspace_training) is not bool):
+        return None
+
+    position = patron_age * 2 + (fees_owed > 0)
+    row = ((position * 2 + gardening_tool_training) * 2 + carpentry_tool_training) * TABLE_MAX_LENGTH_OF_LOAN - 1
+    return row, _makerspace_table[position * 2 + makerspace_training] == 1
+
+
 def type_of_patron(age):
     '''
     Return a string describing the type of patron based on their age.
@@ -44,7 +180,14 @@ def can_borrow(type_of_item, patron_age, length_of_loan, outstanding_fees, garde
             carpentry_tool_training (bool): whether the patron has completed the carpentry tool training or not.
         Returns:
             True if the patron is allowed to borrow the item, otherwise false. False if an invalid item type is provided.
+            If a policy is applied (see use_policy), its rule for the type of item is used.
     '''
+    if _loan_rules is not None:
+        rule = _loan_rules.get(type_of_item)
+        if rule is None:
+            return False
+        return rule(patron_age, length_of_loan, outstanding_fees, gardening_tool_training, carpentry_tool_training)
+
     if type_of_item == "Book":
         return can_borrow_book(patron_age, length_of_loan, outstanding_fees)
     elif type_of_item == "Gardening tool":
@@ -143,8 +286,11 @@ def can_use_makerspace(patron_age, outstanding_fees, makerspace_training):
             True if the patron is allowed to use the makerspace, otherwise false.
             A patron is allowed to use the makerspace if they have completed the training, have no
             fees owed (i.e., fees to pay after discounts are considered), and are classified as
-            an adult.
+            an adult. If a policy is applied (see use_policy), its makerspace rule is used.
     '''
+    if _makerspace_rule is not None:
+        return _makerspace_rule(patron_age, outstanding_fees, makerspace_training)
+
     result = makerspace_training
 
     patron_type = type_of_patron(patron_age)
@@ -189,7 +335,7 @@ def calculate_discount(age):
         return 100
 
 
-def process_return(patron, item_id):
+def process_return(patron, item_id, data_manager=None):
     '''
     Process the return of an item.
     Removes the loan from the patron, and adjusts the "on loan" count for the item.
@@ -197,13 +343,16 @@ def process_return(patron, item_id):
             patron (Patron): the patron returning the item. It is assumed
                 this is the patron who loaned the item.
             item_id (int): the ID of the item being returned.
+            data_manager (DataManager): optional data manager to record the return with.
     '''
     to_return = patron.find_loan(item_id)
     to_return._item._on_loan - 1
     patron._loans.remove(to_return)
+    if data_manager is not None:
+        data_manager.record_return(patron, to_return)
 
 
-def process_loan(patron, item, length_of_loan):
+def process_loan(patron, item, length_of_loan, data_manager=None):
     '''
     Process the loan of an item.
     Checks that the item can be borrowed, and if so, creates a loan with an appropriate due date,
@@ -213,15 +362,83 @@ def process_loan(patron, item, length_of_loan):
                 this the patron does not already have an active loan for the item.
             item (BorrowableItem): the item the patron wants to loan.
             length_of_loan (int): the number of days the patron wants to borrow the item for.
+            data_manager (DataManager): optional data manager to record the loan with (whose
+                eligibility cache is then used to check the loan).
         Returns:
             True if the loan was successful, or false if it could not be completed.
     '''
     due_date = date.today() + timedelta(days=length_of_loan)
-    
-    if can_borrow(item._type, patron._age, length_of_loan, patron._outstanding_fees, patron._gardening_tool_training, patron._carpentry_tool_training):
+
+    if data_manager is not None:
+        # repeat checks for the patron are answered by the data manager's cache
+        allowed = data_manager._eligibility.can_borrow(patron, item._type, length_of_loan)
+    else:
+        allowed = can_borrow(item._type, patron._age, length_of_loan, patron._outstanding_fees, patron._gardening_tool_training, patron._carpentry_tool_training)
+
+    if allowed:
         new_loan = Loan(item, due_date)
         patron._loans.append(new_loan)
         item._on_loan += 1
+        if data_manager is not None:
+            data_manager.record_loan(patron, new_loan)
         return True
     else:
-        return False
\ No newline at end of file
+        return False
+
+def process_loans(patron, loans, data_manager=None):
+    '''
+    Process the loan of many items to a patron at once (e.g., a checkout of
+    several items). Every loan is checked as by process_loan before any is
+    made, and the loans are made all together or not at all. The loans are
+    recorded with the data manager as one change.
+        Args:
+            patron (Patron): the patron borrowing the items.
+            loans: a list of (item, length of loan) tuples, one for each item
+                the patron wants to borrow.
+            data_manager (DataManager): optional data manager to record the loans with (whose
+                eligibility cache is then used to check the loans).
+        Returns:
+            a list of the (item, length of loan) tuples which can not be loaned: those the
+            patron is not allowed to borrow, already has on loan, or has asked for more than
+            once. If the list is empty every loan was made; otherwise no loans were made.
+    '''
+    refused = []
+    item_ids = set()
+    decisions = {}
+    for item, length_of_loan in loans:
+        if (item._id in item_ids) or (patron.find_loan(item._id) is not None):
+            refused.append((item, length_of_loan))
+            continue
+        item_ids.add(item._id)
+
+        # a decision is only made once for each type of item and length of loan
+        decision_key = (item._type, length_of_loan)
+        if decision_key not in decisions:
+            if data_manager is not None:
+                decisions[decision_key] = data_manager._eligibility.can_borrow(patron, item._type, length_of_loan)
+            else:
+                decisions[decision_key] = can_borrow(item._type, patron._age, length_of_loan, patron._outstanding_fees,
+                                                     patron._gardening_tool_training, patron._carpentry_tool_training)
+        if not decisions[decision_key]:
+            refused.append((item, length_of_loan))
+
+    if (len(refused) > 0) or (len(loans) == 0):
+        return refused
+
+    today = date.today()
+    new_loans = [Loan(item, today + timedelta(days=length_of_loan)) for item, length_of_loan in loans]
+    for new_loan in new_loans:
+        patron._loans.append(new_loan)
+        new_loan._item._on_loan += 1
+
+    if data_manager is not None:
+        try:
+            data_manager.record_loans(patron, new_loans)
+        except:
+            # undo the loans, so that none are made
+            for new_loan in new_loans:
+                patron._loans.remove(new_loan)
+                new_loan._item._on_loan -= 1
+            raise
+
+    return refused
@@ -0,0 +1,271 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+
+from src.patron import GARDENING_TOOL_TRAINING, CARPENTRY_TOOL_TRAINING, MAKERSPACE_TRAINING
+import src.batch_eligibility as batch
+
+# identifies a columnar patron file, and the layout of its header
+MAGIC = b"BATCOL2\0"
+HEADER = struct.Struct("=8sQQQ")
+
+# separates the names in the casefolded name heap
+NAME_SEPARATOR = b"\0"
+
+def write_columnar(path, patrons):
+    '''
+    Save patron details (but not loans) to a file in columnar format.
+
+    The file holds a header (MAGIC, number of patrons, sizes of the two name
+    heaps) followed by one fixed width column per attribute, in native byte
+    order: IDs (int64), outstanding fees (float64), name offsets and folded
+    name offsets (uint64, one more than the number of patrons), ages (int16)
+    and training (uint8 bit flags, see src.patron). Then come the UTF-8
+    encoded names one after another (the name heap), and the casefolded
+    names, each preceded and followed by NAME_SEPARATOR (the folded name
+    heap), which name searches compare bytes against.
+    The file is written to a temporary file which then replaces any
+    existing file, so a ColumnarPatrons open on it can still be read.
+        Args:
+            path (string): the file to write. Overwrites any existing data.
+            patrons: the patrons to save.
+    '''
+    ids = array('q')
+    fees = array('d')
+    offsets = array('Q', [0])
+    folded_offsets = array('Q')
+    ages = array('h')
+    training = array('B')
+    heap = bytearray()
+    folded_heap = bytearray(NAME_SEPARATOR)
+
+    for p in patrons:
+        ids.append(p._id)
+        fees.append(p._outstanding_fees)
+        heap += p._name.encode()
+        offsets.append(len(heap))
+        folded_offsets.append(len(folded_heap))
+        folded_heap += p._name.casefold().encode()
+        folded_heap += NAME_SEPARATOR
+        ages.append(p._age)
+        training.append((GARDENING_TOOL_TRAINING if p._gardening_tool_training else 0)
+                        | (CARPENTRY_TOOL_TRAINING if p._carpentry_tool_training else 0)
+                        | (MAKERSPACE_TRAINING if p._makerspace_training else 0))
+
+    folded_offsets.append(len(folded_heap))
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(ids), len(heap), len(folded_heap)))
+        for column in (ids, fees, offsets, folded_offsets, ages, training):
+            f.write(column.tobytes())
+        f.write(heap)
+        f.write(folded_heap)
+    os.replace(temp_path, path)
+
+
+class ColumnarPatrons():
+    '''
+    Read only patron details (but not loans) from a columnar file written
+    by write_columnar.
+
+    The file is memory mapped, and each column is read in place, so
+    opening the file does not create any per patron objects. Searches and
+    eligibility checks run over the columns; PatronView objects are only
+    created for the patrons they return.
+    '''
+    def __init__(self, path):
+        '''
+        Open a columnar patron file.
+            Args:
+                path (string): the file to open.
+
+            Raises:
+                ValueError: if the file is not a columnar patron file.
+        '''
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, heap_size, folded_heap_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError("not a columnar patron file")
+
+        self._count = count
+        view = memoryview(self._map)
+        pos = HEADER.size
+        columns = []
+        for code, length in (('q', count), ('d', count), ('Q', count + 1), ('Q', count + 1), ('h', count), ('B', count)):
+            size = array(code).itemsize * length
+            columns.append(view[pos:pos + size].cast(code))
+            pos += size
+        self._ids, self._fees, self._offsets, self._folded_offsets, self._ages, self._training = columns
+        self._heap = view[pos:pos + heap_size]
+        # the folded name heap is searched in the map itself, by position
+        self._folded_start = pos + heap_size
+        self._folded_end = self._folded_start + folded_heap_size
+
+    def __len__(self):
+        '''
+        Get the number of patrons.
+        '''
+        return self._count
+
+    def __getitem__(self, row):
+        '''
+        Get a view of the patron in a row (0 to len - 1).
+        '''
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return PatronView(self, row)
+
+    def __iter__(self):
+        '''
+        Yield a view of each patron, in order.
+        '''
+        for row in range(self._count):
+            yield PatronView(self, row)
+
+    def name(self, row):
+        '''
+        Get the name of the patron in a row.
+        '''
+        return bytes(self._heap[self._offsets[row]:self._offsets[row + 1]]).decode()
+
+    def _name_rows(self, name):
+        '''
+        Yield the row of each patron with the given name (case insensitive),
+        in order, by searching the folded name heap for the encoded name
+        between separators. No names are decoded.
+        '''
+        folded = name.casefold().encode()
+        needle = NAME_SEPARATOR + folded + NAME_SEPARATOR
+        pos = self._map.find(needle, self._folded_start, self._folded_end)
+        while pos != -1:
+            start = pos + 1 - self._folded_start
+            row = bisect_right(self._folded_offsets, start) - 1
+            # a name holding the separator could match across rows, so check the match is one whole name
+            if (self._folded_offsets[row] == start) and (self._folded_offsets[row + 1] == start + len(folded) + 1):
+                yield row
+            pos = self._map.find(needle, pos + 1, self._folded_end)
+
+    def find_by_name(self, name):
+        '''
+        Find all the patrons with the given name. Search is case insensitive.
+            Args:
+                name (string): the name to search for.
+
+            Returns:
+                a list of PatronView.
+        '''
+        return [PatronView(self, row) for row in self._name_rows(name)]
+
+    def find_by_age_range(self, min_age, max_age):
+        '''
+        Find all the patrons with an age in the given range (inclusive).
+            Args:
+                min_age (int): the lowest age to search for.
+                max_age (int): the highest age to search for.
+
+            Returns:
+                a list of PatronView.
+        '''
+        return [PatronView(self, row) for row, age in enumerate(self._ages) if min_age <= age <= max_age]
+
+    def find_by_name_and_age(self, name, age):
+        '''
+        Find the patron with the given name and age. Name is case insensitive.
+            Args:
+                name (string): the name to search for.
+                age (int): the age to search for.
+
+            Returns:
+                a PatronView, or None.
+        '''
+        for row in self._name_rows(name):
+            if self._ages[row] == age:
+                return PatronView(self, row)
+
+        return None
+
+    def find_makerspace_eligible(self):
+        '''
+        Find all the patrons allowed to use the makerspace.
+
+            Returns:
+                a list of PatronView.
+        '''
+        # the columns are checked together, under the policy applied (if any)
+        makerspace_training = [bool(training & MAKERSPACE_TRAINING) for training in self._training]
+        eligible = batch.can_use_makerspace_batch(self._ages, self._fees, makerspace_training)
+        return [PatronView(self, row) for row, allowed in enumerate(eligible) if allowed]
+
+    def close(self):
+        '''
+        Close the file. Views of patrons can no longer be used.
+        '''
+        for column in (self._ids, self._fees, self._offsets, self._folded_offsets, self._ages, self._training, self._heap):
+            column.release()
+        self._map.close()
+
+
+class PatronView():
+    '''
+    A read only view of one patron in a ColumnarPatrons file. Has the same
+    detail attributes as Patron (but no loans), each read from the file
+    when it is accessed.
+    '''
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        '''
+        Create a view of a patron.
+            Args:
+                store (ColumnarPatrons): the file holding the patron.
+                row (int): the patron's row in the file.
+        '''
+        self._store = store
+        self._row = row
+
+    @property
+    def _id(self):
+        return self._store._ids[self._row]
+
+    @property
+    def _name(self):
+        return self._store.name(self._row)
+
+    @property
+    def _age(self):
+        return self._store._ages[self._row]
+
+    @property
+    def _outstanding_fees(self):
+        return self._store._fees[self._row]
+
+    @property
+    def _gardening_tool_training(self):
+        return bool(self._store._training[self._row] & GARDENING_TOOL_TRAINING)
+
+    @property
+    def _carpentry_tool_training(self):
+        return bool(self._store._training[self._row] & CARPENTRY_TOOL_TRAINING)
+
+    @property
+    def _makerspace_training(self):
+        return bool(self._store._training[self._row] & MAKERSPACE_TRAINING)
+
+    def __eq__(self, other):
+        return isinstance(other, PatronView) and (self._store is other._store) and (self._row == other._row)
+
+    def __hash__(self):
+        return hash((id(self._store), self._row))
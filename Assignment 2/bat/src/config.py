@@ -5,5 +5,34 @@ Assignment code for FIT2107 Software Quality and Testing.
 Not to be shared or distributed without permission.
 '''
 
+# where patron and catalogue data is stored: 'json' (PATRON_DATA and
+# CATALOGUE_DATA) or 'sqlite' (SQLITE_DATA)
+STORAGE_BACKEND = 'json'
 PATRON_DATA = 'data/patrons.json'
-CATALOGUE_DATA = 'data/catalogue.json'
\ No newline at end of file
+# number of files patron data is split across (JSON backend only); if more
+# than 1, the files are named by numbering PATRON_DATA (data/patrons.0.json, ...)
+PATRON_SHARDS = 1
+CATALOGUE_DATA = 'data/catalogue.json'
+SQLITE_DATA = 'data/bat.db'
+# snapshot of loaded JSON data, used for fast start up while the JSON files
+# are unchanged (None to disable)
+SNAPSHOT_DATA = 'data/snapshot.pickle'
+# load each patron the first time it is looked up, rather than at start up
+# (JSON backend only), keeping the position of each patron in PATRON_DATA
+# in PATRON_OFFSETS_DATA (None to find the positions at every start up)
+LAZY_LOADING = False
+PATRON_OFFSETS_DATA = 'data/patrons.offsets'
+# patron details (not loans) saved in a columnar file whenever patron data
+# is saved, and searched by name and age instead of loading every patron
+# when LAZY_LOADING (None to not save one)
+COLUMNAR_DATA = None
+JOURNAL_DATA = 'data/journal.log'
+# loan and makerspace rules, reloaded whenever the file changes (None to
+# use the rules in business_logic)
+POLICY_DATA = 'data/policy.json'
+# read loan and makerspace decisions from tables compiled at start up (and
+# whenever the policy is reloaded), rather than applying the rules for
+# every check
+DECISION_TABLES = False
+# number of journal records after which all data is saved and the journal cleared
+JOURNAL_COMPACT_SIZE = 1000
@@ -6,25 +6,314 @@ Not to be shared or distributed without permission.
 '''
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pickle
 import sys
+from functools import lru_cache
 
 from src.patron import Patron
 from src.borrowable_item import BorrowableItem
+from src.loan import Loan, LoanMap, parse_due_date
+from src.journal import Journal
+from src.sqlite_store import (SqliteStore, SqliteItems, SqlitePatrons, SqlitePatronKeys, SqliteAgeIndex,
+                              SqliteNameIndex, SqliteLoanIndex, SqliteDueDateIndex)
+from src.lazy_patrons import LazyPatrons, LazyIndex
+from src.columnar import write_columnar, ColumnarPatrons
+import src.snapshot as snapshot
+from src.indexes import AgeIndex, NameIndex, LoanIndex, DueDateIndex
+from src.eligibility import EligibilityCache
+import src.search as search
 import src.config as config
 
+# number of records encoded before each write when saving data
+SAVE_CHUNK_SIZE = 1000
+# number of characters read at a time when loading data
+LOAD_CHUNK_SIZE = 1 << 16
+# the loaded data and indexes stored in a snapshot
+SNAPSHOT_ATTRIBUTES = ["_catalogue_data", "_catalogue_index", "_patron_data", "_patron_ids", "_patron_index",
+                       "_age_index", "_name_index", "_loan_index", "_due_index", "_next_patron_id"]
+# the classes of the objects in a snapshot, whose layout is part of its fingerprint
+SNAPSHOT_CLASSES = [Patron, Loan, LoanMap, BorrowableItem, AgeIndex, NameIndex, LoanIndex, DueDateIndex]
+
+def read_records(path):
+    '''
+    Read the records of a JSON list from a file, one at a time.
+    The file is read in chunks of LOAD_CHUNK_SIZE characters, and each
+    record is yielded as soon as it has been parsed, so only the current
+    record (not the whole list) is held in memory.
+        Args:
+            path (string): the file to read.
+
+        Yields:
+            each record in the list, in order.
+
+        Raises:
+            ValueError: if the file does not contain a valid JSON list.
+    '''
+    for start, end, record in scan_records(path):
+        yield record
+
+
+def scan_records(path, encoding=None):
+    '''
+    Read the records of a JSON list from a file, one at a time, along with
+    the position of each record in the file. Reads the file in the same
+    way as read_records.
+        Args:
+            path (string): the file to read.
+            encoding (string): optional text encoding of the file. If 'ascii',
+                the positions are also byte offsets into the file.
+
+        Yields:
+            a (start, end, record) tuple for each record in the list, in order,
+            where start and end are the character offsets of the record's text.
+
+        Raises:
+            ValueError: if the file does not contain a valid JSON list.
+    '''
+    decoder = json.JSONDecoder()
+    # newline='' keeps line endings as they are, so positions match the file
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        buffer = ""
+        pos = 0
+        # number of characters read from the file before the buffer
+        consumed = 0
+        eof = False
+
+        def next_char():
+            '''
+            Skip whitespace, reading more of the file if needed, and return
+            the next character (or "" at the end of the file).
+            '''
+            nonlocal buffer, pos, consumed, eof
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if (pos < len(buffer)) or eof:
+                    return buffer[pos:pos + 1]
+                consumed += len(buffer)
+                buffer = f.read(LOAD_CHUNK_SIZE)
+                pos = 0
+                eof = (buffer == "")
+
+        if next_char() != "[":
+            raise ValueError("expected a JSON list")
+        pos += 1
+
+        if next_char() == "]":
+            pos += 1
+        else:
+            while True:
+                next_char()
+                start = consumed + pos
+                while True:
+                    # a record which fails to parse, or ends exactly at the end
+                    # of the buffer, may continue past the end of the buffer
+                    try:
+                        record, end = decoder.raw_decode(buffer, pos)
+                        if (end < len(buffer)) or eof:
+                            break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    more = f.read(max(LOAD_CHUNK_SIZE, len(buffer) - pos))
+                    eof = (more == "")
+                    consumed += pos
+                    buffer = buffer[pos:] + more
+                    pos = 0
+                pos = end
+                yield start, consumed + end, record
+
+                separator = next_char()
+                pos += 1
+                if separator == "]":
+                    break
+                if separator != ",":
+                    raise ValueError("expected ',' or ']' in JSON list")
+
+        if next_char() != "":
+            raise ValueError("unexpected data after JSON list")
+
+
+def write_records(path, records):
+    '''
+    Write records to a file as a JSON list, in a single pass.
+    Records are encoded one at a time and written in chunks of
+    SAVE_CHUNK_SIZE, so the whole file is never held in memory.
+    The existing file is only replaced once every record is written.
+        Args:
+            path (string): the file to write. Overwrites any existing data.
+            records: an iterable of JSON serialisable records.
+    '''
+    encode = json.JSONEncoder().encode
+    # write to a temporary file and replace the original once complete,
+    # so a crash part way through never leaves a half written file
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        f.write("[")
+        chunk = []
+        separator = ""
+        for record in records:
+            chunk.append(encode(record))
+            if len(chunk) == SAVE_CHUNK_SIZE:
+                f.write(separator + ",".join(chunk))
+                separator = ","
+                chunk = []
+        if len(chunk) > 0:
+            f.write(separator + ",".join(chunk))
+        f.write("]")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def shard_paths(path, count):
+    '''
+    Get the files patron data is split across.
+        Args:
+            path (string): the file the data would be in if it was not split.
+            count (int): the number of files the data is split across.
+
+        Returns:
+            [path] if count is 1, otherwise a list of count paths formed by
+            numbering path, e.g. data/patrons.0.json, data/patrons.1.json, ...
+    '''
+    if count == 1:
+        return [path]
+    root, ext = os.path.splitext(path)
+    return [f"{root}.{i}{ext}" for i in range(count)]
+
+
+def load_patron_shard(path, catalogue_index):
+    '''
+    Load the patrons in one file of patron data. Used to load the files
+    of sharded patron data in separate processes.
+        Args:
+            path (string): the file to load.
+            catalogue_index (dict): mapping of item ID to item, used to
+                link loans to items.
+
+        Returns:
+            a list of Patron, in file order.
+    '''
+    patrons = []
+    for d in read_records(path):
+        new_patron = Patron()
+        new_patron.load_data(d, None, catalogue_index)
+        patrons.append(new_patron)
+
+    return patrons
+
+
+@lru_cache(maxsize=4096)
+def format_due_date(due_date):
+    '''
+    Format a loan due date for saving to file. Due dates repeat heavily
+    across loans, so formatted dates are cached.
+        Args:
+            due_date (date): the date to format.
+
+        Returns:
+            the date as a string in the format dd/mm/yyyy.
+    '''
+    return due_date.strftime('%d/%m/%Y')
+
+
 class DataManager():
     '''
     Manages catalogue and patron data.
+
+    Data is stored either in JSON files, or in a SQLite database, depending
+    on config.STORAGE_BACKEND. With the SQLite backend every change is
+    written to the database as it happens, and data is not loaded up front:
+    items and patrons are loaded as they are looked up, and searches query
+    the database's indexes (see query_patrons).
+
+    With the JSON backend, patron data can be split across
+    config.PATRON_SHARDS files (see shard_paths), which are loaded in
+    parallel.
+
+    With the JSON backend, unsharded patron data, and config.LAZY_LOADING, each patron is only
+    loaded the first time it is looked up (see index_patrons). Patrons are
+    then only indexed by ID and by name and age; the age, name, loan, and
+    due date indexes are None, so searches using them fall back to
+    searching (and loading) every patron. If config.COLUMNAR_DATA is set,
+    patron details are also saved to a columnar file (see src.columnar)
+    whenever patron data is saved; lazily loaded patrons are then found by
+    name or age by searching that file, so only the patrons found are
+    loaded (see find_patrons_by_name and find_patrons_by_age).
+
+    Loan and makerspace checks for each patron are cached for the session
+    (see EligibilityCache).
     '''
-    def __init__(self):
+    def __init__(self, journal_path=None):
         '''
         Create a new data manager, loading catalogue and patron data
-        from the files specified in the software configuration.
+        from the storage specified in the software configuration.
+            Args:
+                journal_path (string): optional file to journal changes to.
+                    Changes already in the journal are applied on top of the
+                    loaded data. Not used with the SQLite backend.
         '''
+        self._journal = None
+        if (journal_path is not None) and (config.STORAGE_BACKEND != "sqlite"):
+            self._journal = Journal(journal_path)
+        self._store = None
         self._catalogue_data = None
-        self.load_catalogue()
+        self._catalogue_index = None
         self._patron_data = None
-        self.load_patrons()
+        self._patron_ids = None
+        self._next_patron_id = None
+        self._patron_index = None
+        self._age_index = None
+        self._name_index = None
+        self._loan_index = None
+        self._due_index = None
+        self._patron_details = None
+        self._patrons_changed = False
+        self._catalogue_changed = False
+        self._eligibility = EligibilityCache()
+        self._load_data()
+
+        if self._journal is not None:
+            try:
+                self._replay_journal()
+            except:
+                print("ERROR LOADING JOURNAL: EXITING.")
+                sys.exit()
+
+    def find_patrons_by_name(self, name):
+        '''
+        Find all the patrons with the given name, as search.find_patron_by_name
+        does. Without a name index (lazy loading), the columnar patron details
+        are searched instead, if they are up to date.
+            Args:
+                name (string): the name to search for.
+
+            Returns:
+                a list of patrons with the given name, or an empty list if
+                none were found.
+        '''
+        if (self._name_index is None) and (self._patron_details is not None):
+            return [self._patron_ids[view._id] for view in self._patron_details.find_by_name(name)]
+        return search.find_patron_by_name(name, self._patron_data, self._name_index)
+
+    def find_patrons_by_age(self, age):
+        '''
+        Find all the patrons with the given age, as search.find_patron_by_age
+        does. Without an age index (lazy loading), the columnar patron details
+        are searched instead, if they are up to date.
+            Args:
+                age (int): the age to search for.
+
+            Returns:
+                a list of patrons with the given age, or an empty list if
+                none were found.
+        '''
+        if (self._age_index is None) and (self._patron_details is not None):
+            return [self._patron_ids[view._id] for view in self._patron_details.find_by_age_range(age, age)]
+        return search.find_patron_by_age(age, self._patron_data, self._age_index)
 
     def register_patron(self, patron_name, patron_age):
         '''
@@ -37,54 +326,509 @@ class DataManager():
                 patron_name (string): the patron's name.
                 patron_age (int): the patron's age in years.
         '''
-        next_id = max(self._patron_data, key=lambda p: p._id)._id + 1
+        new_patron = self._new_patron(patron_name, patron_age)
+
+        if self._store is not None:
+            self._store.add_patrons([new_patron])
+        else:
+            self._patrons_changed = True
+            self._write_journal({"op": "register", "patron_id": new_patron._id, "name": patron_name, "age": patron_age})
+
+    def register_patrons(self, patrons):
+        '''
+        Register many new patrons at once, e.g., for a group enrolment.
+        The patrons are registered as by register_patron, but written to the
+        database (or journal) together.
+            Args:
+                patrons: a list of (name, age) tuples, one for each new patron.
+
+            Returns:
+                a list of the new patrons, in the same order.
+        '''
+        new_patrons = [self._new_patron(name, age) for name, age in patrons]
+
+        if len(new_patrons) == 0:
+            return new_patrons
+        if self._store is not None:
+            self._store.add_patrons(new_patrons)
+        else:
+            self._patrons_changed = True
+            # IDs are consecutive, so only the first is recorded
+            self._write_journal({"op": "register_many", "patron_id": new_patrons[0]._id,
+                                 "patrons": [[name, age] for name, age in patrons]})
+
+        return new_patrons
+
+    def record_loan(self, patron, loan):
+        '''
+        Update the loan indexes after a loan has been given to a patron, and
+        either write the loan to the database or journal it and mark the patron
+        and item as changed.
+            Args:
+                patron (Patron): the patron who borrowed the item.
+                loan (Loan): the new loan.
+        '''
+        if self._loan_index is not None:
+            self._loan_index.add(patron, loan)
+            self._due_index.add(patron, loan)
+        if self._store is not None:
+            self._store.add_loans(patron, [loan])
+        else:
+            self._patrons_changed = True
+            self._catalogue_changed = True
+            self._write_journal({"op": "loan", "patron_id": patron._id, "item_id": loan._item._id,
+                                 "due": format_due_date(loan._due_date), "on_loan": loan._item._on_loan})
+
+    def record_loans(self, patron, loans):
+        '''
+        Record many loans given to a patron at once (see record_loan). The
+        loans are written to the database in one transaction, or journalled
+        as one record. If they can not be written, the loan indexes are
+        restored and the error is raised.
+            Args:
+                patron (Patron): the patron who borrowed the items.
+                loans: the new loans.
+        '''
+        if self._loan_index is not None:
+            for loan in loans:
+                self._loan_index.add(patron, loan)
+                self._due_index.add(patron, loan)
+        try:
+            if self._store is not None:
+                self._store.add_loans(patron, loans)
+            else:
+                self._patrons_changed = True
+                self._catalogue_changed = True
+                self._write_journal({"op": "loan_many", "patron_id": patron._id,
+                                     "loans": [[l._item._id, format_due_date(l._due_date), l._item._on_loan] for l in loans]})
+        except:
+            if self._loan_index is not None:
+                for loan in loans:
+                    self._loan_index.remove(patron, loan)
+                    self._due_index.remove(patron, loan)
+            raise
+
+    def record_return(self, patron, loan):
+        '''
+        Update the loan indexes after a loan has been returned by a patron, and
+        either write the return to the database or journal it and mark the
+        patron and item as changed.
+            Args:
+                patron (Patron): the patron who returned the item.
+                loan (Loan): the returned loan.
+        '''
+        if self._loan_index is not None:
+            self._loan_index.remove(patron, loan)
+            self._due_index.remove(patron, loan)
+        if self._store is not None:
+            self._store.remove_loan(patron, loan)
+        else:
+            self._patrons_changed = True
+            self._catalogue_changed = True
+            self._write_journal({"op": "return", "patron_id": patron._id, "item_id": loan._item._id,
+                                 "on_loan": loan._item._on_loan})
 
+    def has_changes(self):
+        '''
+        Check whether any patron or catalogue data has changed since it
+        was loaded or last saved.
+
+            Returns:
+                True if there are unsaved changes, otherwise False.
+        '''
+        return self._patrons_changed or self._catalogue_changed
+
+    def compact(self):
+        '''
+        Save whichever of the patron and catalogue data has changed to the
+        files specified in config (each is rewritten in full), and clear the journal (if there is one)
+        since every change in it is now saved. The snapshot (if enabled) is
+        updated to match the saved files.
+        '''
+        if self._patrons_changed:
+            self.save_patrons()
+        if self._catalogue_changed:
+            self.save_catalogue()
+        if self._journal is not None:
+            self._journal.clear()
+        if self._snapshot_enabled():
+            self._save_snapshot(snapshot.fingerprint(self._snapshot_sources(), SNAPSHOT_CLASSES))
+
+    def save_changes(self):
+        '''
+        Make sure every change to patron and catalogue data is saved.
+        Nothing is written if there are no changes. If there is a journal
+        which has not reached config.JOURNAL_COMPACT_SIZE records, the
+        changes are already saved in it (and will be applied when the data
+        is next loaded), so nothing is written either. Otherwise, the
+        changed data files are saved and the journal is cleared.
+        '''
+        if not self.has_changes():
+            return
+        if (self._journal is not None) and (len(self._journal) < config.JOURNAL_COMPACT_SIZE):
+            return
+        self.compact()
+
+    def _load_data(self):
+        '''
+        Load catalogue and patron data. With the JSON backend, if a snapshot
+        of the data made from the current data files (by classes with the
+        current layout, see SNAPSHOT_CLASSES) exists and can be unpickled,
+        the data and indexes are loaded from it instead of parsing the files;
+        otherwise a new snapshot is saved once the files are loaded.
+        '''
+        source_fingerprint = None
+        if self._snapshot_enabled():
+            try:
+                source_fingerprint = snapshot.fingerprint(self._snapshot_sources(), SNAPSHOT_CLASSES)
+            except OSError:
+                # let the normal loading process report the missing file
+                pass
+
+        if source_fingerprint is not None:
+            state = snapshot.load_snapshot(config.SNAPSHOT_DATA, source_fingerprint)
+            if (state is not None) and all(attribute in state for attribute in SNAPSHOT_ATTRIBUTES):
+                for attribute in SNAPSHOT_ATTRIBUTES:
+                    setattr(self, attribute, state[attribute])
+                return
+
+        self.load_catalogue()
+        if self._store is not None:
+            self.query_patrons()
+        elif config.LAZY_LOADING and (config.PATRON_SHARDS == 1):
+            self.index_patrons()
+        else:
+            self.load_patrons()
+
+        if source_fingerprint is not None:
+            self._save_snapshot(source_fingerprint)
+
+    def _snapshot_enabled(self):
+        '''
+        Check whether snapshots are used (JSON backend without lazy loading,
+        and a snapshot file configured).
+        '''
+        return (config.STORAGE_BACKEND != "sqlite") and (not config.LAZY_LOADING) and (config.SNAPSHOT_DATA is not None)
+
+    def _snapshot_sources(self):
+        '''
+        Get the data files snapshots are made from.
+        '''
+        return [config.CATALOGUE_DATA] + shard_paths(config.PATRON_DATA, config.PATRON_SHARDS)
+
+    def _save_snapshot(self, source_fingerprint):
+        '''
+        Save the loaded data and indexes as a snapshot. Failing to save the
+        snapshot does not affect the loaded data, so errors are ignored.
+        '''
+        state = {attribute: getattr(self, attribute) for attribute in SNAPSHOT_ATTRIBUTES}
+        try:
+            snapshot.save_snapshot(config.SNAPSHOT_DATA, source_fingerprint, state)
+        except (OSError, pickle.PicklingError):
+            pass
+
+    def _new_patron(self, patron_name, patron_age):
+        '''
+        Create a patron with the next unused ID, and add it to the patron
+        data and indexes.
+        '''
         new_patron = Patron()
-        new_patron.set_new_patron_data(next_id, patron_name, patron_age)
+        new_patron.set_new_patron_data(self._next_patron_id, patron_name, patron_age)
+        self._add_patron(new_patron)
+        return new_patron
+
+    def _add_patron(self, patron):
+        '''
+        Add a new patron to the patron data and indexes, and move the next
+        unused ID past its ID.
+        '''
+        self._next_patron_id = max(self._next_patron_id, patron._id + 1)
+        self._patron_data.append(patron)
+        self._patron_ids[patron._id] = patron
+        self._patron_index[search.patron_key(patron._name, patron._age)] = patron
+        if self._age_index is not None:
+            self._age_index.add(patron)
+            self._name_index.add(patron)
+        self._close_patron_details()
+
+    def _write_journal(self, record):
+        '''
+        Append a record to the journal, if there is one. Once the journal
+        holds config.JOURNAL_COMPACT_SIZE records, it is compacted.
+        The change is committed once the record is appended, so compaction
+        can not undo it: if compacting fails, the change stays in the
+        journal, and compacting is tried again on the next change (or save).
+        '''
+        if self._journal is None:
+            return
+        self._journal.append(record)
+        if len(self._journal) >= config.JOURNAL_COMPACT_SIZE:
+            try:
+                self.compact()
+            except Exception:
+                # the change is safe in the journal
+                pass
+
+    def _replay_journal(self):
+        '''
+        Apply the changes recorded in the journal to the loaded data.
+        Replaying a record which is already reflected in the data (e.g.,
+        because the data was saved but the journal was not cleared) has
+        no effect.
+        '''
+        for record in self._journal.records():
+            if record["op"] == "register_many":
+                for patron_id, (name, age) in enumerate(record["patrons"], record["patron_id"]):
+                    if patron_id not in self._patron_ids:
+                        new_patron = Patron()
+                        new_patron.set_new_patron_data(patron_id, name, age)
+                        self._add_patron(new_patron)
+                        self._patrons_changed = True
+                continue
+
+            patron = self._patron_ids.get(record["patron_id"])
+
+            if record["op"] == "register":
+                if patron is None:
+                    new_patron = Patron()
+                    new_patron.set_new_patron_data(record["patron_id"], record["name"], record["age"])
+                    self._add_patron(new_patron)
+                    self._patrons_changed = True
+                continue
+
+            if patron is None:
+                continue
+            if record["op"] == "loan_many":
+                for item_id, due, on_loan in record["loans"]:
+                    self._replay_loan(patron, {"op": "loan", "item_id": item_id, "due": due, "on_loan": on_loan})
+            else:
+                self._replay_loan(patron, record)
+
+    def _replay_loan(self, patron, record):
+        '''
+        Apply a journalled loan or return by a patron to the loaded data.
+        '''
+        item = self._catalogue_index.get(record["item_id"])
+        if item is None:
+            return
 
-        self._patron_data.append(new_patron)
+        loan = patron.find_loan(item._id)
+        if (record["op"] == "loan") and (loan is None):
+            loan = Loan(item, parse_due_date(record["due"]))
+            patron._loans.append(loan)
+            if self._loan_index is not None:
+                self._loan_index.add(patron, loan)
+                self._due_index.add(patron, loan)
+        elif (record["op"] == "return") and (loan is not None):
+            patron._loans.remove(loan)
+            if self._loan_index is not None:
+                self._loan_index.remove(patron, loan)
+                self._due_index.remove(patron, loan)
+        item._on_loan = record["on_loan"]
+        self._patrons_changed = True
+        self._catalogue_changed = True
 
     def load_patrons(self):
         '''
-        Load patron data from the file specified in config.
+        Load patron data from the file(s) specified in config, and build
+        indexes of the patrons by ID, by name and age, by age, and by name,
+        and of their loans by item and by due date.
         If there is an error loading the data, print an error message
         and crash the program.
         '''
         try:
-            with open(config.PATRON_DATA, 'r') as f:
-                data = json.load(f)
+            if config.PATRON_SHARDS > 1:
+                patrons = self._load_patron_shards()
+            else:
+                patrons = load_patron_shard(config.PATRON_DATA, self._catalogue_index)
 
-            patrons = []
-            for d in data:
-                new_patron = Patron()
-                new_patron.load_data(d, self._catalogue_data)
-                patrons.append(new_patron)
+            self._patron_data = patrons
+            self._patron_ids = {p._id: p for p in patrons}
+            # IDs are allocated in sequence, starting after the highest loaded ID
+            self._next_patron_id = max(self._patron_ids, default=0) + 1
+            self._patron_index = {search.patron_key(p._name, p._age): p for p in patrons}
+            self._age_index = AgeIndex(patrons)
+            self._name_index = NameIndex(patrons)
+            self._loan_index = LoanIndex(patrons)
+            self._due_index = DueDateIndex(patrons)
+        except:
+            print("ERROR LOADING PATRON DATA: EXITING.")
+            sys.exit()
 
+    def query_patrons(self):
+        '''
+        Set up patron data and indexes which query the SQLite database
+        instead of loading every patron (SQLite backend). A patron is loaded
+        the first time they are looked up, and patrons and loans are found by
+        name and age, by age, by name, by item, and by due date with the
+        database's indexes, so only the patrons found are loaded.
+        If there is an error reading the database, print an error message
+        and crash the program.
+        '''
+        try:
+            patrons = SqlitePatrons(self._store, self._catalogue_index)
             self._patron_data = patrons
+            self._patron_ids = LazyIndex(patrons)
+            self._patron_index = LazyIndex(patrons, SqlitePatronKeys(self._store))
+            self._next_patron_id = self._store.next_patron_id()
+            self._age_index = SqliteAgeIndex(patrons)
+            self._name_index = SqliteNameIndex(patrons)
+            self._loan_index = SqliteLoanIndex(patrons)
+            self._due_index = SqliteDueDateIndex(patrons)
+        except:
+            print("ERROR LOADING PATRON DATA: EXITING.")
+            sys.exit()
+
+    def _load_patron_shards(self):
+        '''
+        Load sharded patron data, one process per file (up to the number of
+        CPUs). Each process has its own copy of the catalogue, so loans are
+        then linked to the catalogue's items. With a single CPU, the files
+        are loaded one after another in this process.
+
+            Returns:
+                a list of Patron, in shard order.
+        '''
+        paths = shard_paths(config.PATRON_DATA, config.PATRON_SHARDS)
+        workers = min(len(paths), os.cpu_count() or 1)
+        if workers == 1:
+            # nothing to gain from another process, and patrons would need copying back
+            return [patron for path in paths for patron in load_patron_shard(path, self._catalogue_index)]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(load_patron_shard, paths, [self._catalogue_index] * len(paths)))
+
+        patrons = []
+        for shard in shards:
+            for patron in shard:
+                for loan in patron._loans:
+                    loan._item = self._catalogue_index[loan._item._id]
+            patrons.extend(shard)
+
+        return patrons
+
+    def index_patrons(self):
+        '''
+        Index patron data from the file specified in config without loading
+        it (lazy loading). Only the position of each patron's record in the
+        file and the patrons' IDs, names, and ages are kept, and a patron's
+        record is loaded the first time the patron is looked up.
+        The positions are saved to config.PATRON_OFFSETS_DATA (if set) and
+        reused while the file is unchanged, so the file is only parsed the
+        first time it is indexed.
+        Positions are byte offsets, so a file with non-ASCII text is loaded
+        in full (with load_patrons) instead.
+        If there is an error indexing the data, print an error message
+        and crash the program.
+        '''
+        try:
+            source_fingerprint = None
+            state = None
+            if config.PATRON_OFFSETS_DATA is not None:
+                source_fingerprint = snapshot.fingerprint([config.PATRON_DATA])
+                state = snapshot.load_snapshot(config.PATRON_OFFSETS_DATA, source_fingerprint)
+
+            if (state is None) or ("next_patron_id" not in state):
+                state = {"offsets": {}, "keys": {}}
+                for start, end, d in scan_records(config.PATRON_DATA, 'ascii'):
+                    state["offsets"][d["patron_id"]] = (start, end)
+                    state["keys"][search.patron_key(d["name"], d["age"])] = d["patron_id"]
+                state["next_patron_id"] = max(state["offsets"], default=0) + 1
+                if source_fingerprint is not None:
+                    try:
+                        snapshot.save_snapshot(config.PATRON_OFFSETS_DATA, source_fingerprint, state)
+                    except OSError:
+                        pass
+        except UnicodeDecodeError:
+            self.load_patrons()
+            return
         except:
             print("ERROR LOADING PATRON DATA: EXITING.")
             sys.exit()
 
+        patrons = LazyPatrons(config.PATRON_DATA, state["offsets"], self._catalogue_data, self._catalogue_index)
+        self._patron_data = patrons
+        self._patron_ids = LazyIndex(patrons)
+        self._patron_index = LazyIndex(patrons, state["keys"])
+        self._next_patron_id = state["next_patron_id"]
+        self._age_index = None
+        self._name_index = None
+        self._loan_index = None
+        self._due_index = None
+        self._open_patron_details()
+
+    def _open_patron_details(self):
+        '''
+        Open the columnar patron details (config.COLUMNAR_DATA), if they were
+        saved with the patron data as it is now, i.e. after the patron data
+        file was last written, and for the same number of patrons.
+        '''
+        self._close_patron_details()
+        if config.COLUMNAR_DATA is None:
+            return
+        try:
+            if os.stat(config.COLUMNAR_DATA).st_mtime_ns < os.stat(config.PATRON_DATA).st_mtime_ns:
+                return
+            details = ColumnarPatrons(config.COLUMNAR_DATA)
+        except (OSError, ValueError):
+            return
+
+        if len(details) == len(self._patron_data):
+            self._patron_details = details
+        else:
+            details.close()
+
+    def _close_patron_details(self):
+        '''
+        Stop using the columnar patron details, e.g. once a patron is added
+        which they do not include.
+        '''
+        if self._patron_details is not None:
+            self._patron_details.close()
+            self._patron_details = None
+
     def save_patrons(self):
         '''
-        Save patron data to the file specified in config.
-        Overrites any existing data.
+        Save patron data to the file or database specified in config.
+        Overrites any existing data. Sharded patron data is split into
+        config.PATRON_SHARDS files of consecutive patrons, of (nearly) equal size.
+        Patron details are then saved to config.COLUMNAR_DATA, if set.
         '''
-        with open(config.PATRON_DATA, 'w') as f:
-            f.write("[")
-            for p in self._patron_data:
-                f.write(json.dumps(p, cls=self.PatronEncoder))
-                if p != self._patron_data[-1]:
-                    f.write(",")
-            f.write("]")
+        if self._store is not None:
+            self._store.save_patrons(self._patron_data)
+        else:
+            paths = shard_paths(config.PATRON_DATA, config.PATRON_SHARDS)
+            if len(paths) == 1:
+                write_records(paths[0], map(self.PatronEncoder.to_record, self._patron_data))
+            else:
+                shard_size = -(-len(self._patron_data) // len(paths))
+                for i, path in enumerate(paths):
+                    shard = self._patron_data[i * shard_size:(i + 1) * shard_size]
+                    write_records(path, map(self.PatronEncoder.to_record, shard))
+        if config.COLUMNAR_DATA is not None:
+            self._close_patron_details()
+            write_columnar(config.COLUMNAR_DATA, self._patron_data)
+            if self._name_index is None:
+                self._open_patron_details()
+        self._patrons_changed = False
 
     def load_catalogue(self):
         '''
-        Load catalogue data from the file specified in config.
+        Load catalogue data from the file specified in config, and build an
+        index of the items by ID. With the SQLite backend, the database is
+        opened instead, and items are loaded from it as they are looked up.
         If there is an error loading the data, print an error message
         and crash the program.
         '''
         try:
+            if config.STORAGE_BACKEND == "sqlite":
+                if self._store is None:
+                    self._store = SqliteStore(config.SQLITE_DATA)
+                # items are loaded from the database as they are looked up
+                self._catalogue_index = SqliteItems(self._store)
+                self._catalogue_data = self._catalogue_index.values()
+                return
+
             with open(config.CATALOGUE_DATA, 'r') as f:
                 data = json.load(f)
 
@@ -95,40 +839,46 @@ class DataManager():
                 items.append(new_item)
 
             self._catalogue_data = items
+            self._catalogue_index = {item._id: item for item in items}
         except:
             print("ERROR LOADING CATALOGUE DATA: EXITING.")
             sys.exit()
 
     def save_catalogue(self):
         '''
-        Save catalogue data to the file specified in config.
+        Save catalogue data to the file or database specified in config.
         Overrites any existing data.
         '''
-        with open(config.CATALOGUE_DATA, 'w') as f:
-            f.write("[")
-            for d in self._catalogue_data:
-                f.write(json.dumps(d, cls=self.BorrowableItemEncoder))
-                if d != self._catalogue_data[-1]:
-                    f.write(",")
-            f.write("]")
+        if self._store is not None:
+            self._store.save_catalogue(self._catalogue_data)
+        else:
+            write_records(config.CATALOGUE_DATA, map(self.BorrowableItemEncoder.to_record, self._catalogue_data))
+        self._catalogue_changed = False
 
     class PatronEncoder(json.JSONEncoder):
         '''
         Translates instances of the Patron class to JSON for
         saving to file.
         '''
+        @staticmethod
+        def to_record(obj):
+            '''
+            Translate a patron to a JSON serialisable record.
+            '''
+            return {
+                "patron_id": obj._id,
+                "name": obj._name,
+                "age": obj._age,
+                "outstanding_fees": obj._outstanding_fees,
+                "gardening_tool_training": obj._gardening_tool_training,
+                "carpentry_tool_training": obj._carpentry_tool_training,
+                "makerspace_training": obj._makerspace_training,
+                "loans" : [{"item": l._item._id,"due": format_due_date(l._due_date)} for l in obj._loans]
+            }
+
         def default(self, obj):
             if isinstance(obj, Patron):
-                return {
-                    "patron_id": obj._id,
-                    "name": obj._name,
-                    "age": obj._age,
-                    "outstanding_fees": obj._outstanding_fees,
-                    "gardening_tool_training": obj._gardening_tool_training,
-                    "carpentry_tool_training": obj._carpentry_tool_training,
-                    "makerspace_training": obj._makerspace_training,
-                    "loans" : [{"item": l._item._id,"due": l._due_date.strftime('%d/%m/%Y')} for l in obj._loans]
-                }
+                return self.to_record(obj)
             return super().default(obj)
 
     class BorrowableItemEncoder(json.JSONEncoder):
@@ -136,14 +886,21 @@ class DataManager():
         Translates instances of the BorrowableItem class to JSON for
         saving to file.
         '''
+        @staticmethod
+        def to_record(obj):
+            '''
+            Translate a borrowable item to a JSON serialisable record.
+            '''
+            return {
+                "item_id": obj._id,
+                "item_name": obj._name,
+                "item_type": obj._type,
+                "year": obj._year,
+                "number_owned": obj._number_owned,
+                "on_loan": obj._on_loan,
+            }
+
         def default(self, obj):
             if isinstance(obj, BorrowableItem):
-                return {
-                    "item_id": obj._id,
-                    "item_name": obj._name,
-                    "item_type": obj._type,
-                    "year": obj._year,
-                    "number_owned": obj._number_owned,
-                    "on_loan": obj._on_loan,
-                }
+                return self.to_record(obj)
             return super().default(obj)
\ No newline at end of file
@@ -0,0 +1,193 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import src.business_logic as logic
+
+class PatronEligibility():
+    '''
+    State derived from one patron's details: their type, discount, fees
+    owed, their row of the decision tables (if on), and the loan and
+    makerspace decisions made for them so far.
+    '''
+    __slots__ = ("_key", "_patron_type", "_discount", "_fees_owed", "_table_row", "_decisions")
+
+    def __init__(self, key, patron):
+        '''
+        Derive a patron's state.
+            Args:
+                key (tuple): the details the state is derived from (see EligibilityCache).
+                patron (Patron): the patron.
+        '''
+        self._key = key
+        self._patron_type = logic.type_of_patron(patron._age)
+        self._discount = logic.patron_discount(patron._age)
+        if self._discount == "ERROR":
+            self._fees_owed = None
+        else:
+            self._fees_owed = patron._outstanding_fees - (patron._outstanding_fees * (self._discount / 100))
+        self._decisions = {}
+
+        # the patron's age, fees owed and training are checked against the
+        # decision tables' domain once here, rather than for every check
+        self._table_row = None
+        if self._fees_owed is not None:
+            found = logic.decision_table_row(patron._age, self._fees_owed, patron._gardening_tool_training,
+                                             patron._carpentry_tool_training, patron._makerspace_training)
+            if found is not None:
+                self._table_row, self._decisions["makerspace"] = found
+
+
+class EligibilityCache():
+    '''
+    Caches state derived from each patron's details, so that repeated loan
+    and makerspace checks for a patron do not apply the rules again.
+
+    A patron's cached state is kept until their age, outstanding fees, or
+    training changes, or a different policy is applied (see
+    business_logic.use_policy); it is then derived again the next time the
+    patron is checked. Patrons are identified by ID. While decision tables
+    are on (see business_logic.use_decision_tables), loan decisions in the
+    tables' domain are read from the patron's row, rather than cached.
+    '''
+    def __init__(self):
+        '''
+        Create an empty cache.
+        '''
+        self._entries = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, patron):
+        '''
+        Get the state derived from a patron's details.
+            Args:
+                patron (Patron): the patron.
+
+            Returns:
+                the patron's PatronEligibility.
+        '''
+        entry, derived = self._lookup(patron)
+        self._count(not derived)
+        return entry
+
+    def can_borrow(self, patron, type_of_item, length_of_loan):
+        '''
+        Determine whether a loan can occur, as business_logic.can_borrow does.
+            Args:
+                patron (Patron): the patron wanting to borrow the item.
+                type_of_item (string): the type of item.
+                length_of_loan (int): the number of days the patron wants to loan the item for.
+
+            Returns:
+                True if the patron is allowed to borrow the item, otherwise false.
+        '''
+        # the check of the cached state is inlined, as loan checks are the most frequent
+        entry = self._entries.get(patron._id)
+        if (entry is None) or (entry._key != (patron._age, patron._outstanding_fees, patron._training, logic._policy_generation)):
+            entry = self._lookup(patron)[0]
+        row = entry._table_row
+        if (row is not None) and (type(length_of_loan) is int) and (0 < length_of_loan <= logic.TABLE_MAX_LENGTH_OF_LOAN):
+            table = logic._decision_tables.get(type_of_item)
+            if table is not None:
+                self._hits += 1
+                return table[row + length_of_loan] == 1
+
+        decision_key = (type_of_item, length_of_loan)
+        decision = entry._decisions.get(decision_key)
+        if decision is not None:
+            self._hits += 1
+            return decision
+
+        self._misses += 1
+        decision = logic.can_borrow(type_of_item, patron._age, length_of_loan, patron._outstanding_fees,
+                                    patron._gardening_tool_training, patron._carpentry_tool_training)
+        entry._decisions[decision_key] = decision
+        return decision
+
+    def can_use_makerspace(self, patron):
+        '''
+        Determine whether a patron can use the makerspace, as
+        business_logic.can_use_makerspace does.
+            Args:
+                patron (Patron): the patron wanting to use the makerspace.
+
+            Returns:
+                True if the patron is allowed to use the makerspace, otherwise false.
+        '''
+        decisions = self._lookup(patron)[0]._decisions
+        decision = decisions.get("makerspace")
+        self._count(decision is not None)
+        if decision is None:
+            decision = logic.can_use_makerspace(patron._age, patron._outstanding_fees, patron._makerspace_training)
+            decisions["makerspace"] = decision
+
+        return decision
+
+    def eligible_item_types(self, patron):
+        '''
+        Find the types of item a patron is allowed to borrow (for a one day loan).
+            Args:
+                patron (Patron): the patron.
+
+            Returns:
+                a list of item types.
+        '''
+        result = []
+        for type_of_item in logic.loan_item_types():
+            try:
+                if self.can_borrow(patron, type_of_item, 1):
+                    result.append(type_of_item)
+            except TypeError:
+                # the rules can not be applied to the patron (e.g., a negative age)
+                pass
+
+        return result
+
+    def invalidate(self, patron=None):
+        '''
+        Remove a patron's cached state, or every patron's if no patron is given.
+        '''
+        if patron is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(patron._id, None)
+
+    def get_stats(self):
+        '''
+        Get the number of checks answered from the cache (hits) and not
+        answered from the cache (misses), and the number of patrons cached.
+
+            Returns:
+                a dict with keys "hits", "misses" and "patrons".
+        '''
+        return {"hits": self._hits, "misses": self._misses, "patrons": len(self._entries)}
+
+    def _lookup(self, patron):
+        '''
+        Get a patron's cached state, deriving it again if there is none or
+        it is out of date.
+
+            Returns:
+                a (PatronEligibility, whether it was derived) tuple.
+        '''
+        key = (patron._age, patron._outstanding_fees, patron._training, logic._policy_generation)
+        entry = self._entries.get(patron._id)
+        if (entry is not None) and (entry._key == key):
+            return entry, False
+
+        entry = PatronEligibility(key, patron)
+        self._entries[patron._id] = entry
+        return entry, True
+
+    def _count(self, hit):
+        '''
+        Count a check as a hit or a miss.
+        '''
+        if hit:
+            self._hits += 1
+        else:
+            self._misses += 1
@@ -0,0 +1,416 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+import heapq
+
+# the lowest trigram similarity for a name to count as a possible match
+MIN_SIMILARITY = 0.3
+
+def trigrams(text):
+    '''
+    Split text into the set of case insensitive three character
+    sequences it contains. The text is padded with spaces so that the
+    start and end of the text form trigrams of their own.
+        Args:
+            text (string): the text to split.
+
+        Returns:
+            a set of trigrams (strings of length 3).
+    '''
+    padded = f"  {text.casefold()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(grams_a, grams_b):
+    '''
+    Calculate how similar two sets of trigrams are, as the number of shared
+    trigrams divided by the number of distinct trigrams in either set.
+        Args:
+            grams_a (set): the first set of trigrams.
+            grams_b (set): the second set of trigrams.
+
+        Returns:
+            a score from 0 (nothing in common) to 1 (identical).
+    '''
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+class AgeIndex():
+    '''
+    Indexes patrons by age.
+
+    Patrons are grouped into one bucket per age, and the ages which have
+    at least one patron are kept in sorted order so that a range of ages
+    can be found with a binary search.
+    '''
+    def __init__(self, patrons=()):
+        '''
+        Create a new age index.
+            Args:
+                patrons: the patrons to add to the index.
+        '''
+        self._buckets = {}
+        self._ages = []
+        for p in patrons:
+            self.add(p)
+
+    def add(self, patron):
+        '''
+        Add a patron to the index.
+            Args:
+                patron (Patron): the patron to add.
+        '''
+        bucket = self._buckets.get(patron._age)
+        if bucket is None:
+            bucket = []
+            self._buckets[patron._age] = bucket
+            insort(self._ages, patron._age)
+        bucket.append(patron)
+
+    def find(self, age):
+        '''
+        Find all the patrons with the given age.
+            Args:
+                age (int): the age to search for.
+
+            Returns:
+                a list of patrons with the given age, or an empty list if
+                none were found.
+        '''
+        return list(self._buckets.get(age, ()))
+
+    def find_range(self, min_age, max_age):
+        '''
+        Find all the patrons with an age in the given range.
+            Args:
+                min_age (int): the lowest age to search for (inclusive).
+                max_age (int): the highest age to search for (inclusive).
+
+            Returns:
+                a list of patrons in the age range, ordered by age, or an
+                empty list if none were found.
+        '''
+        found = []
+        start = bisect_left(self._ages, min_age)
+        end = bisect_right(self._ages, max_age)
+        for age in self._ages[start:end]:
+            found.extend(self._buckets[age])
+
+        return found
+
+    def count_range(self, min_age, max_age):
+        '''
+        Count the patrons with an age in the given range, without
+        building the list of patrons.
+            Args:
+                min_age (int): the lowest age to count (inclusive).
+                max_age (int): the highest age to count (inclusive).
+
+            Returns:
+                the number of patrons in the age range.
+        '''
+        start = bisect_left(self._ages, min_age)
+        end = bisect_right(self._ages, max_age)
+        return sum(len(self._buckets[age]) for age in self._ages[start:end])
+
+
+class NameIndex():
+    '''
+    Indexes patrons by name, for case insensitive and approximate
+    (typo tolerant) name searches.
+
+    Patrons are grouped by their casefolded name, and the distinct names
+    are kept in sorted order for prefix searches. For approximate searches,
+    every distinct name is also indexed by the trigrams it contains, so
+    that only names which share at least one trigram with the search text
+    are scored. The trigram index is only built by the first approximate
+    search, as exact and prefix searches do not need it.
+    '''
+    def __init__(self, patrons=()):
+        '''
+        Create a new name index.
+            Args:
+                patrons: the patrons to add to the index.
+        '''
+        self._names = {}
+        # the trigram index, None until it is built by find_similar
+        self._gram_counts = None
+        self._postings = None
+        for p in patrons:
+            self._add(p)
+        # sort once, rather than inserting each name in order
+        self._sorted_names = sorted(self._names)
+
+    def add(self, patron):
+        '''
+        Add a patron to the index.
+            Args:
+                patron (Patron): the patron to add.
+        '''
+        folded = self._add(patron)
+        if folded is not None:
+            insort(self._sorted_names, folded)
+
+    def _add(self, patron):
+        '''
+        Add a patron to the index, other than to the sorted names.
+
+            Returns:
+                the patron's casefolded name if it was not already indexed, otherwise None.
+        '''
+        folded = patron._name.casefold()
+        bucket = self._names.get(folded)
+        if bucket is not None:
+            bucket.append(patron)
+            return None
+
+        self._names[folded] = [patron]
+        if self._postings is not None:
+            self._index_trigrams(folded)
+        return folded
+
+    def _index_trigrams(self, folded):
+        '''
+        Add a casefolded name to the trigram index.
+        '''
+        grams = trigrams(folded)
+        self._gram_counts[folded] = len(grams)
+        for g in grams:
+            self._postings.setdefault(g, []).append(folded)
+
+    def find(self, name):
+        '''
+        Find all the patrons with the given name. Search is case insensitive.
+            Args:
+                name (string): the name to search for.
+
+            Returns:
+                a list of patrons with the given name, or an empty list if
+                none were found.
+        '''
+        return list(self._names.get(name.casefold(), ()))
+
+    def _prefix_names(self, prefix):
+        '''
+        Find the distinct casefolded names starting with a prefix.
+        '''
+        folded = prefix.casefold()
+        start = bisect_left(self._sorted_names, folded)
+        end = start
+        while end < len(self._sorted_names) and self._sorted_names[end].startswith(folded):
+            end += 1
+        return self._sorted_names[start:end]
+
+    def find_prefix(self, prefix):
+        '''
+        Find all the patrons with a name starting with the given prefix.
+        Search is case insensitive.
+            Args:
+                prefix (string): the start of the name to search for.
+
+            Returns:
+                a list of patrons ordered by name, or an empty list if none
+                were found.
+        '''
+        found = []
+        for folded in self._prefix_names(prefix):
+            found.extend(self._names[folded])
+
+        return found
+
+    def count(self, name):
+        '''
+        Count the patrons with the given name. Search is case insensitive.
+            Args:
+                name (string): the name to count.
+
+            Returns:
+                the number of patrons with the name.
+        '''
+        return len(self._names.get(name.casefold(), ()))
+
+    def count_prefix(self, prefix):
+        '''
+        Count the patrons with a name starting with the given prefix,
+        without building the list of patrons. Search is case insensitive.
+            Args:
+                prefix (string): the start of the name to count.
+
+            Returns:
+                the number of patrons with a name starting with the prefix.
+        '''
+        return sum(len(self._names[folded]) for folded in self._prefix_names(prefix))
+
+    def find_similar(self, name, limit=10, min_score=MIN_SIMILARITY):
+        '''
+        Find the patrons with names most similar to the given name.
+        Search is case insensitive.
+            Args:
+                name (string): the name to search for.
+                limit (int): the maximum number of names to return patrons for.
+                min_score (float): the lowest similarity score (0 - 1) a name
+                    must have to be included.
+
+            Returns:
+                a list of patrons, most similar names first, or an empty list
+                if no names were similar enough.
+        '''
+        if self._postings is None:
+            self._gram_counts = {}
+            self._postings = {}
+            for folded in self._names:
+                self._index_trigrams(folded)
+
+        grams = trigrams(name)
+        shared = Counter()
+        for g in grams:
+            shared.update(self._postings.get(g, ()))
+
+        scored = []
+        for folded, count in shared.items():
+            score = count / (len(grams) + self._gram_counts[folded] - count)
+            if score >= min_score:
+                scored.append((score, folded))
+
+        found = []
+        for score, folded in heapq.nsmallest(limit, scored, key=lambda s: (-s[0], s[1])):
+            found.extend(self._names[folded])
+
+        return found
+
+
+class LoanIndex():
+    '''
+    Indexes active loans by the ID of the loaned item, so that the patrons
+    currently borrowing an item can be found without checking the loans
+    of every patron.
+    '''
+    def __init__(self, patrons=()):
+        '''
+        Create a new loan index.
+            Args:
+                patrons: the patrons whose loans should be added to the index.
+        '''
+        self._by_item = {}
+        for p in patrons:
+            for l in p._loans:
+                self.add(p, l)
+
+    def add(self, patron, loan):
+        '''
+        Add a loan to the index.
+            Args:
+                patron (Patron): the patron holding the loan.
+                loan (Loan): the loan to add.
+        '''
+        self._by_item.setdefault(loan._item._id, {})[patron._id] = (patron, loan)
+
+    def remove(self, patron, loan):
+        '''
+        Remove a loan from the index. Does nothing if the loan is not indexed.
+            Args:
+                patron (Patron): the patron who held the loan.
+                loan (Loan): the loan to remove.
+        '''
+        borrowers = self._by_item.get(loan._item._id)
+        if borrowers is not None:
+            borrowers.pop(patron._id, None)
+            if len(borrowers) == 0:
+                del self._by_item[loan._item._id]
+
+    def find(self, item_id):
+        '''
+        Find the active loans of an item.
+            Args:
+                item_id (int): the ID of the item.
+
+            Returns:
+                a list of (patron, loan) pairs for the patrons currently
+                borrowing the item, or an empty list if it is not on loan.
+        '''
+        return list(self._by_item.get(item_id, {}).values())
+
+
+class DueDateIndex():
+    '''
+    Indexes active loans by due date.
+
+    Loans are kept in a list sorted by the ordinal of their due date, so
+    that the loans due before or between dates can be found with a binary
+    search, at a cost proportional to the number of loans found.
+    '''
+    def __init__(self, patrons=()):
+        '''
+        Create a new due date index.
+            Args:
+                patrons: the patrons whose loans should be added to the index.
+        '''
+        self._entries = {}
+        self._key_of_loan = {}
+        self._sequence = 0
+        for p in patrons:
+            for l in p._loans:
+                self._sequence += 1
+                key = (l._due_date.toordinal(), self._sequence)
+                self._entries[key] = (p, l)
+                self._key_of_loan[l] = key
+        # sort once, rather than inserting each loan in order
+        self._keys = sorted(self._entries)
+
+    def add(self, patron, loan):
+        '''
+        Add a loan to the index.
+            Args:
+                patron (Patron): the patron holding the loan.
+                loan (Loan): the loan to add.
+        '''
+        self._sequence += 1
+        key = (loan._due_date.toordinal(), self._sequence)
+        insort(self._keys, key)
+        self._entries[key] = (patron, loan)
+        self._key_of_loan[loan] = key
+
+    def remove(self, patron, loan):
+        '''
+        Remove a loan from the index. Does nothing if the loan is not indexed.
+            Args:
+                patron (Patron): the patron who held the loan.
+                loan (Loan): the loan to remove.
+        '''
+        key = self._key_of_loan.pop(loan, None)
+        if key is not None:
+            del self._keys[bisect_left(self._keys, key)]
+            del self._entries[key]
+
+    def find_before(self, due_date):
+        '''
+        Find the loans due before a date.
+            Args:
+                due_date (date): the date to search before (exclusive).
+
+            Returns:
+                a list of (patron, loan) pairs, ordered by due date.
+        '''
+        end = bisect_left(self._keys, (due_date.toordinal(),))
+        return [self._entries[k] for k in self._keys[:end]]
+
+    def find_between(self, first_date, last_date):
+        '''
+        Find the loans due between two dates.
+            Args:
+                first_date (date): the earliest due date to search for (inclusive).
+                last_date (date): the latest due date to search for (inclusive).
+
+            Returns:
+                a list of (patron, loan) pairs, ordered by due date.
+        '''
+        start = bisect_left(self._keys, (first_date.toordinal(),))
+        end = bisect_left(self._keys, (last_date.toordinal() + 1,))
+        return [self._entries[k] for k in self._keys[start:end]]
@@ -0,0 +1,87 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import json
+import os
+
+class Journal():
+    '''
+    An append-only log of changes to patron and catalogue data, stored as
+    one JSON record per line.
+
+    Every record is flushed to disk as soon as it is appended, so changes
+    survive a crash without rewriting the full data files. A record which
+    was only partly written when a crash occurred is discarded when the
+    journal is next opened.
+    '''
+    def __init__(self, path):
+        '''
+        Open a journal, creating the file if it does not exist.
+            Args:
+                path (string): the file to store the journal in.
+        '''
+        self._path = path
+        self._records = []
+
+        valid_length = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        self._records.append(json.loads(line))
+                    except ValueError:
+                        break
+                    valid_length += len(line)
+
+        self._file = open(path, 'ab')
+        if self._file.tell() != valid_length:
+            self._file.truncate(valid_length)
+        self._count = len(self._records)
+
+    def records(self):
+        '''
+        Get the records which were in the journal when it was opened.
+
+            Returns:
+                a list of records, oldest first.
+        '''
+        return self._records
+
+    def append(self, record):
+        '''
+        Append a record to the journal, and flush it to disk.
+            Args:
+                record (dict): a JSON serialisable record.
+        '''
+        self._file.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._count += 1
+
+    def clear(self):
+        '''
+        Remove every record from the journal.
+        '''
+        self._file.truncate(0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._records = []
+        self._count = 0
+
+    def close(self):
+        '''
+        Close the journal file.
+        '''
+        self._file.close()
+
+    def __len__(self):
+        '''
+        Get the number of records in the journal.
+        '''
+        return self._count
@@ -0,0 +1,142 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import json
+from collections.abc import MutableMapping
+
+from src.patron import Patron
+
+class LazyPatrons():
+    '''
+    Patron data which is loaded from file one patron at a time, the first
+    time each patron is looked up.
+
+    Only the position of each patron's record in the file is known to
+    begin with. Looking a patron up by ID reads and loads just that
+    patron's record (including loans); iterating over the patrons loads
+    every patron not yet loaded. Loaded patrons are kept, so each record
+    is only read once.
+    '''
+    def __init__(self, path, offsets, library_catalogue, catalogue_index):
+        '''
+        Create lazily loaded patron data.
+            Args:
+                path (string): the JSON file of patron data.
+                offsets (dict): mapping of patron ID to the (start, end) byte
+                    offsets of the patron's record in the file, in file order.
+                library_catalogue: the catalogue data, used to link loans to items.
+                catalogue_index (dict): mapping of item ID to item, used to
+                    link loans to items.
+        '''
+        self._path = path
+        self._offsets = offsets
+        self._library_catalogue = library_catalogue
+        self._catalogue_index = catalogue_index
+        self._order = list(offsets)
+        self._loaded = {}
+
+    def get(self, patron_id):
+        '''
+        Get the patron with the given ID, loading it if needed.
+            Args:
+                patron_id (int): the ID of the patron.
+
+            Returns:
+                the patron, or None if there is no patron with the ID.
+        '''
+        patron = self._loaded.get(patron_id)
+        if (patron is None) and (patron_id in self._offsets):
+            start, end = self._offsets[patron_id]
+            with open(self._path, 'rb') as f:
+                f.seek(start)
+                record = json.loads(f.read(end - start))
+            patron = Patron()
+            patron.load_data(record, self._library_catalogue, self._catalogue_index)
+            self._loaded[patron_id] = patron
+
+        return patron
+
+    def append(self, patron):
+        '''
+        Add a new patron (not in the file).
+        '''
+        self._loaded[patron._id] = patron
+        self._order.append(patron._id)
+
+    def ids(self):
+        '''
+        List the ID of every patron (in file order, followed by new patrons),
+        without loading them.
+        '''
+        return self._order
+
+    def __contains__(self, patron_id):
+        '''
+        Check whether there is a patron with the given ID.
+        '''
+        return (patron_id in self._loaded) or (patron_id in self._offsets)
+
+    def __len__(self):
+        '''
+        Get the number of patrons.
+        '''
+        return len(self._order)
+
+    def __getitem__(self, position):
+        '''
+        Get the patron at a position (in file order, followed by new patrons).
+        '''
+        return self.get(self._order[position])
+
+    def __iter__(self):
+        '''
+        Yield every patron, in file order followed by new patrons,
+        loading any not yet loaded.
+        '''
+        for patron_id in self._order:
+            yield self.get(patron_id)
+
+
+class LazyIndex(MutableMapping):
+    '''
+    A mapping to patrons in a LazyPatrons, which only loads a patron when
+    it is looked up. Keys are either patron IDs, or are mapped to patron IDs.
+    '''
+    def __init__(self, patrons, ids=None):
+        '''
+        Create an index of lazily loaded patrons.
+            Args:
+                patrons (LazyPatrons): the patrons to index.
+                ids (dict): optional mapping of key to patron ID. If not given,
+                    the keys are the patron IDs.
+        '''
+        self._patrons = patrons
+        self._ids = ids
+
+    def __getitem__(self, key):
+        patron_id = key if self._ids is None else self._ids[key]
+        patron = self._patrons.get(patron_id)
+        if patron is None:
+            raise KeyError(key)
+        return patron
+
+    def __setitem__(self, key, patron):
+        # the patron itself is added to the LazyPatrons
+        if self._ids is not None:
+            self._ids[key] = patron._id
+
+    def __delitem__(self, key):
+        raise TypeError("patrons can not be removed")
+
+    def __contains__(self, key):
+        return (key in self._patrons) if self._ids is None else (key in self._ids)
+
+    def __iter__(self):
+        return iter(self._patrons.ids()) if self._ids is None else iter(self._ids)
+
+    def __len__(self):
+        return len(self._patrons) if self._ids is None else len(self._ids)
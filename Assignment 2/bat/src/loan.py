@@ -5,19 +5,56 @@ Assignment code for FIT2107 Software Quality and Testing.
 Not to be shared or distributed without permission.
 '''
 
+from datetime import date, datetime
+
+# due dates already parsed by parse_due_date, by text
+_parsed_due_dates = {}
+
+def parse_due_date(text):
+    '''
+    Parse a loan due date saved in the format dd/mm/yyyy.
+    Due dates repeat heavily across loans, so each distinct date is only
+    parsed once. Dates in exactly the saved format are parsed directly;
+    anything else is left to datetime.strptime, which raises an error for
+    invalid dates in the same way.
+        Args:
+            text (string): the date to parse.
+
+        Returns:
+            the date.
+
+        Raises:
+            ValueError: if the text is not a valid date in the format dd/mm/yyyy.
+    '''
+    due_date = _parsed_due_dates.get(text)
+    if due_date is None:
+        if (len(text) == 10) and text.isascii() and (text[2] == "/") and (text[5] == "/") \
+                and text[:2].isdigit() and text[3:5].isdigit() and text[6:].isdigit():
+            due_date = date(int(text[6:]), int(text[3:5]), int(text[:2]))
+        else:
+            due_date = datetime.strptime(text, '%d/%m/%Y').date()
+        _parsed_due_dates[text] = due_date
+
+    return due_date
+
+
 class Loan():
     '''
     Represents a loan held by one of AAL's patrons.
     Every loan has:
     - a borrowable item that has been loaned
     - a due date
+
+    Loans are slotted to keep the memory used per loan small.
     '''
+    __slots__ = ("_item", "_due_date")
+
     def __init__(self, item, due_date):
         '''
         Create a new loan.
             Args
                 item (BorrowableItem): the item being borrowed
-                due_date (datetime.Date): the date the item needs to be returned
+                due_date (datetime.date): the date the item needs to be returned
         '''
         self._item = item
         self._due_date = due_date
@@ -28,4 +65,65 @@ class Loan():
         '''
         desc = f"Item {self._item._id}: {self._item._name} ({self._item._type}); due {self._due_date.strftime('%d/%m/%Y')}"
 
-        return desc
\ No newline at end of file
+        return desc
+
+class LoanMap():
+    '''
+    The loans held by a patron, stored by the ID of the loaned item.
+
+    Used like a list of Loan (append, remove, iterate, index), in the order
+    the loans were added, but finding, removing, and checking for a loan
+    are constant time. A patron holds at most one loan of each item.
+    '''
+    __slots__ = ("_by_item",)
+
+    def __init__(self, loans=()):
+        '''
+        Create a loan map.
+            Args:
+                loans: optional loans to add, in order.
+        '''
+        self._by_item = {}
+        for loan in loans:
+            self.append(loan)
+
+    def append(self, loan):
+        '''
+        Add a loan, after the existing loans.
+        '''
+        self._by_item[loan._item._id] = loan
+
+    def remove(self, loan):
+        '''
+        Remove a loan.
+            Raises:
+                ValueError: if the loan is not in the map.
+        '''
+        if loan not in self:
+            raise ValueError("loan not in LoanMap")
+        del self._by_item[loan._item._id]
+
+    def find(self, item_id):
+        '''
+        Get the loan of the item with the given ID.
+            Returns:
+                the Loan, or None if the item is not loaned.
+        '''
+        return self._by_item.get(item_id)
+
+    def __contains__(self, loan):
+        return self._by_item.get(loan._item._id) is loan
+
+    def __iter__(self):
+        return iter(self._by_item.values())
+
+    def __len__(self):
+        return len(self._by_item)
+
+    def __getitem__(self, position):
+        return list(self._by_item.values())[position]
+
+    def __eq__(self, other):
+        if isinstance(other, LoanMap):
+            other = list(other)
+        return list(self) == other
@@ -6,11 +6,33 @@ Not to be shared or distributed without permission.
 '''
 
 import json
-from datetime import datetime
+import sys
 
-from src.loan import Loan
+from src.loan import Loan, LoanMap, parse_due_date
 import src.search as search
 
+# bits of Patron._training
+GARDENING_TOOL_TRAINING = 1
+CARPENTRY_TOOL_TRAINING = 2
+MAKERSPACE_TRAINING = 4
+
+def _training_property(bit):
+    '''
+    Create a property giving access to one training completion stored
+    in Patron._training, as a bool ("NO DATA LOADED" if no data is loaded).
+    '''
+    def get(self):
+        if self._training is None:
+            return "NO DATA LOADED"
+        return bool(self._training & bit)
+
+    def set(self, completed):
+        training = self._training or 0
+        self._training = (training | bit) if completed else (training & ~bit)
+
+    return property(get, set)
+
+
 class Patron():
     '''
     Represents a patron of AAL.
@@ -23,8 +45,27 @@ class Patron():
     - record of gardening tool training (yes or no)
     - record of carpentry tool training (yes or no)
     - record of makerspace tool training (yes or no)
-    - loans (list of Loan)
+    - loans (LoanMap, used like a list of Loan)
+
+    Patrons are slotted, and the three training completions are stored
+    together as bits of _training (but accessed as separate attributes),
+    to keep the memory used per patron small.
     '''
+    __slots__ = ("_loan_map", "_id", "_name", "_age", "_outstanding_fees", "_training")
+
+    _gardening_tool_training = _training_property(GARDENING_TOOL_TRAINING)
+    _carpentry_tool_training = _training_property(CARPENTRY_TOOL_TRAINING)
+    _makerspace_training = _training_property(MAKERSPACE_TRAINING)
+
+    @property
+    def _loans(self):
+        return self._loan_map
+
+    @_loans.setter
+    def _loans(self, loans):
+        # any list of loans assigned is stored as a LoanMap
+        self._loan_map = loans if isinstance(loans, LoanMap) else LoanMap(loans)
+
     def __init__(self):
         '''
         Initialise a new patron with no data.
@@ -34,35 +75,36 @@ class Patron():
         self._name = "NO DATA LOADED"
         self._age = "NO DATA LOADED"
         self._outstanding_fees = "NO DATA LOADED"
-        self._gardening_tool_training = "NO DATA LOADED"
-        self._carpentry_tool_training = "NO DATA LOADED"
-        self._makerspace_training = "NO DATA LOADED"
+        self._training = None
 
-    def load_data(self, json_record, library_catalogue):
+    def load_data(self, json_record, library_catalogue, catalogue_index=None):
         '''
         Load information about a patron from JSON.
         Sets the patron's ID, name, age, outstanding fees, loans, and
-        training completions.
+        training completions. Names are interned, as they often repeat.
         '''
-        self._loans = self.load_loans(json_record["loans"], library_catalogue)
+        self._loans = self.load_loans(json_record["loans"], library_catalogue, catalogue_index)
         self._id = int(json_record["patron_id"])
-        self._name = json_record["name"]
+        self._name = sys.intern(json_record["name"])
         self._age = int(json_record["age"])
         self._outstanding_fees = float(json_record["outstanding_fees"])
-        self._gardening_tool_training = bool(json_record["gardening_tool_training"])
-        self._carpentry_tool_training = bool(json_record["carpentry_tool_training"])
-        self._makerspace_training = bool(json_record["makerspace_training"])
+        self._training = ((GARDENING_TOOL_TRAINING if json_record["gardening_tool_training"] else 0)
+                          | (CARPENTRY_TOOL_TRAINING if json_record["carpentry_tool_training"] else 0)
+                          | (MAKERSPACE_TRAINING if json_record["makerspace_training"] else 0))
 
-    def load_loans(self, json_record, library_catalogue):
+    def load_loans(self, json_record, library_catalogue, catalogue_index=None):
         '''
         Load information about a patron's loans from JSON.
+        Loaned items are looked up in the catalogue ID index if one
+        is provided, otherwise the catalogue data is searched.
+        Returns a LoanMap.
         '''
-        loans = []
+        loans = LoanMap()
         for loan_info in json_record:
             item_id = int(loan_info["item"])
-            item = search.find_item_by_id(item_id, library_catalogue)
+            item = search.find_item_by_id(item_id, library_catalogue, catalogue_index)
             if item is not None:
-                due_date = datetime.strptime(loan_info["due"], '%d/%m/%Y')
+                due_date = parse_due_date(loan_info["due"])
                 new_loan = Loan(item, due_date)
                 loans.append(new_loan)
 
@@ -78,10 +120,7 @@ class Patron():
                 The Loan relating to that item if the patron has loaned
                 the item with the ID, otherwise None.
         '''
-        for l in self._loans:
-            if l._item._id == item_id:
-                return l
-        return None
+        return self._loans.find(item_id)
 
     def set_new_patron_data(self, id, name, age):
         '''
@@ -97,9 +136,7 @@ class Patron():
         self._name = name
         self._age = age
         self._outstanding_fees = 0.0
-        self._gardening_tool_training = False
-        self._carpentry_tool_training = False
-        self._makerspace_training = False
+        self._training = 0
 
     def __str__(self):
         '''
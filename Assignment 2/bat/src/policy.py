@@ -0,0 +1,228 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import json
+import math
+import os
+from bisect import bisect_right
+
+import src.business_logic as logic
+
+# the training a rule can require, and the rules it can be required by
+LOAN_TRAINING = ("gardening tool", "carpentry tool")
+MAKERSPACE_TRAINING = ("makerspace",)
+
+class Policy():
+    '''
+    Loan and makerspace rules compiled from a policy (see compile_policy).
+    '''
+    def __init__(self, loan_rules, makerspace_rule, discount, limits):
+        '''
+        Create a compiled policy.
+            Args:
+                loan_rules (dict): mapping of item type to a function taking the
+                    arguments of can_borrow (other than the item type), which
+                    determines whether a loan of that type of item can occur.
+                makerspace_rule: a function taking the arguments of
+                    can_use_makerspace, which determines whether a patron can
+                    use the makerspace.
+                discount: a function taking a patron's age, which calculates
+                    their discount as business_logic.calculate_discount does.
+                limits (dict): the limits the functions apply, for checking
+                    many patrons at once (see src.batch_eligibility): under
+                    "discounts", a (min_ages, percentages) pair (see
+                    _compile_loan_rule); under "item_types", a mapping of item
+                    type to a (max_days, min_age, max_age, needs gardening
+                    tool training, needs carpentry tool training) tuple; and
+                    under "makerspace", a (min_age, max_age, needs makerspace
+                    training) tuple.
+        '''
+        self._loan_rules = loan_rules
+        self._makerspace_rule = makerspace_rule
+        self._discount = discount
+        self._limits = limits
+
+
+def compile_policy(policy):
+    '''
+    Compile a policy to the functions which apply it. Each function only
+    performs the checks its part of the policy needs, so the cost of
+    checking a loan does not grow with the number of item types.
+
+    A policy is a dict (e.g. loaded from a JSON file) with the keys:
+    - "discounts": a list of discount bands, each a dict with "min_age" and
+      "discount" (a whole number percentage). A patron gets the discount of
+      the band with the highest "min_age" not above their age, or no
+      discount if there is none.
+    - "item_types": a dict mapping each type of item which can be loaned to
+      its rule, a dict with "max_days" (the longest loan allowed), and
+      optionally "min_age" and "max_age" (inclusive) and "training" (a list
+      of the LOAN_TRAINING the patron must have completed).
+    - "makerspace": the makerspace rule, a dict with optional "min_age",
+      "max_age" and "training" (a list of MAKERSPACE_TRAINING).
+    No patron with fees owed (i.e., fees to pay after discounts are
+    considered) can borrow an item or use the makerspace. Checking a loan
+    for a negative age raises TypeError, as can_borrow does; a negative age
+    can not use the makerspace.
+        Args:
+            policy (dict): the policy to compile.
+
+        Returns:
+            a Policy.
+
+        Raises:
+            ValueError: if the policy is not valid.
+    '''
+    try:
+        bands = sorted((band["min_age"], band["discount"]) for band in policy["discounts"])
+        discounts = ([age for age, _ in bands], [0] + [d for _, d in bands])
+        item_limits = {item_type: _loan_limits(rule) for item_type, rule in policy["item_types"].items()}
+        makerspace_limits = _makerspace_limits(policy["makerspace"])
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"invalid policy: {e!r}") from e
+
+    loan_rules = {item_type: _compile_loan_rule(limits, discounts) for item_type, limits in item_limits.items()}
+    makerspace_rule = _compile_makerspace_rule(makerspace_limits, discounts)
+
+    min_ages, percentages = discounts
+
+    def discount(age):
+        if age < 0:
+            return "ERROR"
+        return percentages[bisect_right(min_ages, age)]
+
+    limits = {"discounts": discounts, "item_types": item_limits, "makerspace": makerspace_limits}
+    return Policy(loan_rules, makerspace_rule, discount, limits)
+
+
+def load_policy(path):
+    '''
+    Load and compile a policy from a JSON file.
+        Args:
+            path (string): the policy file.
+
+        Returns:
+            a Policy.
+
+        Raises:
+            ValueError: if the file is not a valid policy.
+    '''
+    with open(path, 'r') as f:
+        return compile_policy(json.load(f))
+
+
+class PolicyFile():
+    '''
+    A policy file whose policy is applied by business_logic, and which can
+    be reloaded when the file changes, without restarting BAT.
+    '''
+    def __init__(self, path):
+        '''
+        Load a policy file and apply its policy.
+            Args:
+                path (string): the policy file.
+
+            Raises:
+                ValueError: if the file is not a valid policy.
+        '''
+        self._path = path
+        self._stamp = None
+        self.reload_if_changed()
+
+    def reload_if_changed(self):
+        '''
+        Load and apply the policy again if the file has changed since it was
+        last loaded. If the changed file can not be loaded, the policy
+        already applied stays in use (and the error is only raised once for
+        each change).
+
+            Returns:
+                True if the policy was reloaded, otherwise False.
+
+            Raises:
+                ValueError: if the file is not a valid policy.
+                OSError: if the file can not be read.
+        '''
+        stat = os.stat(self._path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+
+        self._stamp = stamp
+        logic.use_policy(load_policy(self._path))
+        return True
+
+
+def _check_training(training, allowed):
+    '''
+    Check that a rule's training requirements are all in allowed.
+    '''
+    for name in training:
+        if name not in allowed:
+            raise ValueError(f"unknown training {name!r}")
+
+
+def _loan_limits(rule):
+    '''
+    Get the (max_days, min_age, max_age, needs gardening tool training,
+    needs carpentry tool training) limits of the rule for one type of item.
+    '''
+    training = rule.get("training", [])
+    _check_training(training, LOAN_TRAINING)
+    return (rule["max_days"], rule.get("min_age", 0), rule.get("max_age", math.inf),
+            "gardening tool" in training, "carpentry tool" in training)
+
+
+def _makerspace_limits(rule):
+    '''
+    Get the (min_age, max_age, needs makerspace training) limits of the makerspace rule.
+    '''
+    training = rule.get("training", [])
+    _check_training(training, MAKERSPACE_TRAINING)
+    return rule.get("min_age", 0), rule.get("max_age", math.inf), "makerspace" in training
+
+
+def _compile_loan_rule(limits, discounts):
+    '''
+    Compile the rule for one type of item, from its limits (see
+    _loan_limits). discounts is a (min_ages, percentages) pair, where
+    percentages[i] applies from min_ages[i - 1] (and percentages[0] below
+    min_ages[0]).
+    '''
+    max_days, min_age, max_age, needs_gardening, needs_carpentry = limits
+    min_ages, percentages = discounts
+
+    def can_borrow_item(patron_age, length_of_loan, outstanding_fees, gardening_tool_training, carpentry_tool_training):
+        if length_of_loan > max_days:
+            return False
+        if patron_age < 0:
+            raise TypeError("can not calculate a discount for a negative age")
+        if outstanding_fees - (outstanding_fees * (percentages[bisect_right(min_ages, patron_age)] / 100)) > 0:
+            return False
+        if not (min_age <= patron_age <= max_age):
+            return False
+        return (gardening_tool_training or not needs_gardening) and (carpentry_tool_training or not needs_carpentry)
+
+    return can_borrow_item
+
+
+def _compile_makerspace_rule(limits, discounts):
+    '''
+    Compile the makerspace rule, from its limits (see _makerspace_limits).
+    discounts is as for _compile_loan_rule.
+    '''
+    min_age, max_age, needs_training = limits
+    min_ages, percentages = discounts
+
+    def can_use_makerspace(patron_age, outstanding_fees, makerspace_training):
+        if not (min_age <= patron_age <= max_age):
+            return False
+        if needs_training and not makerspace_training:
+            return False
+        return not (outstanding_fees - (outstanding_fees * (percentages[bisect_right(min_ages, patron_age)] / 100)) > 0)
+
+    return can_use_makerspace
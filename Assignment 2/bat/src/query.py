@@ -0,0 +1,155 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+class PatronQuery():
+    '''
+    A search over patron data combining several conditions.
+
+    Conditions are added with the filter methods, which can be chained:
+
+        PatronQuery(data_manager).name_prefix("Tim").age_between(65, 89).fees_above(0).run()
+
+    When the query is run, the planner estimates how many patrons each
+    indexed condition (name, name prefix, age, age range) would match using
+    the DataManager's indexes, and takes the candidates from the most
+    selective one. The remaining conditions are checked against each
+    candidate in turn. If no indexed condition was given, or the
+    DataManager has no index for them (e.g., with lazy loading), every
+    patron is checked.
+    '''
+    def __init__(self, data_manager):
+        '''
+        Create a new query with no conditions, which matches every patron.
+            Args:
+                data_manager (DataManager): a data manager with patron data loaded.
+        '''
+        self._data_manager = data_manager
+        self._access_paths = []
+        self._predicates = []
+
+    def name(self, name):
+        '''
+        Only match patrons with the given name. Case insensitive.
+        '''
+        index = self._data_manager._name_index
+        folded = name.casefold()
+        if index is not None:
+            self._access_paths.append(("name", lambda: index.count(name), lambda: index.find(name)))
+        self._predicates.append(lambda p: p._name.casefold() == folded)
+        return self
+
+    def name_prefix(self, prefix):
+        '''
+        Only match patrons with a name starting with the given prefix. Case insensitive.
+        '''
+        index = self._data_manager._name_index
+        folded = prefix.casefold()
+        if index is not None:
+            self._access_paths.append(("name prefix", lambda: index.count_prefix(prefix), lambda: index.find_prefix(prefix)))
+        self._predicates.append(lambda p: p._name.casefold().startswith(folded))
+        return self
+
+    def age(self, age):
+        '''
+        Only match patrons with the given age.
+        '''
+        return self.age_between(age, age)
+
+    def age_between(self, min_age, max_age):
+        '''
+        Only match patrons with an age from min_age to max_age (inclusive).
+        '''
+        index = self._data_manager._age_index
+        if index is not None:
+            self._access_paths.append(("age", lambda: index.count_range(min_age, max_age), lambda: index.find_range(min_age, max_age)))
+        self._predicates.append(lambda p: min_age <= p._age <= max_age)
+        return self
+
+    def fees_above(self, amount):
+        '''
+        Only match patrons with outstanding fees (before discounts) greater than amount.
+        '''
+        self._predicates.append(lambda p: p._outstanding_fees > amount)
+        return self
+
+    def fees_at_most(self, amount):
+        '''
+        Only match patrons with outstanding fees (before discounts) of at most amount.
+        '''
+        self._predicates.append(lambda p: p._outstanding_fees <= amount)
+        return self
+
+    def gardening_tool_training(self, completed=True):
+        '''
+        Only match patrons who have (or have not) completed the gardening tool training.
+        '''
+        self._predicates.append(lambda p: p._gardening_tool_training == completed)
+        return self
+
+    def carpentry_tool_training(self, completed=True):
+        '''
+        Only match patrons who have (or have not) completed the carpentry tool training.
+        '''
+        self._predicates.append(lambda p: p._carpentry_tool_training == completed)
+        return self
+
+    def makerspace_training(self, completed=True):
+        '''
+        Only match patrons who have (or have not) completed the makerspace training.
+        '''
+        self._predicates.append(lambda p: p._makerspace_training == completed)
+        return self
+
+    def where(self, predicate):
+        '''
+        Only match patrons for which predicate(patron) is true.
+        '''
+        self._predicates.append(predicate)
+        return self
+
+    def plan(self):
+        '''
+        Choose how the query will find its candidate patrons.
+
+            Returns:
+                a (description, candidates) tuple, where description is the
+                name of the condition whose index is used ("full scan" if no
+                index is used), and candidates is a function returning the
+                candidate patrons.
+        '''
+        best = None
+        best_count = None
+        for path in self._access_paths:
+            count = path[1]()
+            if (best_count is None) or (count < best_count):
+                best = path
+                best_count = count
+
+        if best is None:
+            return ("full scan", lambda: self._data_manager._patron_data)
+
+        return (best[0], best[2])
+
+    def __iter__(self):
+        '''
+        Yield each patron matching every condition of the query.
+        '''
+        description, candidates = self.plan()
+        predicates = self._predicates
+        for patron in candidates():
+            if all(predicate(patron) for predicate in predicates):
+                yield patron
+
+    def run(self):
+        '''
+        Run the query.
+
+            Returns:
+                a list of the patrons matching every condition of the query,
+                or an empty list if none were found.
+        '''
+        return list(self)
@@ -5,38 +5,91 @@ Assignment code for FIT2107 Software Quality and Testing.
 Not to be shared or distributed without permission.
 '''
 
-def find_patron_by_name(name, patron_data):
+import heapq
+from datetime import timedelta
+
+from src.indexes import trigrams, similarity, MIN_SIMILARITY
+
+def find_patron_by_name(name, patron_data, name_index=None):
     '''
     Find all the patrons with the given name.
     Search is case insensitive.
+    If a name index is provided (from a DataManager), the patrons are
+    looked up in the index rather than searching the patron data.
         Args:
             name (string): the name to search for.
             patron_data: the patron data to search (from a DataManager).
+            name_index (NameIndex): optional index of patrons by name (from a DataManager).
         
         Returns:
             a list of patrons with the given name, or an empty list if
             none were found.
     '''
+    if name_index is not None:
+        return name_index.find(name)
+
     found = []
+    folded = name.casefold()
 
     for patron in patron_data:
-        if patron._name == name:
+        if patron._name.casefold() == folded:
             found.append(patron)
 
     return found
 
 
-def find_patron_by_age(age, patron_data):
+def find_patron_by_similar_name(name, patron_data, name_index=None, limit=10):
+    '''
+    Find the patrons with names similar to the given name, to allow for
+    typing mistakes. Search is case insensitive.
+    If a name index is provided (from a DataManager), the patrons are
+    looked up in the index rather than searching the patron data.
+        Args:
+            name (string): the name to search for.
+            patron_data: the patron data to search (from a DataManager).
+            name_index (NameIndex): optional index of patrons by name (from a DataManager).
+            limit (int): the maximum number of distinct names to return patrons for.
+
+        Returns:
+            a list of patrons, most similar names first, or an empty list if
+            none were found.
+    '''
+    if name_index is not None:
+        return name_index.find_similar(name, limit)
+
+    grams = trigrams(name)
+    scores = {}
+    for patron in patron_data:
+        folded = patron._name.casefold()
+        if folded not in scores:
+            scores[folded] = similarity(grams, trigrams(folded))
+
+    best = heapq.nsmallest(limit, (n for n in scores if scores[n] >= MIN_SIMILARITY), key=lambda n: (-scores[n], n))
+    ranks = {n: i for i, n in enumerate(best)}
+
+    found = [p for p in patron_data if p._name.casefold() in ranks]
+    found.sort(key=lambda p: ranks[p._name.casefold()])
+
+    return found
+
+
+def find_patron_by_age(age, patron_data, age_index=None):
     '''
     Find all the patrons with the given age.
+    If an age index is provided (from a DataManager), the patrons are
+    looked up in the index rather than searching the patron data.
         Args:
             age (int): the age to search for.
             patron_data: the patron data to search (from a DataManager).
+            age_index (AgeIndex): optional index of patrons by age (from a DataManager).
         
         Returns:
             a list of patrons with the given age, or an empty list if
             none were found.
     '''
+    if age_index is not None:
+        return age_index.find(age)
+
     found = []
 
     for patron in patron_data:
@@ -46,40 +99,182 @@ def find_patron_by_age(age, patron_data):
     return found
 
 
-def find_patron_by_name_and_age(name, age, patron_data):
+def find_patron_by_age_range(min_age, max_age, patron_data, age_index=None):
+    '''
+    Find all the patrons with an age in the given range.
+    If an age index is provided (from a DataManager), the patrons are
+    looked up in the index rather than searching the patron data.
+        Args:
+            min_age (int): the lowest age to search for (inclusive).
+            max_age (int): the highest age to search for (inclusive).
+            patron_data: the patron data to search (from a DataManager).
+            age_index (AgeIndex): optional index of patrons by age (from a DataManager).
+
+        Returns:
+            a list of patrons in the age range, or an empty list if
+            none were found. Patrons found through the index are ordered by age.
+    '''
+    if age_index is not None:
+        return age_index.find_range(min_age, max_age)
+
+    found = []
+
+    for patron in patron_data:
+        if min_age <= patron._age <= max_age:
+            found.append(patron)
+
+    return found
+
+
+def patron_key(name, age):
+    '''
+    Create the key used to identify a patron by name and age.
+    Names are compared case insensitively.
+        Args:
+            name (string): the patron's name.
+            age (int): the patron's age.
+
+        Returns:
+            a (casefolded name, age) tuple.
+    '''
+    return (name.casefold(), age)
+
+
+def find_patron_by_name_and_age(name, age, patron_data, patron_index=None):
     '''
     Find the patron with the given age. Assumes there are no two patrons
     with the same name and age combination.
+    If a name and age index is provided (from a DataManager), the patron is
+    looked up directly in the index rather than searching the patron data.
         Args:
             name (string): the name to search for.
             age (int): the age to search for.
             patron_data: the patron data to search (from a DataManager).
+            patron_index (dict): optional mapping of patron_key to patron (from a DataManager).
         
         Returns:
             a patron with the given name and age, or None.
     '''
+    key = patron_key(name, age)
+
+    if patron_index is not None:
+        return patron_index.get(key)
+
     # find the first patron in the database with the given name and age combo
     for patron in patron_data:
-        if (patron._name.lower() == name.lower()) and (patron._age == age):
+        if patron_key(patron._name, patron._age) == key:
             return patron
 
     return None
 
 
-def find_item_by_id(item_id, catalogue_data):
+def find_item_by_id(item_id, catalogue_data, catalogue_index=None):
     '''
     Find the item with the given ID.
+    If an ID index is provided (from a DataManager), the item is looked up
+    directly in the index rather than searching the catalogue data.
         Args:
             item_id (int): the item ID to search for.
             catalogue_data: the catalogue data to search (from a DataManager).
+            catalogue_index (dict): optional mapping of item ID to item (from a DataManager).
 
         Returns:
             the item with the given ID, or None.
     '''
-    found = None
+    if catalogue_index is not None:
+        return catalogue_index.get(item_id)
 
     for item in catalogue_data:
         if item._id == item_id:
-            found = item
+            return item
+
+    return None
 
-    return found
\ No newline at end of file
+
+def find_borrowers_of_item(item_id, patron_data, loan_index=None):
+    '''
+    Find all the patrons currently borrowing the item with the given ID.
+    If a loan index is provided (from a DataManager), the patrons are
+    looked up in the index rather than searching every patron's loans.
+        Args:
+            item_id (int): the item ID to search for.
+            patron_data: the patron data to search (from a DataManager).
+            loan_index (LoanIndex): optional index of loans by item (from a DataManager).
+
+        Returns:
+            a list of patrons borrowing the item, or an empty list if
+            none were found.
+    '''
+    if loan_index is not None:
+        return [patron for patron, loan in loan_index.find(item_id)]
+
+    found = []
+
+    for patron in patron_data:
+        if patron.find_loan(item_id) is not None:
+            found.append(patron)
+
+    return found
+
+
+def find_overdue_loans(as_of, patron_data, due_index=None):
+    '''
+    Find all the loans which are overdue as of the given date, i.e. which
+    were due before that date.
+    If a due date index is provided (from a DataManager), the loans are
+    looked up in the index rather than searching every patron's loans.
+        Args:
+            as_of (date): the date to check against.
+            patron_data: the patron data to search (from a DataManager).
+            due_index (DueDateIndex): optional index of loans by due date (from a DataManager).
+
+        Returns:
+            a list of (patron, loan) pairs ordered by due date, or an empty
+            list if no loans are overdue.
+    '''
+    if due_index is not None:
+        return due_index.find_before(as_of)
+
+    found = []
+    cutoff = as_of.toordinal()
+
+    for patron in patron_data:
+        for loan in patron._loans:
+            if loan._due_date.toordinal() < cutoff:
+                found.append((patron, loan))
+
+    found.sort(key=lambda pl: pl[1]._due_date.toordinal())
+    return found
+
+
+def find_loans_due_soon(as_of, days, patron_data, due_index=None):
+    '''
+    Find all the loans due in the given number of days after a date
+    (including loans due on the date itself).
+    If a due date index is provided (from a DataManager), the loans are
+    looked up in the index rather than searching every patron's loans.
+        Args:
+            as_of (date): the date to start from.
+            days (int): the number of days after the date to include.
+            patron_data: the patron data to search (from a DataManager).
+            due_index (DueDateIndex): optional index of loans by due date (from a DataManager).
+
+        Returns:
+            a list of (patron, loan) pairs ordered by due date, or an empty
+            list if no loans are due.
+    '''
+    last_date = as_of + timedelta(days=days)
+
+    if due_index is not None:
+        return due_index.find_between(as_of, last_date)
+
+    found = []
+    first, last = as_of.toordinal(), last_date.toordinal()
+
+    for patron in patron_data:
+        for loan in patron._loans:
+            if first <= loan._due_date.toordinal() <= last:
+                found.append((patron, loan))
+
+    found.sort(key=lambda pl: pl[1]._due_date.toordinal())
+    return found
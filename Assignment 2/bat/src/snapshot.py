@@ -0,0 +1,111 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import gc
+import hashlib
+import os
+import pickle
+
+# the version of the snapshot format, to change whenever the meaning of the
+# stored state changes in a way class_layout does not show
+FORMAT_VERSION = 1
+
+def fingerprint(paths, classes=()):
+    '''
+    Identify the current contents of some files, and the code a snapshot
+    made from them would be loaded by, so that the snapshot can be checked
+    for being out of date.
+        Args:
+            paths: the files to identify.
+            classes: the classes of the objects stored in the snapshot
+                (see class_layout).
+
+        Returns:
+            a (FORMAT_VERSION, class layout, files) tuple, where files is a
+            list of (path, size, modification time, SHA-256 digest) tuples,
+            one for each file.
+    '''
+    files = []
+    for path in paths:
+        stat = os.stat(path)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        files.append((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, digest.hexdigest()))
+
+    return (FORMAT_VERSION, class_layout(classes), files)
+
+
+def class_layout(classes):
+    '''
+    Describe the attributes of some classes, so that objects pickled by a
+    different version of a class (e.g., one which has since gained an
+    attribute) are not loaded. Classes with __slots__ are described by
+    their slots, including inherited slots; other classes by the attributes
+    of a new instance, so they must be creatable without arguments.
+        Args:
+            classes: the classes to describe.
+
+        Returns:
+            a list of (class name, attribute names) tuples, one for each class.
+    '''
+    layout = []
+    for cls in classes:
+        if "__slots__" in vars(cls):
+            names = [name for c in cls.__mro__ for name in vars(c).get("__slots__", ())]
+        else:
+            names = list(vars(cls()))
+        layout.append((f"{cls.__module__}.{cls.__qualname__}", sorted(names)))
+
+    return layout
+
+
+def load_snapshot(snapshot_path, source_fingerprint):
+    '''
+    Load a snapshot, if it was made from the source files as they are now.
+        Args:
+            snapshot_path (string): the snapshot file.
+            source_fingerprint: the current fingerprint of the source files.
+
+        Returns:
+            the state stored in the snapshot, or None if there is no snapshot,
+            it is out of date (including being made by a different version
+            of the code), or it can not be read or unpickled.
+    '''
+    try:
+        with open(snapshot_path, 'rb') as f:
+            if pickle.load(f) != source_fingerprint:
+                return None
+            # unpickling creates many objects at once, none of which can be
+            # garbage yet, so pause the garbage collector while it runs
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    except Exception:
+        return None
+
+
+def save_snapshot(snapshot_path, source_fingerprint, state):
+    '''
+    Save a snapshot. The snapshot is written to a temporary file which then
+    replaces any existing snapshot.
+        Args:
+            snapshot_path (string): the snapshot file.
+            source_fingerprint: the fingerprint of the source files, taken
+                before the state was loaded from them.
+            state: the (picklable) state to store.
+    '''
+    temp_path = snapshot_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(source_fingerprint, f, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, snapshot_path)
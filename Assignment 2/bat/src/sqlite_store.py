@@ -0,0 +1,642 @@
+'''
+Author: Charlotte Pierce
+
+Assignment code for FIT2107 Software Quality and Testing.
+Not to be shared or distributed without permission.
+'''
+
+import os
+import sqlite3
+import heapq
+from collections.abc import Mapping, MutableMapping
+from datetime import date
+
+from src.patron import Patron
+from src.borrowable_item import BorrowableItem
+from src.loan import Loan
+from src.indexes import trigrams, similarity, MIN_SIMILARITY
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS items (
+    item_id INTEGER PRIMARY KEY,
+    item_name TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    number_owned INTEGER NOT NULL,
+    on_loan INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS patrons (
+    patron_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_folded TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    outstanding_fees REAL NOT NULL,
+    gardening_tool_training INTEGER NOT NULL,
+    carpentry_tool_training INTEGER NOT NULL,
+    makerspace_training INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS loans (
+    patron_id INTEGER NOT NULL REFERENCES patrons(patron_id),
+    item_id INTEGER NOT NULL REFERENCES items(item_id),
+    due TEXT NOT NULL,
+    PRIMARY KEY (patron_id, item_id)
+);
+CREATE INDEX IF NOT EXISTS patrons_by_name_and_age ON patrons(name_folded, age);
+CREATE INDEX IF NOT EXISTS patrons_by_age ON patrons(age);
+CREATE INDEX IF NOT EXISTS loans_by_item ON loans(item_id);
+CREATE INDEX IF NOT EXISTS loans_by_due ON loans(due);
+'''
+
+class SqliteStore():
+    '''
+    Stores patron, catalogue, and loan data in a SQLite database.
+
+    Changes are written to the database as they happen, each in its own
+    transaction, so there is no separate save step. Due dates are stored
+    as ISO 8601 (yyyy-mm-dd) strings so that they sort by date.
+
+    Data is not loaded from the database up front; SqliteItems and
+    SqlitePatrons load items and patrons as they are looked up, and the
+    Sqlite*Index classes answer searches with the database's indexes.
+    '''
+    def __init__(self, path, create=False):
+        '''
+        Open a database.
+            Args:
+                path (string): the database file.
+                create (bool): whether to create the database if it does not exist.
+
+            Raises:
+                FileNotFoundError: if the database does not exist and create is False.
+        '''
+        if (not create) and (not os.path.exists(path)):
+            raise FileNotFoundError(path)
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+
+    def next_patron_id(self):
+        '''
+        Find the ID to give the next new patron.
+
+            Returns:
+                one more than the highest patron ID in the database (1 if
+                there are no patrons).
+        '''
+        return self._connection.execute("SELECT COALESCE(MAX(patron_id), 0) + 1 FROM patrons").fetchone()[0]
+
+    def add_patrons(self, patrons):
+        '''
+        Add new patrons (without loans), in a single transaction.
+            Args:
+                patrons: the patrons to add.
+        '''
+        with self._connection:
+            self._connection.executemany("INSERT INTO patrons VALUES (?, ?, ?, ?, ?, ?, ?, ?)", map(self._patron_row, patrons))
+
+    def add_loans(self, patron, loans):
+        '''
+        Add new loans to a patron, and update the loaned items' "on loan"
+        counts, in a single transaction.
+            Args:
+                patron (Patron): the patron who borrowed the items.
+                loans: the new loans.
+        '''
+        with self._connection:
+            self._connection.executemany("INSERT INTO loans VALUES (?, ?, ?)",
+                                         [(patron._id, l._item._id, l._due_date.strftime('%Y-%m-%d')) for l in loans])
+            self._connection.executemany("UPDATE items SET on_loan = ? WHERE item_id = ?",
+                                         [(l._item._on_loan, l._item._id) for l in loans])
+
+    def remove_loan(self, patron, loan):
+        '''
+        Remove a returned loan, and update the returned item's "on loan" count.
+            Args:
+                patron (Patron): the patron who returned the item.
+                loan (Loan): the returned loan.
+        '''
+        with self._connection:
+            self._connection.execute("DELETE FROM loans WHERE patron_id = ? AND item_id = ?", (patron._id, loan._item._id))
+            self._connection.execute("UPDATE items SET on_loan = ? WHERE item_id = ?", (loan._item._on_loan, loan._item._id))
+
+    def save_patrons(self, patrons):
+        '''
+        Replace every patron and loan in the database.
+            Args:
+                patrons: the patrons to save.
+        '''
+        with self._connection:
+            self._connection.execute("DELETE FROM loans")
+            self._connection.execute("DELETE FROM patrons")
+            self._connection.executemany("INSERT INTO patrons VALUES (?, ?, ?, ?, ?, ?, ?, ?)", map(self._patron_row, patrons))
+            self._connection.executemany("INSERT INTO loans VALUES (?, ?, ?)",
+                                         ((p._id, l._item._id, l._due_date.strftime('%Y-%m-%d')) for p in patrons for l in p._loans))
+
+    def save_catalogue(self, items):
+        '''
+        Replace every item in the database.
+            Args:
+                items: the items to save.
+        '''
+        with self._connection:
+            self._connection.execute("DELETE FROM items")
+            self._connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                                         ((i._id, i._name, i._type, i._year, i._number_owned, i._on_loan) for i in items))
+
+    def close(self):
+        '''
+        Close the database.
+        '''
+        self._connection.close()
+
+    @staticmethod
+    def _patron_row(patron):
+        '''
+        Translate a patron to a row of the patrons table.
+        '''
+        return (patron._id, patron._name, patron._name.casefold(), patron._age, patron._outstanding_fees,
+                patron._gardening_tool_training, patron._carpentry_tool_training, patron._makerspace_training)
+
+
+
+class SqliteItems(Mapping):
+    '''
+    The catalogue in a SqliteStore, as a mapping of item ID to item.
+
+    Each item is loaded from the database the first time it is looked up,
+    and then kept, so every lookup of an ID gives the same BorrowableItem.
+    Iterating over the items loads every item not yet loaded.
+    '''
+    def __init__(self, store):
+        '''
+        Create a catalogue which loads items from a database.
+            Args:
+                store (SqliteStore): the database to load items from.
+        '''
+        self._connection = store._connection
+        self._loaded = {}
+        self._complete = False
+
+    def __getitem__(self, item_id):
+        '''
+        Look up an item by ID, loading it if needed.
+        '''
+        item = self._loaded.get(item_id)
+        if item is None:
+            row = None
+            if not self._complete:
+                row = self._connection.execute("SELECT * FROM items WHERE item_id = ?", (item_id,)).fetchone()
+            if row is None:
+                raise KeyError(item_id)
+            item = self._load(row)
+        return item
+
+    def __iter__(self):
+        '''
+        Iterate over every item ID, in ID order, loading any item not yet loaded.
+        '''
+        if not self._complete:
+            for row in self._connection.execute("SELECT * FROM items ORDER BY item_id"):
+                self._load(row)
+            self._complete = True
+        return iter(sorted(self._loaded))
+
+    def __len__(self):
+        '''
+        Get the number of items.
+        '''
+        if self._complete:
+            return len(self._loaded)
+        return self._connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def _load(self, row):
+        '''
+        Load an item from a row of the items table, unless it is already loaded.
+        '''
+        item = self._loaded.get(row["item_id"])
+        if item is None:
+            item = BorrowableItem()
+            item.load_data(row)
+            self._loaded[item._id] = item
+        return item
+
+
+class SqlitePatrons():
+    '''
+    Patron data in a SqliteStore, which is loaded from the database one
+    patron at a time, the first time each patron is looked up (as
+    LazyPatrons does for a JSON file).
+
+    Loaded patrons are kept, so each patron is only loaded once, and the
+    store writes any change to them through to the database. Iterating over
+    the patrons loads every patron not yet loaded.
+    '''
+    def __init__(self, store, catalogue_index):
+        '''
+        Create patron data which loads patrons from a database.
+            Args:
+                store (SqliteStore): the database to load patrons from.
+                catalogue_index: mapping of item ID to item, used to link
+                    loans to items.
+        '''
+        self._connection = store._connection
+        self._catalogue_index = catalogue_index
+        self._loaded = {}
+        self._complete = False
+
+    def get(self, patron_id):
+        '''
+        Look up a patron by ID, loading them (and their loans) if needed.
+            Args:
+                patron_id (int): the patron's ID.
+
+            Returns:
+                the patron, or None if there is no patron with the ID.
+        '''
+        patron = self._loaded.get(patron_id)
+        if (patron is None) and (not self._complete):
+            row = self._connection.execute("SELECT * FROM patrons WHERE patron_id = ?", (patron_id,)).fetchone()
+            if row is not None:
+                loans = self._connection.execute("SELECT item_id, due FROM loans WHERE patron_id = ? ORDER BY rowid",
+                                                 (patron_id,)).fetchall()
+                patron = self._load(row, loans)
+        return patron
+
+    def append(self, patron):
+        '''
+        Add a new patron. The patron must also be added to the database
+        (see SqliteStore.add_patrons).
+            Args:
+                patron (Patron): the patron to add.
+        '''
+        self._loaded[patron._id] = patron
+
+    def ids(self):
+        '''
+        List the ID of every patron, in ID order, without loading them.
+        '''
+        return [patron_id for (patron_id,) in self._connection.execute("SELECT patron_id FROM patrons ORDER BY patron_id")]
+
+    def __contains__(self, patron_id):
+        '''
+        Check whether there is a patron with the given ID.
+        '''
+        if (patron_id in self._loaded) or self._complete:
+            return patron_id in self._loaded
+        return self._connection.execute("SELECT 1 FROM patrons WHERE patron_id = ?", (patron_id,)).fetchone() is not None
+
+    def __len__(self):
+        '''
+        Get the number of patrons.
+        '''
+        return self._connection.execute("SELECT COUNT(*) FROM patrons").fetchone()[0]
+
+    def __getitem__(self, position):
+        '''
+        Look up a patron by position in ID order, as in a list of patrons.
+        '''
+        return self.get(self.ids()[position])
+
+    def __iter__(self):
+        '''
+        Iterate over every patron, in ID order, loading any patron not yet loaded.
+        '''
+        if not self._complete:
+            loans = {}
+            for patron_id, item_id, due in self._connection.execute("SELECT patron_id, item_id, due FROM loans ORDER BY rowid"):
+                loans.setdefault(patron_id, []).append((item_id, due))
+            for row in self._connection.execute("SELECT * FROM patrons ORDER BY patron_id"):
+                if row["patron_id"] not in self._loaded:
+                    self._load(row, loans.get(row["patron_id"], ()))
+            self._complete = True
+
+        for patron_id in sorted(self._loaded):
+            yield self._loaded[patron_id]
+
+    def _load(self, row, loans):
+        '''
+        Load a patron from a row of the patrons table and their rows of the
+        loans table.
+        '''
+        record = dict(row)
+        record["loans"] = []
+        patron = Patron()
+        patron.load_data(record, None, self._catalogue_index)
+        for item_id, due in loans:
+            item = self._catalogue_index.get(item_id)
+            if item is not None:
+                patron._loans.append(Loan(item, date.fromisoformat(due)))
+        self._loaded[patron._id] = patron
+        return patron
+
+
+class SqlitePatronKeys(MutableMapping):
+    '''
+    Maps the key identifying a patron by name and age (see
+    search.patron_key) to the patron's ID, by querying the database's
+    index of patrons by name and age. Used with LazyIndex to look patrons
+    up by name and age.
+
+    New patrons are added to the database by the store, so setting a key
+    does nothing.
+    '''
+    def __init__(self, store):
+        '''
+        Create a mapping of patron keys to IDs.
+            Args:
+                store (SqliteStore): the database to query.
+        '''
+        self._connection = store._connection
+
+    def __getitem__(self, key):
+        folded, age = key
+        row = self._connection.execute("SELECT patron_id FROM patrons WHERE name_folded = ? AND age = ? LIMIT 1",
+                                       (folded, age)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def __setitem__(self, key, patron_id):
+        pass
+
+    def __delitem__(self, key):
+        raise TypeError("patrons can not be removed")
+
+    def __iter__(self):
+        return iter([(folded, age) for folded, age in
+                     self._connection.execute("SELECT name_folded, age FROM patrons ORDER BY patron_id")])
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM patrons").fetchone()[0]
+
+
+class _SqliteIndex():
+    '''
+    Base for indexes which search the database's own indexes instead of
+    keeping patrons and loans in memory. The patrons found are loaded
+    through a SqlitePatrons.
+
+    The store writes every change to the database, so adding to and
+    removing from these indexes does nothing.
+    '''
+    def __init__(self, patrons):
+        '''
+        Create a new index.
+            Args:
+                patrons (SqlitePatrons): the patrons to search.
+        '''
+        self._patrons = patrons
+        self._connection = patrons._connection
+
+    def add(self, *entry):
+        pass
+
+    def remove(self, *entry):
+        pass
+
+    def _find_patrons(self, sql, parameters):
+        '''
+        Load the patrons with the IDs selected by a query.
+        '''
+        return [self._patrons.get(patron_id) for (patron_id,) in self._connection.execute(sql, parameters)]
+
+    def _find_loans(self, sql, parameters):
+        '''
+        Load the (patron, loan) pairs with the patron and item IDs selected by a query.
+        '''
+        found = []
+        for patron_id, item_id in self._connection.execute(sql, parameters).fetchall():
+            patron = self._patrons.get(patron_id)
+            found.append((patron, patron.find_loan(item_id)))
+
+        return found
+
+    def _count(self, sql, parameters):
+        '''
+        Run a query which counts rows.
+        '''
+        return self._connection.execute(sql, parameters).fetchone()[0]
+
+
+class SqliteAgeIndex(_SqliteIndex):
+    '''
+    Finds patrons by age with the database's index of patrons by age,
+    as AgeIndex does in memory.
+    '''
+    def find(self, age):
+        '''
+        Find all the patrons with the given age.
+            Args:
+                age (int): the age to search for.
+
+            Returns:
+                a list of patrons, or an empty list if none were found.
+        '''
+        return self._find_patrons("SELECT patron_id FROM patrons WHERE age = ? ORDER BY patron_id", (age,))
+
+    def find_range(self, min_age, max_age):
+        '''
+        Find all the patrons with an age in the given range.
+            Args:
+                min_age (int): the minimum age to search for (inclusive).
+                max_age (int): the maximum age to search for (inclusive).
+
+            Returns:
+                a list of patrons ordered by age, or an empty list if none
+                were found.
+        '''
+        return self._find_patrons("SELECT patron_id FROM patrons WHERE age BETWEEN ? AND ? ORDER BY age, patron_id",
+                                  (min_age, max_age))
+
+    def count_range(self, min_age, max_age):
+        '''
+        Count the patrons with an age in the given range.
+            Args:
+                min_age (int): the minimum age to count (inclusive).
+                max_age (int): the maximum age to count (inclusive).
+
+            Returns:
+                the number of patrons with an age in the range.
+        '''
+        return self._count("SELECT COUNT(*) FROM patrons WHERE age BETWEEN ? AND ?", (min_age, max_age))
+
+
+class SqliteNameIndex(_SqliteIndex):
+    '''
+    Finds patrons by name with the database's index of patrons by name and
+    age, as NameIndex does in memory. Searches are case insensitive.
+    '''
+    @staticmethod
+    def _prefix_range(prefix):
+        '''
+        Build the condition (and its parameters) selecting casefolded names
+        starting with a prefix, as a range of names the index can search.
+        '''
+        folded = prefix.casefold()
+        if folded == "":
+            return "1", ()
+        # every name starting with the prefix sorts before the prefix with its last character incremented
+        return "name_folded >= ? AND name_folded < ?", (folded, folded[:-1] + chr(ord(folded[-1]) + 1))
+
+    def find(self, name):
+        '''
+        Find all the patrons with the given name.
+            Args:
+                name (string): the name to search for.
+
+            Returns:
+                a list of patrons, or an empty list if none were found.
+        '''
+        return self._find_patrons("SELECT patron_id FROM patrons WHERE name_folded = ? ORDER BY patron_id",
+                                  (name.casefold(),))
+
+    def find_prefix(self, prefix):
+        '''
+        Find all the patrons with a name starting with the given prefix.
+            Args:
+                prefix (string): the start of the name to search for.
+
+            Returns:
+                a list of patrons ordered by name, or an empty list if none
+                were found.
+        '''
+        condition, parameters = self._prefix_range(prefix)
+        return self._find_patrons(f"SELECT patron_id FROM patrons WHERE {condition} ORDER BY name_folded, patron_id",
+                                  parameters)
+
+    def count(self, name):
+        '''
+        Count the patrons with the given name.
+            Args:
+                name (string): the name to count.
+
+            Returns:
+                the number of patrons with the name.
+        '''
+        return self._count("SELECT COUNT(*) FROM patrons WHERE name_folded = ?", (name.casefold(),))
+
+    def count_prefix(self, prefix):
+        '''
+        Count the patrons with a name starting with the given prefix.
+            Args:
+                prefix (string): the start of the name to count.
+
+            Returns:
+                the number of patrons with a name starting with the prefix.
+        '''
+        condition, parameters = self._prefix_range(prefix)
+        return self._count(f"SELECT COUNT(*) FROM patrons WHERE {condition}", parameters)
+
+    def find_similar(self, name, limit=10, min_score=MIN_SIMILARITY):
+        '''
+        Find the patrons with names most similar to the given name, as
+        NameIndex.find_similar does. Every distinct name is read from the
+        index and scored, but only the patrons found are loaded.
+            Args:
+                name (string): the name to search for.
+                limit (int): the maximum number of names to return patrons for.
+                min_score (float): the lowest similarity score (0 - 1) a name
+                    must have to be included.
+
+            Returns:
+                a list of patrons, most similar names first, or an empty list
+                if no names were similar enough.
+        '''
+        grams = trigrams(name)
+        scored = []
+        for (folded,) in self._connection.execute("SELECT DISTINCT name_folded FROM patrons"):
+            score = similarity(grams, trigrams(folded))
+            if (score > 0) and (score >= min_score):
+                scored.append((score, folded))
+
+        found = []
+        for score, folded in heapq.nsmallest(limit, scored, key=lambda s: (-s[0], s[1])):
+            found.extend(self.find(folded))
+
+        return found
+
+
+class SqliteLoanIndex(_SqliteIndex):
+    '''
+    Finds the active loans of an item with the database's index of loans by
+    item, as LoanIndex does in memory.
+    '''
+    def find(self, item_id):
+        '''
+        Find the active loans of an item.
+            Args:
+                item_id (int): the ID of the item.
+
+            Returns:
+                a list of (patron, loan) pairs for the patrons currently
+                borrowing the item, or an empty list if it is not on loan.
+        '''
+        return self._find_loans("SELECT patron_id, item_id FROM loans WHERE item_id = ? ORDER BY rowid", (item_id,))
+
+
+class SqliteDueDateIndex(_SqliteIndex):
+    '''
+    Finds active loans by due date with the database's index of loans by
+    due date, as DueDateIndex does in memory.
+    '''
+    def find_before(self, due_date):
+        '''
+        Find the loans due before a date.
+            Args:
+                due_date (date): the date to search before (exclusive).
+
+            Returns:
+                a list of (patron, loan) pairs, ordered by due date.
+        '''
+        return self._find_loans("SELECT patron_id, item_id FROM loans WHERE due < ? ORDER BY due, rowid",
+                                (due_date.strftime('%Y-%m-%d'),))
+
+    def find_between(self, first_date, last_date):
+        '''
+        Find the loans due between two dates.
+            Args:
+                first_date (date): the earliest due date to search for (inclusive).
+                last_date (date): the latest due date to search for (inclusive).
+
+            Returns:
+                a list of (patron, loan) pairs, ordered by due date.
+        '''
+        return self._find_loans("SELECT patron_id, item_id FROM loans WHERE due BETWEEN ? AND ? ORDER BY due, rowid",
+                                (first_date.strftime('%Y-%m-%d'), last_date.strftime('%Y-%m-%d')))
+
+
+def migrate_json(patron_path, catalogue_path, database_path):
+    '''
+    Copy patron and catalogue data from JSON files (in the format used by
+    DataManager) into a new SQLite database. Any data already in the
+    database is replaced.
+        Args:
+            patron_path (string): the JSON file of patron data.
+            catalogue_path (string): the JSON file of catalogue data.
+            database_path (string): the database file to create.
+
+        Returns:
+            a (number of patrons, number of items) tuple.
+    '''
+    # imported here as data_mgmt depends on this module
+    from src.data_mgmt import read_records
+
+    items = []
+    for d in read_records(catalogue_path):
+        new_item = BorrowableItem()
+        new_item.load_data(d)
+        items.append(new_item)
+    catalogue_index = {item._id: item for item in items}
+
+    patrons = []
+    for d in read_records(patron_path):
+        new_patron = Patron()
+        new_patron.load_data(d, items, catalogue_index)
+        patrons.append(new_patron)
+
+    store = SqliteStore(database_path, create=True)
+    store.save_catalogue(items)
+    store.save_patrons(patrons)
+    store.close()
+
+    return len(patrons), len(items)
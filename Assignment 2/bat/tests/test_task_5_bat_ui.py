@@ -20,6 +20,7 @@ class TestBatUI(unittest.TestCase):
     - _search_for_patron: Verifies the search functionality for patrons by name and age.
     - _register_patron: Verifies the registration of new patrons.
     - _access_makerspace: Verifies the access control for the makerspace.
+    - _checkout_items: Verifies the loaning of several items to a patron at once.
     - _quit: Verifies the quitting functionality of the application.
     - get_current_screen: Verifies the retrieval of the current screen.
 
@@ -381,14 +382,94 @@ class TestBatUI(unittest.TestCase):
         self.ui._current_screen = self.ui._access_makerspace()
         self.assertEqual(self.ui.get_current_screen(), "MAIN MENU")
 
+    @mock.patch("src.business_logic.process_loans")
+    @mock.patch("src.user_input.read_integer_range")
+    @mock.patch("src.user_input.read_bool")
+    @mock.patch("src.search.find_item_by_id")
+    @mock.patch("src.search.find_patron_by_name_and_age")
+    @mock.patch("src.user_input.read_integer")
+    @mock.patch("src.user_input.read_string")
+    def test_successful_checkout(self, read_name, read_integer, find_patron, find_item, confirm_item, read_loan_duration, loans_process):
+        """
+        Test the checkout of several items.
+
+        This test verifies that confirmed items are checked out together, skipping unknown, unconfirmed, and repeated items.
+        """
+        # Mock user inputs and method returns
+        items = [self.data_mgmt._catalogue_index[i] for i in (1, 2, 3)]
+        read_name.return_value = "John Doe"
+        read_integer.side_effect = [95, 1, 2, 99, 1, 3, 0]
+        find_patron.return_value = self.mock_patron
+        find_item.side_effect = [items[0], items[1], None, items[0], items[2]]
+        confirm_item.side_effect = ["y", "y", "n"]
+        read_loan_duration.side_effect = [7, 14]
+        loans_process.return_value = []
+
+        # Execute the checkout items process
+        self.ui._current_screen = self.ui._checkout_items()
+        loans_process.assert_called_once_with(self.mock_patron, [(items[0], 7), (items[1], 14)], self.data_mgmt)
+        self.assertEqual(self.ui.get_current_screen(), "MAIN MENU")
+
+    @mock.patch("src.business_logic.process_loans")
+    @mock.patch("src.user_input.read_integer_range")
+    @mock.patch("src.user_input.read_bool")
+    @mock.patch("src.search.find_item_by_id")
+    @mock.patch("src.search.find_patron_by_name_and_age")
+    @mock.patch("src.user_input.read_integer")
+    @mock.patch("src.user_input.read_string")
+    def test_unsuccessful_checkout(self, read_name, read_integer, find_patron, find_item, confirm_item, read_loan_duration, loans_process):
+        """
+        Test the checkout of several items when some can not be borrowed.
+
+        This test verifies that the checkout process is handled correctly when the loans are refused.
+        """
+        # Mock user inputs and method returns
+        item = self.data_mgmt._catalogue_index[1]
+        read_name.return_value = "John Doe"
+        read_integer.side_effect = [95, 1, 0]
+        find_patron.return_value = self.mock_patron
+        find_item.return_value = item
+        confirm_item.return_value = "y"
+        read_loan_duration.return_value = 100
+        loans_process.return_value = [(item, 100)]
+
+        # Execute the checkout items process
+        self.ui._current_screen = self.ui._checkout_items()
+        self.assertEqual(self.ui.get_current_screen(), "MAIN MENU")
+
+    @mock.patch("src.business_logic.process_loans")
+    @mock.patch("src.search.find_patron_by_name_and_age")
+    @mock.patch("src.user_input.read_integer")
+    @mock.patch("src.user_input.read_string")
+    def test_empty_or_invalid_patron_checkout(self, read_name, read_integer, find_patron, loans_process):
+        """
+        Test the checkout of no items, and by a non-existent patron.
+
+        This test verifies that the checkout process is cancelled without processing any loans.
+        """
+        # Mock user inputs and method returns
+        read_name.return_value = "John Doe"
+        read_integer.side_effect = [95, 0, 95]
+        find_patron.side_effect = [self.mock_patron, None]
+
+        # Execute the checkout items process, with no items, then with no such patron
+        self.ui._current_screen = self.ui._checkout_items()
+        self.assertEqual(self.ui.get_current_screen(), "MAIN MENU")
+        self.ui._current_screen = self.ui._checkout_items()
+        self.assertEqual(self.ui.get_current_screen(), "MAIN MENU")
+        loans_process.assert_not_called()
+
     @mock.patch('src.data_mgmt.DataManager.save_patrons')
     @mock.patch('src.data_mgmt.DataManager.save_catalogue')
     def test_successful_quit(self, save_catalogue, save_patrons):
         """
         Test the quit functionality of the UI.
 
-        This test verifies that the quit process saves the current state and returns the correct value.
+        This test verifies that the quit process saves the changed data and returns the correct value.
         """
+        # Change patron data and the catalogue
+        self.data_mgmt.register_patron("Er Jun Yet", 25)
+        self.data_mgmt._catalogue_changed = True
         # Execute the quit process
         result = self.ui._quit()
 
@@ -398,6 +479,34 @@ class TestBatUI(unittest.TestCase):
 
         self.assertEqual(result, self.ui._quit)
 
+    @mock.patch('src.data_mgmt.DataManager.save_patrons')
+    @mock.patch('src.data_mgmt.DataManager.save_catalogue')
+    def test_quit_without_changes(self, save_catalogue, save_patrons):
+        """
+        Test the quit functionality of the UI when no data has changed.
+
+        This test verifies that nothing is saved.
+        """
+        result = self.ui._quit()
+
+        save_catalogue.assert_not_called()
+        save_patrons.assert_not_called()
+        self.assertEqual(result, self.ui._quit)
+
+    @mock.patch('src.data_mgmt.DataManager.save_patrons')
+    @mock.patch('src.data_mgmt.DataManager.save_catalogue')
+    def test_quit_only_patrons_changed(self, save_catalogue, save_patrons):
+        """
+        Test the quit functionality of the UI when only patron data has changed.
+
+        This test verifies that the catalogue is not saved.
+        """
+        self.data_mgmt.register_patron("Er Jun Yet", 25)
+        self.ui._quit()
+
+        save_catalogue.assert_not_called()
+        save_patrons.assert_called_once()
+
 
 if __name__ == '__main__':
     unittest.main()
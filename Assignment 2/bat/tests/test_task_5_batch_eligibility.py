@@ -0,0 +1,175 @@
+import unittest
+from unittest import mock
+import itertools
+import json
+from array import array
+import src.batch_eligibility as batch
+import src.business_logic as logic
+import src.policy as policy
+import src.config as config
+from src.business_logic import can_borrow, can_use_makerspace
+
+
+class TestBatchEligibility(unittest.TestCase):
+    """
+    Unit tests for checking eligibility for many loans at once.
+
+    This test suite aims to validate that the batch functions give exactly the same decisions as the scalar
+    business logic functions, both with and without NumPy, and with and without a policy applied.
+
+    The following are tested:
+    - can_borrow_batch: Determines whether many loans can occur, for every type of item.
+    - can_use_makerspace_batch: Determines whether many patrons can use the makerspace.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method builds columns covering every combination of ages around each boundary, loan lengths
+        around each limit, fees (none, some, and refunds), and training.
+        """
+        ages = list(range(0, 101)) + [120]
+        lengths = [0, 1, 13, 14, 15, 27, 28, 29, 55, 56, 57, 365]
+        fees = [0.0, 0.01, 7.45, 100.0, -5.0]
+        training = [False, True]
+        rows = list(itertools.product(ages, lengths, fees, training, training))
+        self.ages, self.lengths, self.fees, self.gardening, self.carpentry = (list(column) for column in zip(*rows))
+
+    def tearDown(self):
+        """
+        Go back to the rules in business_logic after each test method.
+        """
+        logic.use_policy(None)
+
+    def check_borrow(self):
+        """
+        Check can_borrow_batch against can_borrow for every row and item type.
+        """
+        result = batch.can_borrow_batch(self.ages, self.lengths, self.fees, self.gardening, self.carpentry)
+        self.assertEqual(list(result), logic.loan_item_types())
+        for item_type in result:
+            expected = [can_borrow(item_type, *row) for row in zip(self.ages, self.lengths, self.fees, self.gardening, self.carpentry)]
+            self.assertEqual([bool(x) for x in result[item_type]], [bool(x) for x in expected], item_type)
+
+    def check_makerspace(self):
+        """
+        Check can_use_makerspace_batch against can_use_makerspace for every row.
+        """
+        ages = self.ages + [-1, -30]
+        fees = self.fees + [0.0, 1.0]
+        training = self.gardening + [True, True]
+        expected = [can_use_makerspace(*row) for row in zip(ages, fees, training)]
+        result = batch.can_use_makerspace_batch(ages, fees, training)
+        self.assertEqual([bool(x) for x in result], [bool(x) for x in expected])
+
+    def test_python_matches_scalar(self):
+        """
+        Test the batch functions without NumPy.
+
+        This test verifies that every decision matches the scalar functions.
+        """
+        with mock.patch('src.batch_eligibility.numpy', None):
+            self.check_borrow()
+            self.check_makerspace()
+
+    @unittest.skipIf(batch.numpy is None, "NumPy is not installed")
+    def test_numpy_matches_scalar(self):
+        """
+        Test the batch functions with NumPy.
+
+        This test verifies that every decision matches the scalar functions.
+        """
+        self.check_borrow()
+        self.check_makerspace()
+
+    def test_policy_matches_scalar(self):
+        """
+        Test the batch functions with a policy applied, with and without NumPy.
+
+        This test verifies that every decision matches the scalar functions under the shipped policy, and under
+        a policy with a new item type, different limits and discount bands, and no makerspace training.
+        """
+        with open(config.POLICY_DATA) as f:
+            shipped = json.load(f)
+        changed = json.loads(json.dumps(shipped))
+        changed["item_types"]["3D printer"] = {"max_days": 3, "min_age": 16, "max_age": 70,
+                                               "training": ["gardening tool", "carpentry tool"]}
+        changed["item_types"]["Book"]["max_days"] = 21
+        changed["discounts"] = [{"min_age": 30, "discount": 50}, {"min_age": 60, "discount": 100}]
+        changed["makerspace"] = {"min_age": 21}
+        for data in (shipped, changed):
+            logic.use_policy(policy.compile_policy(data))
+            for numpy in {batch.numpy, None}:
+                with mock.patch('src.batch_eligibility.numpy', numpy):
+                    self.check_borrow()
+                    self.check_makerspace()
+
+    def test_array_columns(self):
+        """
+        Test passing the columns as arrays.
+
+        This test verifies that array columns give the same decisions as lists.
+        """
+        expected = batch.can_borrow_batch(self.ages, self.lengths, self.fees, self.gardening, self.carpentry)
+        result = batch.can_borrow_batch(array('h', self.ages), array('h', self.lengths), array('d', self.fees),
+                                        array('B', self.gardening), array('B', self.carpentry))
+        for item_type in batch.ITEM_TYPES:
+            self.assertEqual(list(result[item_type]), list(expected[item_type]))
+        logic.use_policy(policy.load_policy(config.POLICY_DATA))
+        result = batch.can_borrow_batch(array('h', self.ages), array('h', self.lengths), array('d', self.fees),
+                                        array('B', self.gardening), array('B', self.carpentry))
+        for item_type in batch.ITEM_TYPES:
+            self.assertEqual([bool(x) for x in result[item_type]], [bool(x) for x in expected[item_type]])
+
+    def test_invalid_columns(self):
+        """
+        Test checking rows with a negative age, and columns of different lengths.
+
+        This test verifies that a negative age raises a TypeError, as the scalar functions do, and that columns
+        of different lengths raise a ValueError.
+        """
+        for numpy, rules in itertools.product([batch.numpy, None], [None, policy.load_policy(config.POLICY_DATA)]):
+            logic.use_policy(rules)
+            with mock.patch('src.batch_eligibility.numpy', numpy):
+                with self.assertRaises(TypeError):
+                    batch.can_borrow_batch([30, -1], [7, 7], [0.0, 0.0], [True, True], [True, True])
+                with self.assertRaises(ValueError):
+                    batch.can_borrow_batch([30, 40], [7], [0.0, 0.0], [True, True], [True, True])
+                with self.assertRaises(ValueError):
+                    batch.can_use_makerspace_batch([30], [0.0, 0.0], [True])
+
+
+    def test_negative_ages_match_scalar(self):
+        """
+        Test checking rows with a negative age, one at a time and together with valid rows.
+
+        This test verifies that a batch raises a TypeError exactly when can_borrow raises one for the row for some
+        type of item, and otherwise gives the same decisions, as the scalar rules refuse long loans before
+        checking the age.
+        """
+        for numpy, rules in itertools.product([batch.numpy, None], [None, policy.load_policy(config.POLICY_DATA)]):
+            logic.use_policy(rules)
+            item_types = batch.ITEM_TYPES if rules is None else list(rules._limits["item_types"])
+            with mock.patch('src.batch_eligibility.numpy', numpy):
+                for length in [7, 28, 55, 56, 60]:
+                    row = ([-1], [length], [0.0], [True], [True])
+                    expected = {}
+                    try:
+                        for item_type in item_types:
+                            expected[item_type] = [can_borrow(item_type, -1, length, 0.0, True, True)]
+                    except TypeError:
+                        with self.assertRaises(TypeError):
+                            batch.can_borrow_batch(*row)
+                        continue
+                    self.assertEqual({t: list(c) for t, c in batch.can_borrow_batch(*row).items()}, expected)
+
+            if rules is not None:
+                with mock.patch('src.batch_eligibility.numpy', numpy):
+                    result = batch.can_borrow_batch([30, -1], [7, 60], [0.0, 0.0], [True, True], [True, True])
+                self.assertEqual([bool(c[1]) for c in result.values()], [False] * len(item_types))
+                self.assertTrue(bool(result["Book"][0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
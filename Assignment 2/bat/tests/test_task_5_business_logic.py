@@ -1,11 +1,15 @@
 import unittest
 from unittest import mock
-from src.business_logic import (type_of_patron, can_borrow, calculate_discount, process_loan)
+from src.business_logic import (type_of_patron, can_borrow, calculate_discount, process_loan, process_loans, process_return)
+import src.business_logic as logic
 from src.patron import Patron
 from src.data_mgmt import DataManager
 from src.loan import Loan 
 from datetime import date
 from src.borrowable_item import BorrowableItem
+from src.eligibility import EligibilityCache
+import src.policy as policy
+import src.config as config
   
 class TestBusinessLogic(unittest.TestCase):
     """
@@ -21,6 +25,8 @@ class TestBusinessLogic(unittest.TestCase):
     - can_borrow: Determines if a patron can borrow an item based on various conditions.
     - calculate_discount: Calculates the discount a patron is eligible for based on their age.
     - process_loan: Processes the loan of an item to a patron, updating the necessary records.
+    - process_return: Processes the return of an item by a patron, updating the necessary records.
+    - process_loans: Processes the loan of many items to a patron at once, all or nothing.
 
     """
 
@@ -313,7 +319,185 @@ class TestBusinessLogic(unittest.TestCase):
         self.assertEqual(self.mock_item._on_loan, 0)  
         # Check patron loans
         self.assertEqual(len(self.mock_patron._loans), 0)  
+
+    @mock.patch('src.business_logic.can_borrow')
+    def test_loan_and_return_recorded(self, mock_can_borrow):
+        """
+        Test that loans and returns are recorded with the data manager.
+
+        This test verifies that the loan index knows who is borrowing an item after a loan, and forgets after the return.
+        """
+        mock_can_borrow.return_value = True
+        patron = self.data_manager._patron_data[1]
+        process_loan(patron, self.mock_item, 7, self.data_manager)
+        borrowers = [p for p, l in self.data_manager._loan_index.find(self.mock_item._id)]
+        self.assertEqual(borrowers, [patron])
+
+        process_return(patron, self.mock_item._id, self.data_manager)
+        self.assertEqual(self.data_manager._loan_index.find(self.mock_item._id), [])
+
+    def test_successful_loans_process(self):
+        """
+        Test processing the loan of several items at once.
+
+        This test verifies that every item is loaned, each "on loan" count is increased, and the loans are
+        recorded with the data manager together, with each type of item and length of loan checked once.
+        """
+        patron = Patron()
+        patron.set_new_patron_data(500, "Jane Smith", 30)
+        books = [i for i in self.data_manager._catalogue_index.values() if i._type == "Book"][:3]
+        on_loan = [i._on_loan for i in books]
+        with mock.patch.object(self.data_manager, 'record_loans', wraps=self.data_manager.record_loans) as record_loans:
+            refused = process_loans(patron, [(item, 14) for item in books], self.data_manager)
+        self.assertEqual(refused, [])
+        self.assertEqual([l._item for l in patron._loans], books)
+        self.assertEqual([i._on_loan for i in books], [n + 1 for n in on_loan])
+        record_loans.assert_called_once()
+        self.assertEqual(self.data_manager._eligibility.get_stats()["misses"], 1)
+        self.assertIn(patron, [p for p, l in self.data_manager._loan_index.find(books[0]._id)])
+
+    def test_unsuccessful_loans_process(self):
+        """
+        Test processing several loans when some can not be made.
+
+        This test ensures that no loans are made if any item can not be borrowed, is asked for twice, or is
+        already on loan to the patron, and that those items are the ones returned.
+        """
+        patron = Patron()
+        patron.set_new_patron_data(500, "Jane Smith", 30)
+        book = self.data_manager._catalogue_index[2]
+        tool = next(i for i in self.data_manager._catalogue_index.values() if i._type == "Gardening tool")
+        on_loan = (book._on_loan, tool._on_loan)
+        self.assertEqual(process_loans(patron, [(book, 7), (tool, 7)]), [(tool, 7)])
+        self.assertEqual(process_loans(patron, [(book, 7), (book, 14)]), [(book, 14)])
+        self.assertEqual(len(patron._loans), 0)
+        self.assertEqual((book._on_loan, tool._on_loan), on_loan)
+
+        self.assertEqual(process_loans(patron, [(book, 7)]), [])
+        self.assertEqual(process_loans(patron, [(book, 7)]), [(book, 7)])
+        self.assertEqual(process_loans(patron, []), [])
+        self.assertEqual(len(patron._loans), 1)
+
+    def test_loans_process_undone_on_error(self):
+        """
+        Test processing several loans when they can not be recorded.
+
+        This test verifies that the loans and "on loan" counts are undone, and the error is raised.
+        """
+        patron = Patron()
+        patron.set_new_patron_data(500, "Jane Smith", 30)
+        book = self.data_manager._catalogue_index[2]
+        on_loan = book._on_loan
+        with mock.patch.object(self.data_manager, 'record_loans', side_effect=OSError):
+            with self.assertRaises(OSError):
+                process_loans(patron, [(book, 7)], self.data_manager)
+        self.assertEqual(len(patron._loans), 0)
+        self.assertEqual(book._on_loan, on_loan)
  
 
+
+class TestDecisionTables(unittest.TestCase):
+    """
+    Unit tests for the decision tables used in place of the loan and makerspace rules.
+
+    This test suite aims to validate that every decision read from the decision tables (through the
+    eligibility cache) is the same as the decision made by applying the rules, that the tables follow
+    the policy applied, and that checks outside the tables' domain still apply the rules.
+
+    The following are the functions tested:
+    - use_decision_tables: Compiles and turns on (or off) the decision tables.
+    - decision_table_row: Finds a patron's decisions in the tables.
+    - EligibilityCache.can_borrow and can_use_makerspace (with tables on).
+    """
+
+    # zero, negative, and positive fees, including the smallest, largest and infinite
+    FEES = [0.0, 0, -2.5, 5e-324, 0.01, 7.45, 3, 1e308, float("inf")]
+    # the first and last days of each loan limit, and the longest loan in the tables
+    LENGTHS = [1, 13, 14, 15, 27, 28, 29, 54, 55, 56, 57, 365]
+
+    def decisions(self, enabled):
+        """
+        Make decisions across the tables' domain, for each of FEES, training and LENGTHS, through
+        an eligibility cache with decision tables on or off.
+        """
+        logic.use_decision_tables(enabled)
+        cache = EligibilityCache()
+        patron = Patron()
+        patron.set_new_patron_data(1, "Jane Smith", 0)
+        result = []
+        for age in range(logic.TABLE_MAX_AGE + 1):
+            for fees in self.FEES:
+                for training in range(8):
+                    patron._age, patron._outstanding_fees, patron._training = age, fees, training
+                    result.append(cache.can_use_makerspace(patron))
+                    for item_type in logic.loan_item_types():
+                        for length in self.LENGTHS:
+                            result.append(cache.can_borrow(patron, item_type, length))
+        return result
+
+    def tearDown(self):
+        """
+        Turn off decision tables and go back to the rules in business_logic after each test method.
+        """
+        logic.use_decision_tables(False)
+        logic.use_policy(None)
+
+    def test_tables_match_rules(self):
+        """
+        Test decisions across the tables' domain.
+
+        This test verifies that each decision read from the tables matches the rules.
+        """
+        expected = self.decisions(False)
+        actual = self.decisions(True)
+        self.assertIsNotNone(logic._decision_tables)
+        self.assertEqual(len(actual), len(expected))
+        mismatches = [i for i, (a, e) in enumerate(zip(actual, expected)) if a != e]
+        self.assertEqual(mismatches, [])
+
+    def test_tables_follow_policy(self):
+        """
+        Test decision tables when a policy is applied after they are compiled.
+
+        This test ensures the tables are compiled again from the policy, including its new item types.
+        """
+        logic.use_decision_tables(True)
+        rules = policy.load_policy(config.POLICY_DATA)
+        rules._loan_rules["Magazine"] = lambda patron_age, length_of_loan, *args: length_of_loan <= 3
+        logic.use_policy(rules)
+        self.assertEqual(set(logic._decision_tables), {"Book", "Gardening tool", "Carpentry tool", "Magazine"})
+        expected = self.decisions(False)
+        self.assertEqual(self.decisions(True), expected)
+
+    def test_outside_domain(self):
+        """
+        Test decisions outside the tables' domain with decision tables on.
+
+        This test verifies that the rules are applied, and that checks in the domain are read from the
+        patron's row without applying the rules.
+        """
+        logic.use_decision_tables(True)
+        cache = EligibilityCache()
+        patron = Patron()
+        patron.set_new_patron_data(1, "Jane Smith", 120)
+        patron._outstanding_fees = 0.0
+        patron._training = 7
+        self.assertIsNone(logic.decision_table_row(120, 0.0, True, True, True))
+        self.assertIsNone(logic.decision_table_row(30, 0.0, 1, True, True))
+        self.assertTrue(cache.can_borrow(patron, "Gardening tool", 7))
+        patron._age = 30
+        self.assertFalse(cache.can_borrow(patron, "Book", 400))
+        self.assertFalse(cache.can_borrow(patron, "Magazine", 7))
+        with mock.patch('src.business_logic.can_borrow') as can_borrow:
+            self.assertTrue(cache.can_borrow(patron, "Carpentry tool", 7))
+            self.assertTrue(cache.can_use_makerspace(patron))
+            can_borrow.assert_not_called()
+        # the rules can not be applied to a negative age
+        patron._age = -1
+        self.assertFalse(cache.can_use_makerspace(patron))
+        with self.assertRaises(TypeError):
+            cache.can_borrow(patron, "Gardening tool", 7)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
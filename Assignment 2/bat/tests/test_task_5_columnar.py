@@ -0,0 +1,141 @@
+import unittest
+import os
+import tempfile
+from src.data_mgmt import DataManager
+from src.patron import Patron
+from src.columnar import write_columnar, ColumnarPatrons
+from src.business_logic import can_use_makerspace
+import src.business_logic as logic
+import src.policy as policy
+import src.search as search
+
+
+class TestColumnar(unittest.TestCase):
+    """
+    Unit tests for the memory mapped columnar patron file.
+
+    This test suite aims to validate that patron details read from a columnar file match the patrons
+    it was written from, and that searches over the file give the same results as searches over the
+    patron data.
+
+    The following are tested:
+    - write_columnar: Saves patron details to a columnar file.
+    - ColumnarPatrons: Reads patron details from a columnar file through PatronView objects.
+    - ColumnarPatrons.find_by_name, find_by_age_range, find_by_name_and_age: Search a columnar file.
+    - ColumnarPatrons.find_makerspace_eligible: Checks makerspace eligibility over a columnar file.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method loads the patron data and writes it to a columnar file in a temporary directory.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_manager = DataManager()
+        self.patrons = self.data_manager._patron_data
+        path = os.path.join(self.temp_dir.name, "patrons.col")
+        write_columnar(path, self.patrons)
+        self.columnar = ColumnarPatrons(path)
+
+    def tearDown(self):
+        """
+        Close the columnar file, remove the temporary directory, and go back to the rules in business_logic
+        after each test method.
+        """
+        logic.use_policy(None)
+        self.columnar.close()
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def details(patron):
+        """
+        Get the details of a patron (or PatronView) stored in a columnar file.
+        """
+        return (patron._id, patron._name, patron._age, patron._outstanding_fees, patron._gardening_tool_training,
+                patron._carpentry_tool_training, patron._makerspace_training)
+
+    def test_round_trip(self):
+        """
+        Test reading back every patron.
+
+        This test verifies that the file holds every patron, in order, with the same details.
+        """
+        self.assertEqual(len(self.columnar), len(self.patrons))
+        self.assertEqual([self.details(v) for v in self.columnar], [self.details(p) for p in self.patrons])
+        self.assertEqual(self.details(self.columnar[1]), self.details(self.patrons[1]))
+        with self.assertRaises(IndexError):
+            self.columnar[len(self.patrons)]
+
+    def test_searches(self):
+        """
+        Test searching the columnar file.
+
+        This test verifies that each search finds the same patrons as a search of the patron data.
+        """
+        self.assertEqual([self.details(v) for v in self.columnar.find_by_name("jOhN dOe")],
+                         [self.details(p) for p in search.find_patron_by_name("john doe", self.patrons)])
+        self.assertEqual([self.details(v) for v in self.columnar.find_by_age_range(95, 95)],
+                         [self.details(p) for p in search.find_patron_by_age(95, self.patrons)])
+        self.assertEqual([self.details(v) for v in self.columnar.find_by_age_range(18, 64)],
+                         [self.details(p) for p in search.find_patron_by_age_range(18, 64, self.patrons)])
+        self.assertEqual(self.details(self.columnar.find_by_name_and_age("John Doe", 95)),
+                         self.details(search.find_patron_by_name_and_age("John Doe", 95, self.patrons)))
+        self.assertIsNone(self.columnar.find_by_name_and_age("John Doe", 1))
+        self.assertEqual(self.columnar.find_by_name("Nobody"), [])
+
+    def test_name_matching(self):
+        """
+        Test searching names which overlap in the columnar file.
+
+        This test verifies that only whole names match, that names are compared casefolded (including names whose
+        casefolded form is longer), and that a name holding the separator does not match across patrons.
+        """
+        patrons = []
+        for patron_id, (name, age) in enumerate([("Ann", 30), ("Anna", 30), ("Straße", 40), ("a", 1), ("b", 2),
+                                                 ("A\0B", 3), ("ANN", 31)], 1):
+            patron = Patron()
+            patron.set_new_patron_data(patron_id, name, age)
+            patrons.append(patron)
+        path = os.path.join(self.temp_dir.name, "names.col")
+        write_columnar(path, patrons)
+        columnar = ColumnarPatrons(path)
+
+        self.assertEqual([v._id for v in columnar.find_by_name("ann")], [1, 7])
+        self.assertEqual([v._id for v in columnar.find_by_name("STRASSE")], [3])
+        self.assertEqual([v._id for v in columnar.find_by_name("a\0b")], [6])
+        self.assertEqual([v._id for v in columnar.find_by_name("nn")], [])
+        self.assertEqual(columnar.find_by_name_and_age("Ann", 31)._id, 7)
+        self.assertEqual(columnar.find_by_name_and_age("Straße", 40)._name, "Straße")
+        columnar.close()
+
+    def test_makerspace_eligible(self):
+        """
+        Test checking makerspace eligibility over the columnar file.
+
+        This test verifies that the eligible patrons are those for which can_use_makerspace is True, including
+        under a policy which does not require the makerspace training.
+        """
+        expected = [self.details(p) for p in self.patrons
+                    if can_use_makerspace(p._age, p._outstanding_fees, p._makerspace_training)]
+        self.assertEqual([self.details(v) for v in self.columnar.find_makerspace_eligible()], expected)
+
+        logic.use_policy(policy.compile_policy({"discounts": [{"min_age": 50, "discount": 10}], "item_types": {},
+                                                "makerspace": {"min_age": 21, "max_age": 95}}))
+        expected = [self.details(p) for p in self.patrons
+                    if can_use_makerspace(p._age, p._outstanding_fees, p._makerspace_training)]
+        self.assertIn(False, [details[-1] for details in expected])
+        self.assertEqual([self.details(v) for v in self.columnar.find_makerspace_eligible()], expected)
+
+    def test_not_columnar(self):
+        """
+        Test opening a file which is not a columnar file.
+
+        This test verifies that a ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            ColumnarPatrons("data/patrons.json")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
 import unittest
 from src.data_mgmt import DataManager
+import src.data_mgmt as data_mgmt
 from src.borrowable_item import BorrowableItem
 import src.config as config
 import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from src.business_logic import process_loan, process_loans, process_return
 
 class TestDataMgmtClass(unittest.TestCase):
     """
@@ -16,8 +22,13 @@ class TestDataMgmtClass(unittest.TestCase):
     - load_patrons: Verifies that patron data is loaded correctly from a file.
     - load_catalogue: Verifies that catalogue data is loaded correctly from a file.
     - register_patron: Ensures that a new patron is registered correctly.
+    - register_patrons: Ensures that many new patrons are registered correctly at once.
     - save_patrons: Ensures that patron data is saved correctly to a file.
     - save_catalogue: Ensures that catalogue data is saved correctly to a file.
+    - read_records: Ensures that data read one record at a time matches the whole file.
+    - journaling: Ensures that changes journaled in one session are replayed in the next, and cleared once saved.
+    - write_records: Ensures that data is saved in the same format as encoding one record at a time.
+    - sharding: Ensures that patron data split across several files is saved and loaded (in parallel) correctly.
 
     """
 
@@ -106,6 +117,57 @@ class TestDataMgmtClass(unittest.TestCase):
         self.assertEqual(new_patron._name, self.patron_name)
         self.assertEqual(new_patron._age, self.patron_age)
         self.assertEqual(new_patron._id, 101)
+        # Verify the new patron can be found through the name and age index
+        self.assertIs(self.data_manager._patron_index[("er jun yet", 25)], new_patron)
+
+    def test_bulk_registration(self):
+        """
+        Test the register_patrons method.
+
+        This test ensures that many patrons registered at once are given consecutive new IDs, are journaled as a
+        single record, and are present when the data is next loaded.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = shutil.copy("data/patrons.json", temp_dir)
+            config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", temp_dir)
+            journal_path = os.path.join(temp_dir, "journal.log")
+
+            manager = DataManager(journal_path)
+            new_patrons = manager.register_patrons([(f"Student {i}", 12) for i in range(500)])
+            self.assertEqual([p._id for p in new_patrons], list(range(101, 601)))
+            self.assertIs(manager._patron_index[("student 7", 12)], new_patrons[7])
+            self.assertEqual(len(manager._journal), 1)
+            self.assertEqual(manager.register_patrons([]), [])
+            manager.register_patron(self.patron_name, self.patron_age)
+            self.assertEqual(manager._patron_data[-1]._id, 601)
+            manager._journal.close()
+
+            replayed = DataManager(journal_path)
+            self.assertEqual(len(replayed._patron_data), 601)
+            self.assertEqual(replayed._patron_index[("student 499", 12)]._id, 600)
+            replayed.register_patron("Another Patron", 40)
+            self.assertEqual(replayed._patron_data[-1]._id, 602)
+            replayed._journal.close()
+
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+
+    def test_registration_with_no_patrons(self):
+        """
+        Test registering the first patron when there is no patron data.
+
+        This test ensures that the first patron is given ID 1.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = os.path.join(temp_dir, "patrons.json")
+            with open(config.PATRON_DATA, 'w') as f:
+                f.write("[]")
+
+            manager = DataManager()
+            manager.register_patron(self.patron_name, self.patron_age)
+            self.assertEqual([p._id for p in manager._patron_data], [1])
+
+        config.PATRON_DATA = "data/patrons.json"
 
     def test_patrons_data_saving(self):
         """
@@ -170,6 +232,233 @@ class TestDataMgmtClass(unittest.TestCase):
         config.CATALOGUE_DATA = "data/catalogue.json"
 
 
+    def test_saved_format_unchanged(self):
+        """
+        Test the format of the saved patron data.
+
+        This test ensures that writing the data in chunks produces exactly the same file as encoding and
+        writing each patron separately, including when the data does not fill the last chunk.
+        """
+        expected = "[" + ",".join(json.dumps(p, cls=DataManager.PatronEncoder) for p in self.data_manager._patron_data) + "]"
+        config.PATRON_DATA = "test_save_format_data.json"
+        chunk_size = data_mgmt.SAVE_CHUNK_SIZE
+        data_mgmt.SAVE_CHUNK_SIZE = 30
+
+        self.data_manager.save_patrons()
+        with open("test_save_format_data.json", 'r') as saved_patron_file:
+            saved = saved_patron_file.read()
+        os.remove("test_save_format_data.json")
+        data_mgmt.SAVE_CHUNK_SIZE = chunk_size
+        config.PATRON_DATA = "data/patrons.json"
+
+        self.assertEqual(saved, expected)
+
+    def test_read_records_in_chunks(self):
+        """
+        Test the read_records function.
+
+        This test ensures that reading the patron data in chunks much smaller than a record gives the same
+        records as loading the whole file.
+        """
+        with open("data/patrons.json", 'r') as patron_file:
+            expected = json.load(patron_file)
+        chunk_size = data_mgmt.LOAD_CHUNK_SIZE
+        data_mgmt.LOAD_CHUNK_SIZE = 7
+
+        records = list(data_mgmt.read_records("data/patrons.json"))
+
+        data_mgmt.LOAD_CHUNK_SIZE = chunk_size
+        self.assertEqual(records, expected)
+
+    def test_read_records_invalid(self):
+        """
+        Test the read_records function with invalid data.
+
+        This test ensures that incomplete lists, missing separators, and trailing data are rejected.
+        """
+        for text in ['[{"a": 1}, {"a": 2}', '[{"a": 1} {"a": 2}]', '[{"a": 1}] x', '{"a": 1}']:
+            with open("test_read_records_data.json", 'w') as f:
+                f.write(text)
+            with self.assertRaises(ValueError):
+                list(data_mgmt.read_records("test_read_records_data.json"))
+        with open("test_read_records_data.json", 'w') as f:
+            f.write(" [ ] ")
+        self.assertEqual(list(data_mgmt.read_records("test_read_records_data.json")), [])
+        os.remove("test_read_records_data.json")
+
+    @mock.patch('src.business_logic.can_borrow')
+    def test_journal_replay(self, mock_can_borrow):
+        """
+        Test journaling changes to patron and catalogue data.
+
+        This test ensures that a registration, loan, and return made in one session without saving are
+        present when the data is next loaded, and that replaying the journal over saved data has no effect.
+        """
+        mock_can_borrow.return_value = True
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = shutil.copy("data/patrons.json", temp_dir)
+            config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", temp_dir)
+            journal_path = os.path.join(temp_dir, "journal.log")
+
+            manager = DataManager(journal_path)
+            manager.register_patron(self.patron_name, self.patron_age)
+            new_patron = manager._patron_data[-1]
+            process_loan(new_patron, manager._catalogue_index[2], 7, manager)
+            process_loan(new_patron, manager._catalogue_index[4], 7, manager)
+            process_return(new_patron, 4, manager)
+            manager._journal.close()
+
+            replayed = DataManager(journal_path)
+            patron = replayed._patron_data[-1]
+            self.assertEqual(len(replayed._patron_data), 101)
+            self.assertEqual((patron._id, patron._name, patron._age), (101, self.patron_name, self.patron_age))
+            self.assertEqual([l._item._id for l in patron._loans], [2])
+            self.assertEqual(replayed._catalogue_index[2]._on_loan, manager._catalogue_index[2]._on_loan)
+            self.assertEqual(replayed._loan_index.find(2), [(patron, patron._loans[0])])
+
+            # save without clearing the journal, then replay it again
+            replayed.save_patrons()
+            replayed.save_catalogue()
+            replayed._journal.close()
+            again = DataManager(journal_path)
+            self.assertEqual(len(again._patron_data), 101)
+            self.assertEqual(len(again._patron_data[-1]._loans), 1)
+            self.assertEqual(again._catalogue_index[2]._on_loan, manager._catalogue_index[2]._on_loan)
+
+            again.compact()
+            self.assertEqual(len(again._journal), 0)
+            again._journal.close()
+
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+
+    def test_journal_replay_checkout(self):
+        """
+        Test journaling the loan of several items at once.
+
+        This test ensures that the loans are journalled as a single record, and are present when the data is next loaded.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = shutil.copy("data/patrons.json", temp_dir)
+            config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", temp_dir)
+            journal_path = os.path.join(temp_dir, "journal.log")
+
+            manager = DataManager(journal_path)
+            new_patron = manager.register_patrons([(self.patron_name, self.patron_age)])[0]
+            books = [manager._catalogue_index[1], manager._catalogue_index[2]]
+            self.assertEqual(process_loans(new_patron, [(books[0], 7), (books[1], 14)], manager), [])
+            self.assertEqual(len(manager._journal), 2)
+            manager._journal.close()
+
+            replayed = DataManager(journal_path)
+            patron = replayed._patron_data[-1]
+            self.assertEqual([(l._item._id, l._due_date) for l in patron._loans],
+                             [(l._item._id, l._due_date) for l in new_patron._loans])
+            self.assertEqual([replayed._catalogue_index[i]._on_loan for i in (1, 2)], [b._on_loan for b in books])
+            replayed._journal.close()
+
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+
+    def test_checkout_compacted(self):
+        """
+        Test the loan of several items at once when it fills the journal.
+
+        This test ensures the loans are saved (and indexed) by the compaction the journal record causes.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = shutil.copy("data/patrons.json", temp_dir)
+            config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", temp_dir)
+            config.SNAPSHOT_DATA = None
+            config.JOURNAL_COMPACT_SIZE = 1
+
+            manager = DataManager(os.path.join(temp_dir, "journal.log"))
+            patron = manager.register_patrons([(self.patron_name, self.patron_age)])[0]
+            item = manager._catalogue_index[3]
+            self.assertEqual(process_loans(patron, [(item, 3)], manager), [])
+            self.assertEqual(len(manager._journal), 0)
+            self.assertIn(patron, [p for p, l in manager._loan_index.find(item._id)])
+            manager.save_changes()
+            manager._journal.close()
+
+            reloaded = DataManager(os.path.join(temp_dir, "journal.log"))
+            self.assertIsNotNone(reloaded._patron_data[-1].find_loan(item._id))
+            self.assertEqual(reloaded._catalogue_index[3]._on_loan, item._on_loan)
+            reloaded._journal.close()
+
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+        config.SNAPSHOT_DATA = "data/snapshot.pickle"
+        config.JOURNAL_COMPACT_SIZE = 1000
+
+    def test_checkout_compaction_fails(self):
+        """
+        Test the loan of several items at once when the compaction it causes fails.
+
+        This test ensures the loans are kept once they are journalled, rather than undone, so that the data in
+        memory matches the journal, and that the loans are present when the data is next loaded.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = shutil.copy("data/patrons.json", temp_dir)
+            config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", temp_dir)
+            config.SNAPSHOT_DATA = None
+            config.JOURNAL_COMPACT_SIZE = 1
+
+            manager = DataManager(os.path.join(temp_dir, "journal.log"))
+            with mock.patch('src.data_mgmt.DataManager.save_patrons', side_effect=OSError):
+                patron = manager.register_patrons([(self.patron_name, self.patron_age)])[0]
+                item = manager._catalogue_index[3]
+                on_loan = item._on_loan
+                self.assertEqual(process_loans(patron, [(item, 3)], manager), [])
+            self.assertIsNotNone(patron.find_loan(item._id))
+            self.assertEqual(item._on_loan, on_loan + 1)
+            self.assertEqual(len(manager._journal), 2)
+            manager._journal.close()
+
+            reloaded = DataManager(os.path.join(temp_dir, "journal.log"))
+            self.assertIsNotNone(reloaded._patron_data[-1].find_loan(item._id))
+            self.assertEqual(reloaded._catalogue_index[3]._on_loan, item._on_loan)
+            reloaded._journal.close()
+
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+        config.SNAPSHOT_DATA = "data/snapshot.pickle"
+        config.JOURNAL_COMPACT_SIZE = 1000
+
+    def test_sharded_patron_data(self):
+        """
+        Test saving and loading patron data split across several files.
+
+        This test ensures that the patrons are split across the files in order, and that loading the files
+        in parallel gives the same patrons, with loans linked to the catalogue's items.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.PATRON_DATA = shutil.copy("data/patrons.json", temp_dir)
+            config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", temp_dir)
+            config.SNAPSHOT_DATA = None
+            manager = DataManager()
+
+            config.PATRON_SHARDS = 3
+            paths = data_mgmt.shard_paths(config.PATRON_DATA, 3)
+            self.assertEqual(paths, [os.path.join(temp_dir, f"patrons.{i}.json") for i in range(3)])
+            manager.save_patrons()
+            self.assertEqual([len(list(data_mgmt.read_records(p))) for p in paths], [34, 34, 32])
+
+            # load in separate processes however many CPUs there are
+            with mock.patch('src.data_mgmt.os.cpu_count', return_value=3):
+                sharded = DataManager()
+            encode = DataManager.PatronEncoder.to_record
+            self.assertEqual([encode(p) for p in sharded._patron_data], [encode(p) for p in manager._patron_data])
+            for patron in sharded._patron_data:
+                for loan in patron._loans:
+                    self.assertIs(loan._item, sharded._catalogue_index[loan._item._id])
+            self.assertEqual(len(sharded._loan_index.find(1)), len(manager._loan_index.find(1)))
+
+        config.PATRON_SHARDS = 1
+        config.SNAPSHOT_DATA = "data/snapshot.pickle"
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
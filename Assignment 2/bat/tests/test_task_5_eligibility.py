@@ -0,0 +1,127 @@
+import unittest
+from unittest import mock
+import src.business_logic as logic
+import src.policy as policy
+import src.config as config
+from src.eligibility import EligibilityCache
+from src.patron import Patron
+
+
+class TestEligibilityCache(unittest.TestCase):
+    """
+    Unit tests for the per patron eligibility cache.
+
+    This test suite aims to validate that repeated checks for a patron are answered from the cache,
+    that a patron's cached state is only replaced when their details or the policy change, and that
+    cached decisions match the rules.
+
+    The following functions are tested:
+    - get: Derives a patron's type, discount and fees owed.
+    - can_borrow and can_use_makerspace: Check loans and makerspace access through the cache.
+    - eligible_item_types: Finds the types of item a patron can borrow.
+    - invalidate and get_stats: Clear the cache and report hits and misses.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method creates an empty cache and a patron with every training.
+        """
+        self.cache = EligibilityCache()
+        self.patron = Patron()
+        self.patron.set_new_patron_data(1, "Jane Smith", 55)
+        self.patron._outstanding_fees = 0.0
+        self.patron._training = 7
+
+    def tearDown(self):
+        """
+        Go back to the rules in business_logic after each test method.
+        """
+        logic.use_policy(None)
+
+    def test_derived_state(self):
+        """
+        Test the state derived from a patron's details.
+
+        This test verifies the patron type, discount and fees owed, including for a negative age.
+        """
+        self.patron._outstanding_fees = 10.0
+        entry = self.cache.get(self.patron)
+        self.assertEqual(entry._patron_type, "Adult")
+        self.assertEqual(entry._discount, 10)
+        self.assertEqual(entry._fees_owed, 9.0)
+        self.patron._age = -1
+        entry = self.cache.get(self.patron)
+        self.assertEqual((entry._patron_type, entry._discount, entry._fees_owed), ("ERROR", "ERROR", None))
+
+    def test_repeat_checks_hit(self):
+        """
+        Test repeated checks for the same patron.
+
+        This test ensures the rules are applied once for each decision, and the counters record hits and misses.
+        """
+        with mock.patch('src.business_logic.can_borrow', return_value=True) as can_borrow:
+            for _ in range(3):
+                self.assertTrue(self.cache.can_borrow(self.patron, "Book", 7))
+            self.assertTrue(self.cache.can_borrow(self.patron, "Book", 8))
+        self.assertEqual(can_borrow.call_count, 2)
+        self.assertTrue(self.cache.can_use_makerspace(self.patron))
+        self.assertTrue(self.cache.can_use_makerspace(self.patron))
+        self.assertEqual(self.cache.get_stats(), {"hits": 3, "misses": 3, "patrons": 1})
+
+    def test_invalidated_by_details(self):
+        """
+        Test checks after a patron's fees, training or age change.
+
+        This test verifies that each change causes the patron's state to be derived again, with the new result.
+        """
+        self.assertTrue(self.cache.can_borrow(self.patron, "Carpentry tool", 7))
+        self.patron._outstanding_fees = 5.0
+        self.assertFalse(self.cache.can_borrow(self.patron, "Carpentry tool", 7))
+        self.patron._outstanding_fees = 0.0
+        self.patron._carpentry_tool_training = False
+        self.assertFalse(self.cache.can_borrow(self.patron, "Carpentry tool", 7))
+        self.patron._carpentry_tool_training = True
+        self.patron._age = 95
+        self.assertFalse(self.cache.can_borrow(self.patron, "Carpentry tool", 7))
+        self.assertEqual(self.cache.get_stats(), {"hits": 0, "misses": 4, "patrons": 1})
+        # other changes, e.g. new loans, keep the cached state
+        self.patron._name = "Jane Doe"
+        self.assertFalse(self.cache.can_borrow(self.patron, "Carpentry tool", 7))
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_invalidated_by_policy(self):
+        """
+        Test checks after a different policy is applied.
+
+        This test ensures cached decisions made under a previous policy are not used.
+        """
+        self.assertTrue(self.cache.can_borrow(self.patron, "Book", 30))
+        rules = policy.load_policy(config.POLICY_DATA)
+        rules._loan_rules["Book"] = lambda *args: False
+        logic.use_policy(rules)
+        self.assertFalse(self.cache.can_borrow(self.patron, "Book", 30))
+        self.assertEqual(self.cache.eligible_item_types(self.patron), ["Gardening tool", "Carpentry tool"])
+
+    def test_eligible_item_types(self):
+        """
+        Test finding the types of item patrons can borrow.
+
+        This test verifies the result for patrons with and without training, and with a negative age.
+        """
+        self.assertEqual(self.cache.eligible_item_types(self.patron), ["Book", "Gardening tool", "Carpentry tool"])
+        other = Patron()
+        other.set_new_patron_data(2, "Sam Fox", 10)
+        self.assertEqual(self.cache.eligible_item_types(other), ["Book"])
+        # the rules can not be applied to a negative age
+        other._age = -1
+        self.assertEqual(self.cache.eligible_item_types(other), [])
+        self.cache.invalidate(other)
+        self.assertEqual(self.cache.get_stats()["patrons"], 1)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.get_stats()["patrons"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,288 @@
+import unittest
+from src.indexes import AgeIndex, NameIndex, LoanIndex, DueDateIndex
+from src.borrowable_item import BorrowableItem
+from src.loan import Loan
+from datetime import date
+from src.patron import Patron
+
+
+class TestAgeIndex(unittest.TestCase):
+    """
+    Unit tests for the AgeIndex class.
+
+    This test suite aims to validate that the age index finds the same patrons as a scan of the
+    patron data, for both exact ages and ranges of ages.
+
+    The following methods are tested:
+    - add: Adds a patron to the index.
+    - find: Finds the patrons with an exact age.
+    - find_range: Finds the patrons with an age in an inclusive range.
+    - count_range: Counts the patrons with an age in an inclusive range.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method creates patrons aged 70, 20, 65, 20 and 89 (in that order) and indexes them.
+        """
+        self.patrons = []
+        for i, age in enumerate([70, 20, 65, 20, 89]):
+            patron = Patron()
+            patron.set_new_patron_data(i, f"Patron {i}", age)
+            self.patrons.append(patron)
+        self.index = AgeIndex(self.patrons)
+
+    def test_find_exact_age(self):
+        """
+        Test finding patrons with an exact age.
+
+        This test verifies that all patrons with the age are found, in the order they were added.
+        """
+        self.assertEqual(self.index.find(20), [self.patrons[1], self.patrons[3]])
+        self.assertEqual(self.index.find(21), [])
+
+    def test_find_age_range(self):
+        """
+        Test finding patrons with an age in a range.
+
+        This test verifies that both ends of the range are inclusive and the patrons are ordered by age.
+        """
+        found = self.index.find_range(65, 89)
+        self.assertEqual(found, [self.patrons[2], self.patrons[0], self.patrons[4]])
+        self.assertEqual(self.index.find_range(90, 100), [])
+
+    def test_count_age_range(self):
+        """
+        Test counting patrons with an age in a range.
+
+        This test verifies that the count matches the number of patrons found.
+        """
+        self.assertEqual(self.index.count_range(20, 65), 3)
+        self.assertEqual(self.index.count_range(21, 64), 0)
+
+    def test_add_new_age(self):
+        """
+        Test adding a patron with an age not already in the index.
+
+        This test verifies that the new patron is included in range searches.
+        """
+        patron = Patron()
+        patron.set_new_patron_data(5, "Patron 5", 66)
+        self.index.add(patron)
+        self.assertEqual(self.index.find_range(66, 69), [patron])
+
+
+class TestNameIndex(unittest.TestCase):
+    """
+    Unit tests for the NameIndex class.
+
+    This test suite aims to validate that the name index finds patrons case insensitively, and ranks
+    approximate matches so that the closest names are returned first.
+
+    The following methods are tested:
+    - find: Finds the patrons with an exact (case insensitive) name.
+    - find_prefix, count, count_prefix: Find and count patrons by the start of their name.
+    - find_similar: Finds the patrons with names similar to a possibly mistyped name, building the trigram
+      index the first time.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method creates and indexes patrons with a mix of similar and dissimilar names.
+        """
+        self.patrons = []
+        for i, name in enumerate(["Timothy Allen", "Timothy Allan", "Leon Kelly", "timothy allen"]):
+            patron = Patron()
+            patron.set_new_patron_data(i, name, 30 + i)
+            self.patrons.append(patron)
+        self.index = NameIndex(self.patrons)
+
+    def test_find_case_insensitive(self):
+        """
+        Test finding patrons by exact name.
+
+        This test verifies that names differing only in case are treated as the same name.
+        """
+        self.assertEqual(self.index.find("TIMOTHY ALLEN"), [self.patrons[0], self.patrons[3]])
+        self.assertEqual(self.index.find("Timothy"), [])
+
+    def test_find_prefix(self):
+        """
+        Test finding patrons by the start of their name.
+
+        This test verifies that the prefix search is case insensitive, and counts match the patrons found.
+        """
+        self.assertEqual(self.index.find_prefix("TIMOTHY ALL"), [self.patrons[1], self.patrons[0], self.patrons[3]])
+        self.assertEqual(self.index.count_prefix("timothy alle"), 2)
+        self.assertEqual(self.index.count("Leon kelly"), 1)
+        self.assertEqual(self.index.find_prefix("Z"), [])
+
+    def test_add_after_construction(self):
+        """
+        Test adding patrons to an index after it is built.
+
+        This test ensures new and repeated names are found by prefix, in sorted order with the indexed names.
+        """
+        for i, name in enumerate(["Timothy Alder", "Leon Kelly", "Aaron Bell"], 10):
+            patron = Patron()
+            patron.set_new_patron_data(i, name, 40)
+            self.index.add(patron)
+        self.assertEqual(self.index._sorted_names, sorted(self.index._sorted_names))
+        self.assertEqual(len(self.index._sorted_names), 5)
+        self.assertEqual(self.index.count_prefix("timothy al"), 4)
+        self.assertEqual(self.index.count("leon kelly"), 2)
+
+    def test_find_similar_ranked(self):
+        """
+        Test finding patrons by a mistyped name.
+
+        This test verifies that the closest name is ranked first and unrelated names are excluded.
+        """
+        found = self.index.find_similar("Timothy Alen")
+        self.assertEqual(found[:2], [self.patrons[0], self.patrons[3]])
+        self.assertIn(self.patrons[1], found)
+        self.assertNotIn(self.patrons[2], found)
+
+    def test_find_similar_limit(self):
+        """
+        Test limiting the number of names returned by an approximate search.
+
+        This test verifies that only patrons with the single best matching name are returned.
+        """
+        self.assertEqual(self.index.find_similar("Timothy Allan", limit=1), [self.patrons[1]])
+
+    def test_trigrams_built_lazily(self):
+        """
+        Test building the trigram index on the first approximate search.
+
+        This test ensures the trigram index is not built for exact searches, and that names added before and
+        after it is built are both found by approximate searches.
+        """
+        self.assertIsNone(self.index._postings)
+        before, after = Patron(), Patron()
+        before.set_new_patron_data(10, "Leonie Kelley", 40)
+        after.set_new_patron_data(11, "Leona Kelly", 40)
+        self.index.add(before)
+        self.assertEqual(self.index.find("leonie kelley"), [before])
+        self.assertIsNone(self.index._postings)
+
+        self.assertIn(before, self.index.find_similar("Leon Kelley"))
+        self.assertIsNotNone(self.index._postings)
+        self.index.add(after)
+        self.assertIn(after, self.index.find_similar("Leona Kely"))
+
+
+class TestLoanIndex(unittest.TestCase):
+    """
+    Unit tests for the LoanIndex class.
+
+    This test suite aims to validate that the loan index tracks which patrons are borrowing each item
+    as loans are added and removed.
+
+    The following methods are tested:
+    - add: Adds a loan to the index.
+    - remove: Removes a loan from the index.
+    - find: Finds the active loans of an item.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method creates an item and two patrons who are both borrowing it.
+        """
+        self.item = BorrowableItem()
+        self.item._id = 7
+        self.patrons = []
+        for i in range(2):
+            patron = Patron()
+            patron.set_new_patron_data(i, f"Patron {i}", 30)
+            patron._loans.append(Loan(self.item, date(2024, 10, 20)))
+            self.patrons.append(patron)
+        self.index = LoanIndex(self.patrons)
+
+    def test_find_borrowers(self):
+        """
+        Test finding the loans of an item.
+
+        This test verifies that both borrowers are found, and an item nobody is borrowing has no loans.
+        """
+        self.assertEqual([p for p, l in self.index.find(7)], self.patrons)
+        self.assertEqual(self.index.find(8), [])
+
+    def test_remove_loan(self):
+        """
+        Test removing a loan.
+
+        This test verifies that only the patron who returned the item is removed from its borrowers.
+        """
+        self.index.remove(self.patrons[0], self.patrons[0]._loans[0])
+        self.assertEqual([p for p, l in self.index.find(7)], [self.patrons[1]])
+        self.index.remove(self.patrons[1], self.patrons[1]._loans[0])
+        self.assertEqual(self.index.find(7), [])
+
+
+class TestDueDateIndex(unittest.TestCase):
+    """
+    Unit tests for the DueDateIndex class.
+
+    This test suite aims to validate that the due date index finds loans due before and between dates,
+    in due date order, as loans are added and removed.
+
+    The following methods are tested:
+    - add: Adds a loan to the index.
+    - remove: Removes a loan from the index.
+    - find_before: Finds the loans due before a date.
+    - find_between: Finds the loans due between two dates.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method creates a patron with loans due on the 20th, 10th and 15th of October 2024 (in that order).
+        """
+        self.patron = Patron()
+        self.patron.set_new_patron_data(0, "Patron 0", 30)
+        for i, day in enumerate([20, 10, 15]):
+            item = BorrowableItem()
+            item._id = i
+            self.patron._loans.append(Loan(item, date(2024, 10, day)))
+        self.index = DueDateIndex([self.patron])
+
+    def test_find_before(self):
+        """
+        Test finding the loans due before a date.
+
+        This test verifies that loans due on the date itself are not included, and the loans are ordered by due date.
+        """
+        loans = [l for p, l in self.index.find_before(date(2024, 10, 20))]
+        self.assertEqual(loans, [self.patron._loans[1], self.patron._loans[2]])
+
+    def test_find_between(self):
+        """
+        Test finding the loans due between two dates.
+
+        This test verifies that both ends of the date range are inclusive.
+        """
+        loans = [l for p, l in self.index.find_between(date(2024, 10, 15), date(2024, 10, 20))]
+        self.assertEqual(loans, [self.patron._loans[2], self.patron._loans[0]])
+
+    def test_add_and_remove(self):
+        """
+        Test adding and removing loans.
+
+        This test verifies that a removed loan is no longer found, and an added loan is found in due date order.
+        """
+        self.index.remove(self.patron, self.patron._loans[1])
+        new_loan = Loan(self.patron._loans[0]._item, date(2024, 10, 1))
+        self.index.add(self.patron, new_loan)
+        loans = [l for p, l in self.index.find_before(date(2024, 10, 16))]
+        self.assertEqual(loans, [new_loan, self.patron._loans[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import tempfile
+from src.journal import Journal
+
+
+class TestJournal(unittest.TestCase):
+    """
+    Unit tests for the Journal class.
+
+    This test suite aims to validate that journal records persist between openings of the journal,
+    that partly written records are discarded, and that clearing the journal removes every record.
+
+    The following methods are tested:
+    - append: Appends a record to the journal.
+    - records: Gets the records in the journal when it was opened.
+    - clear: Removes every record from the journal.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method creates a temporary directory to hold the journal file.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "journal.log")
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after each test method.
+        """
+        self.temp_dir.cleanup()
+
+    def test_records_persist(self):
+        """
+        Test appending records and reopening the journal.
+
+        This test verifies that appended records are read back in order.
+        """
+        journal = Journal(self.path)
+        journal.append({"op": "register", "patron_id": 1})
+        journal.append({"op": "register", "patron_id": 2})
+        journal.close()
+
+        journal = Journal(self.path)
+        self.assertEqual(journal.records(), [{"op": "register", "patron_id": 1}, {"op": "register", "patron_id": 2}])
+        self.assertEqual(len(journal), 2)
+        journal.close()
+
+    def test_partial_record_discarded(self):
+        """
+        Test opening a journal whose last record was only partly written.
+
+        This test verifies that the partial record is discarded, and records appended afterwards are not corrupted.
+        """
+        with open(self.path, 'w') as f:
+            f.write('{"op":"register","patron_id":1}\n{"op":"reg')
+
+        journal = Journal(self.path)
+        self.assertEqual(journal.records(), [{"op": "register", "patron_id": 1}])
+        journal.append({"op": "register", "patron_id": 2})
+        journal.close()
+
+        journal = Journal(self.path)
+        self.assertEqual(journal.records(), [{"op": "register", "patron_id": 1}, {"op": "register", "patron_id": 2}])
+        journal.close()
+
+    def test_clear(self):
+        """
+        Test clearing the journal.
+
+        This test verifies that no records remain after the journal is cleared.
+        """
+        journal = Journal(self.path)
+        journal.append({"op": "register", "patron_id": 1})
+        journal.clear()
+        self.assertEqual(len(journal), 0)
+        journal.close()
+
+        journal = Journal(self.path)
+        self.assertEqual(journal.records(), [])
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
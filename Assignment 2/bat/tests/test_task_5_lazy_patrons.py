@@ -0,0 +1,199 @@
+import unittest
+from unittest import mock
+import os
+import shutil
+import tempfile
+from src.data_mgmt import DataManager
+from src.business_logic import process_loan
+import src.search as search
+from src.query import PatronQuery
+import src.config as config
+
+
+class TestLazyPatrons(unittest.TestCase):
+    """
+    Unit tests for lazy loading of patron data.
+
+    This test suite aims to validate that with lazy loading only the patrons which are looked up are
+    loaded, and that lazily loaded patrons match patrons loaded at start up.
+
+    The following are tested:
+    - DataManager.index_patrons: Indexes the patron data file without loading patrons.
+    - LazyPatrons and LazyIndex: Load patrons the first time they are looked up.
+    - PatronQuery: Searches lazily loaded patrons without the age and name indexes.
+    - DataManager.find_patrons_by_name and find_patrons_by_age: Search the columnar patron details.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method copies the data files to a temporary directory, and turns on lazy loading.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config.PATRON_DATA = shutil.copy("data/patrons.json", self.temp_dir.name)
+        config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", self.temp_dir.name)
+        config.PATRON_OFFSETS_DATA = os.path.join(self.temp_dir.name, "patrons.offsets")
+        config.LAZY_LOADING = True
+
+    def tearDown(self):
+        """
+        Turn off lazy loading, restore the data file paths and remove the temporary directory after each
+        test method.
+        """
+        config.LAZY_LOADING = False
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+        config.PATRON_OFFSETS_DATA = "data/patrons.offsets"
+        config.COLUMNAR_DATA = None
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def records(patrons):
+        """
+        Get the saved form of some patrons.
+        """
+        return [DataManager.PatronEncoder.to_record(p) for p in patrons]
+
+    def test_lookup_loads_one_patron(self):
+        """
+        Test looking up a patron by name and age.
+
+        This test verifies that only that patron is loaded, and that it matches the patron loaded
+        without lazy loading.
+        """
+        lazy = DataManager()
+        self.assertEqual(len(lazy._patron_data._loaded), 0)
+
+        patron = search.find_patron_by_name_and_age("John Doe", 95, lazy._patron_data, lazy._patron_index)
+        self.assertEqual(list(lazy._patron_data._loaded), [patron._id])
+        self.assertIs(lazy._patron_ids.get(patron._id), patron)
+        self.assertIsNone(lazy._patron_index.get(("nobody", 1)))
+        self.assertIsNone(lazy._patron_ids.get(0))
+
+        config.LAZY_LOADING = False
+        eager = DataManager()
+        self.assertEqual(self.records([patron]), self.records([eager._patron_index[("john doe", 95)]]))
+        # loans are linked to the catalogue's items
+        self.assertIs(patron._loans[0]._item, lazy._catalogue_index[patron._loans[0]._item._id])
+
+    def test_all_patrons(self):
+        """
+        Test iterating over lazily loaded patrons and searching without an index.
+
+        This test verifies that every patron is loaded, in file order, and matches the patrons loaded
+        without lazy loading.
+        """
+        lazy = DataManager()
+        config.LAZY_LOADING = False
+        eager = DataManager()
+
+        self.assertEqual(len(lazy._patron_data), len(eager._patron_data))
+        self.assertEqual(self.records(lazy._patron_data), self.records(eager._patron_data))
+        self.assertEqual(self.records(search.find_patron_by_age(95, lazy._patron_data, lazy._age_index)),
+                         self.records(search.find_patron_by_age(95, eager._patron_data)))
+
+    def test_query_without_indexes(self):
+        """
+        Test querying lazily loaded patrons by name and age.
+
+        This test verifies that the query falls back to a full scan, and finds the same patrons as
+        without lazy loading.
+        """
+        lazy = DataManager()
+        query = PatronQuery(lazy).name_prefix("tina").age_between(10, 89)
+        self.assertEqual(query.plan()[0], "full scan")
+        found = query.run()
+        self.assertEqual([p._name for p in PatronQuery(lazy).name("TINA PRICE").age(71).run()], ["Tina Price"])
+
+        config.LAZY_LOADING = False
+        eager = DataManager()
+        expected = PatronQuery(eager).name_prefix("tina").age_between(10, 89).run()
+        by_id = lambda p: p._id
+        self.assertEqual(self.records(sorted(found, key=by_id)), self.records(sorted(expected, key=by_id)))
+
+    def test_columnar_details(self):
+        """
+        Test searching lazily loaded patrons by name and age with columnar patron details.
+
+        This test verifies that the details are saved with the patron data, that only the patrons found are
+        loaded, and that the details are not used once a patron is added or the patron data file changes.
+        """
+        config.COLUMNAR_DATA = os.path.join(self.temp_dir.name, "patrons.col")
+        lazy = DataManager()
+        self.assertIsNone(lazy._patron_details)
+        lazy.save_patrons()
+        self.assertTrue(os.path.exists(config.COLUMNAR_DATA))
+
+        lazy = DataManager()
+        self.assertIsNotNone(lazy._patron_details)
+        found = lazy.find_patrons_by_name("jOhN dOe")
+        self.assertEqual(sorted(lazy._patron_data._loaded), sorted(p._id for p in found))
+        by_age = lazy.find_patrons_by_age(95)
+        self.assertIs(lazy._patron_ids.get(found[0]._id), found[0])
+
+        config.LAZY_LOADING = False
+        eager = DataManager()
+        self.assertEqual(self.records(found), self.records(eager.find_patrons_by_name("john doe")))
+        self.assertEqual(self.records(by_age), self.records(eager.find_patrons_by_age(95)))
+
+        lazy.register_patron("Zed Quill", 40)
+        self.assertIsNone(lazy._patron_details)
+        self.assertEqual([p._name for p in lazy.find_patrons_by_name("zed quill")], ["Zed Quill"])
+
+        # patron data saved after the details were saved
+        config.LAZY_LOADING = True
+        stat = os.stat(config.PATRON_DATA)
+        os.utime(config.PATRON_DATA, ns=(stat.st_atime_ns, os.stat(config.COLUMNAR_DATA).st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(DataManager()._patron_details)
+
+    def test_changes_saved(self):
+        """
+        Test registering a patron and giving a loan with lazy loading, then saving.
+
+        This test verifies that the changes are saved along with every patron which was not loaded.
+        """
+        lazy = DataManager()
+        patron = lazy._patron_index[("john doe", 95)]
+        process_loan(patron, lazy._catalogue_index[2], 7, lazy)
+        lazy.register_patron("New Patron", 30)
+        lazy.compact()
+
+        config.LAZY_LOADING = False
+        saved = DataManager()
+        self.assertEqual(self.records(saved._patron_data), self.records(lazy._patron_data))
+        self.assertIsNotNone(saved._patron_index[("john doe", 95)].find_loan(2))
+        self.assertIn(("new patron", 30), saved._patron_index)
+
+    def test_offsets_reused(self):
+        """
+        Test starting with lazy loading while the patron data file is unchanged.
+
+        This test verifies that the file is only parsed the first time.
+        """
+        DataManager()
+        self.assertTrue(os.path.exists(config.PATRON_OFFSETS_DATA))
+
+        with mock.patch('src.data_mgmt.scan_records') as scan_records:
+            lazy = DataManager()
+            scan_records.assert_not_called()
+        self.assertEqual(lazy._patron_index[("john doe", 95)]._id, 1)
+
+    def test_non_ascii_file(self):
+        """
+        Test lazy loading a patron data file which contains non-ASCII text.
+
+        This test verifies that every patron is loaded at start up instead.
+        """
+        with open(config.PATRON_DATA, 'r') as f:
+            text = f.read()
+        with open(config.PATRON_DATA, 'w', encoding='utf-8') as f:
+            f.write(text.replace("John Doe", "Jöhn Doe"))
+
+        lazy = DataManager()
+        self.assertIsInstance(lazy._patron_data, list)
+        self.assertIn(("jöhn doe", 95), lazy._patron_index)
+
+
+if __name__ == '__main__':
+    unittest.main()
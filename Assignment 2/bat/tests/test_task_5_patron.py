@@ -1,8 +1,9 @@
 import unittest
+import pickle
 from src.patron import Patron
-from src.loan import Loan
+from src.loan import Loan, LoanMap, parse_due_date
 from src.borrowable_item import BorrowableItem
-from datetime import date
+from datetime import date, datetime, timedelta
 
 
 class TestPatron(unittest.TestCase):
@@ -11,7 +12,7 @@ class TestPatron(unittest.TestCase):
 
     This test suite aims to validate the functionality of the Patron class, ensuring it handles
     different scenarios correctly. The tests cover finding loans, string representation of a patron,
-    and handling various patron attributes.
+    loading loans and their due dates, storing training completions, and handling various patron attributes.
     """
 
     def setUp(self):
@@ -71,5 +72,99 @@ class TestPatron(unittest.TestCase):
         self.assertEqual(result, expected_result)
 
 
+    def test_load_loans_as_dates(self):
+        """
+        Test loading a patron's loans from JSON.
+
+        This test verifies that loans are linked to the item with the saved ID, and that due dates are
+        loaded as dates (not datetimes).
+        """
+        loans = self.mock_patron.load_loans([{"item": 101, "due": "22/08/2024"}, {"item": 5, "due": "01/01/2025"}],
+                                            None, {101: self.mock_item})
+        self.assertEqual(len(loans), 1)
+        self.assertIs(loans[0]._item, self.mock_item)
+        self.assertIs(type(loans[0]._due_date), date)
+        self.assertEqual(loans[0]._due_date, date(2024, 8, 22))
+
+    def test_parse_due_date(self):
+        """
+        Test parsing saved due dates.
+
+        This test verifies that parse_due_date gives the same date as datetime.strptime for every day over
+        several years, and for dates not in exactly the saved format, and raises a ValueError for invalid dates.
+        """
+        day = date(1999, 1, 1)
+        while day < date(2031, 1, 1):
+            text = day.strftime('%d/%m/%Y')
+            self.assertEqual(parse_due_date(text), day)
+            # parsed dates are reused
+            self.assertIs(parse_due_date(text), parse_due_date(text))
+            day += timedelta(days=1)
+
+        for text in ["1/2/2024", "01/2/2024"]:
+            self.assertEqual(parse_due_date(text), datetime.strptime(text, '%d/%m/%Y').date())
+        for text in ["31/02/2024", "00/01/2024", "01/13/2024", "aa/bb/cccc", "2024-01-01", "01/01/2024 ", "\uff11\uff11/01/2024"]:
+            with self.assertRaises(ValueError):
+                parse_due_date(text)
+
+
+    def test_training_flags(self):
+        """
+        Test setting and reading training completions.
+
+        This test verifies that each training completion is set and cleared independently of the others,
+        that a patron with no data loaded reports no data for each, and that patrons survive pickling.
+        """
+        patron = Patron()
+        self.assertEqual(patron._makerspace_training, "NO DATA LOADED")
+        patron.set_new_patron_data(1, "Alex Smith", 30)
+        self.assertEqual((patron._gardening_tool_training, patron._carpentry_tool_training, patron._makerspace_training),
+                         (False, False, False))
+
+        patron._carpentry_tool_training = True
+        patron._makerspace_training = True
+        self.assertEqual((patron._gardening_tool_training, patron._carpentry_tool_training, patron._makerspace_training),
+                         (False, True, True))
+        patron._carpentry_tool_training = False
+        self.assertEqual((patron._gardening_tool_training, patron._carpentry_tool_training, patron._makerspace_training),
+                         (False, False, True))
+
+        copy = pickle.loads(pickle.dumps(self.mock_patron))
+        self.assertEqual(str(copy), str(self.mock_patron))
+        with self.assertRaises(AttributeError):
+            patron._unknown = 1
+
+
+    def test_loan_map(self):
+        """
+        Test adding, finding, and removing a patron's loans.
+
+        This test verifies that loans stay in the order they were added, can be found by item ID, and that
+        removing a loan the patron does not hold raises a ValueError as for a list.
+        """
+        items = []
+        for item_id in [7, 3, 5]:
+            item = BorrowableItem()
+            item._id = item_id
+            items.append(item)
+            self.mock_patron._loans.append(Loan(item, date(2024, 10, item_id)))
+
+        self.assertIsInstance(self.mock_patron._loans, LoanMap)
+        self.assertEqual([l._item._id for l in self.mock_patron._loans], [101, 7, 3, 5])
+        self.assertEqual(self.mock_patron._loans[-1]._item._id, 5)
+        loan = self.mock_patron.find_loan(3)
+        self.assertEqual(loan._due_date, date(2024, 10, 3))
+        self.assertIn(loan, self.mock_patron._loans)
+
+        self.mock_patron._loans.remove(loan)
+        self.assertIsNone(self.mock_patron.find_loan(3))
+        self.assertEqual([l._item._id for l in self.mock_patron._loans], [101, 7, 5])
+        with self.assertRaises(ValueError):
+            self.mock_patron._loans.remove(loan)
+        with self.assertRaises(ValueError):
+            self.mock_patron._loans.remove(Loan(items[0], date(2024, 10, 7)))
+        self.assertEqual(len(self.mock_patron._loans), 3)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import json
+import os
+import tempfile
+import src.business_logic as logic
+import src.policy as policy
+import src.config as config
+
+
+class TestPolicy(unittest.TestCase):
+    """
+    Unit tests for loan and makerspace policies.
+
+    This test suite aims to validate that a policy file is compiled to rules which give the same
+    decisions as the rules in business_logic, that new item types can be added without code changes,
+    and that the policy file is reloaded when it changes.
+
+    The following functions are tested:
+    - compile_policy and load_policy: Compile a policy to rule functions.
+    - PolicyFile.reload_if_changed: Reload a changed policy file.
+    - use_policy (through can_borrow and can_use_makerspace): Apply a compiled policy.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method loads the shipped policy, and creates a temporary directory for policy files.
+        """
+        with open(config.POLICY_DATA) as f:
+            self.policy = json.load(f)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "policy.json")
+
+    def tearDown(self):
+        """
+        Go back to the rules in business_logic and remove the temporary directory after each test method.
+        """
+        logic.use_policy(None)
+        self.temp_dir.cleanup()
+
+    def write_policy(self, data):
+        """
+        Write a policy file, with a different size or modification time to any previous one.
+        """
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def decisions(self):
+        """
+        Make every loan and makerspace decision for a range of inputs.
+        """
+        result = []
+        for age in range(0, 101):
+            for fees in (0.0, -1.0, 0.01, 7.45, float("inf")):
+                for training in (False, True):
+                    result.append(logic.can_use_makerspace(age, fees, training))
+                    for item_type in ("Book", "Gardening tool", "Carpentry tool", "Magazine"):
+                        for length in (1, 14, 15, 28, 29, 55, 56, 100):
+                            result.append(logic.can_borrow(item_type, age, length, fees, training, not training))
+                            result.append(logic.can_borrow(item_type, age, length, fees, training, training))
+        return result
+
+    def test_shipped_policy_matches_rules(self):
+        """
+        Test the shipped policy file against the rules in business_logic.
+
+        This test verifies that every decision made under the shipped policy is the same as the rules give.
+        """
+        expected = self.decisions()
+        logic.use_policy(policy.load_policy(config.POLICY_DATA))
+        actual = self.decisions()
+        self.assertEqual(len(actual), len(expected))
+        mismatches = [i for i, (a, e) in enumerate(zip(actual, expected)) if a != e]
+        self.assertEqual(mismatches, [])
+        with self.assertRaises(TypeError):
+            logic.can_borrow("Carpentry tool", -1, 7, 0.0, True, True)
+        self.assertFalse(logic.can_use_makerspace(-1, 0.0, True))
+
+    def test_new_item_type(self):
+        """
+        Test a policy with a new type of item and discount band.
+
+        This test ensures the new item type's limits, age band and training are applied.
+        """
+        self.policy["item_types"]["3D printer"] = {"max_days": 3, "min_age": 16, "training": ["carpentry tool"]}
+        self.policy["discounts"].append({"min_age": 30, "discount": 50})
+        logic.use_policy(policy.compile_policy(self.policy))
+        self.assertTrue(logic.can_borrow("3D printer", 16, 3, 0.0, False, True))
+        self.assertFalse(logic.can_borrow("3D printer", 15, 3, 0.0, False, True))
+        self.assertFalse(logic.can_borrow("3D printer", 16, 4, 0.0, False, True))
+        self.assertFalse(logic.can_borrow("3D printer", 16, 3, 0.0, True, False))
+        self.assertFalse(logic.can_borrow("3D printer", 29, 3, 1.0, False, True))
+        self.assertTrue(logic.can_borrow("Book", 40, 7, 0.0, False, False))
+
+    def test_invalid_policy(self):
+        """
+        Test compiling invalid policies.
+
+        This test verifies that a ValueError is raised for missing keys, wrong types and unknown training.
+        """
+        del self.policy["makerspace"]
+        with self.assertRaises(ValueError):
+            policy.compile_policy(self.policy)
+        with self.assertRaises(ValueError):
+            policy.compile_policy({"discounts": [], "item_types": [], "makerspace": {}})
+        with self.assertRaises(ValueError):
+            policy.compile_policy({"discounts": [], "item_types": {"Book": {"max_days": 1, "training": ["juggling"]}},
+                                   "makerspace": {}})
+
+    def test_reload_if_changed(self):
+        """
+        Test reloading a policy file without a restart.
+
+        This test ensures a changed file is reloaded, an unchanged file is not, and an invalid file
+        leaves the previous policy in use.
+        """
+        self.write_policy(self.policy)
+        policy_file = policy.PolicyFile(self.path)
+        self.assertTrue(logic.can_borrow("Book", 40, 55, 0.0, False, False))
+        self.assertFalse(policy_file.reload_if_changed())
+
+        self.policy["item_types"]["Book"]["max_days"] = 21
+        self.write_policy(self.policy)
+        self.assertTrue(policy_file.reload_if_changed())
+        self.assertFalse(logic.can_borrow("Book", 40, 55, 0.0, False, False))
+
+        with open(self.path, "a") as f:
+            f.write("{")
+        with self.assertRaises(ValueError):
+            policy_file.reload_if_changed()
+        self.assertFalse(policy_file.reload_if_changed())
+        self.assertTrue(logic.can_borrow("Book", 40, 21, 0.0, False, False))
+        self.assertFalse(logic.can_borrow("Book", 40, 22, 0.0, False, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from src.query import PatronQuery
+import src.data_mgmt as data_mgmt
+
+
+class TestPatronQuery(unittest.TestCase):
+    """
+    Unit tests for the PatronQuery class.
+
+    This test suite aims to validate that compound queries return the same patrons as checking every
+    condition against every patron, and that the planner uses the most selective index available.
+
+    The following methods are tested:
+    - plan: Chooses the index used to find candidate patrons.
+    - run: Finds the patrons matching every condition of the query.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method initializes an instance of the DataManager class with patron data loaded.
+        """
+        self.manager = data_mgmt.DataManager()
+
+    def test_compound_query(self):
+        """
+        Test a query combining an age range, fees, and training.
+
+        This test verifies that the query finds the same patrons as a scan of the patron data.
+        """
+        found = PatronQuery(self.manager).age_between(65, 89).fees_above(5).makerspace_training().run()
+        expected = [p for p in self.manager._patron_data
+                    if 65 <= p._age <= 89 and p._outstanding_fees > 5 and p._makerspace_training]
+        self.assertTrue(len(expected) > 0)
+        self.assertCountEqual(found, expected)
+
+    def test_name_prefix_query(self):
+        """
+        Test a query combining a name prefix and an age range.
+
+        This test verifies that the name prefix is case insensitive.
+        """
+        found = PatronQuery(self.manager).name_prefix("tina").age_between(65, 89).run()
+        self.assertEqual([p._name for p in found], ["Tina Price"])
+
+    def test_plan_most_selective(self):
+        """
+        Test the planner's choice of index.
+
+        This test verifies that a name prefix matching few patrons is preferred over a wide age range.
+        """
+        query = PatronQuery(self.manager).age_between(0, 100).name_prefix("Tina")
+        self.assertEqual(query.plan()[0], "name prefix")
+        query = PatronQuery(self.manager).age(15).name_prefix("")
+        self.assertEqual(query.plan()[0], "age")
+
+    def test_plan_full_scan(self):
+        """
+        Test a query with no indexed conditions.
+
+        This test verifies that every patron is checked, and a query with no conditions matches every patron.
+        """
+        query = PatronQuery(self.manager).fees_at_most(0)
+        self.assertEqual(query.plan()[0], "full scan")
+        self.assertTrue(all(p._outstanding_fees <= 0 for p in query.run()))
+        self.assertEqual(len(PatronQuery(self.manager).run()), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
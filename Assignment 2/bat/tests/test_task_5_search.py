@@ -1,6 +1,7 @@
 import unittest
 import src.search as search
 import src.data_mgmt as data_mgmt
+from datetime import date
 
 class TestSearch(unittest.TestCase):
     """
@@ -12,8 +13,14 @@ class TestSearch(unittest.TestCase):
 
     The following functions are tested:
     - find_patron_by_name: Searches for patrons by their name.
+    - find_patron_by_similar_name: Searches for patrons by a possibly mistyped name.
     - find_patron_by_age: Searches for patrons by their age.
+    - find_patron_by_age_range: Searches for patrons with an age in a range.
     - find_patron_by_name_and_age: Searches for patrons by both their name and age.
+    - find_borrowers_of_item: Searches for the patrons currently borrowing an item.
+    - find_overdue_loans: Searches for loans that are overdue as of a date.
+    - find_loans_due_soon: Searches for loans due within a number of days of a date.
+    - find_item_by_id: Searches for an item by its ID, with and without the ID index.
     
     """
 
@@ -36,6 +43,28 @@ class TestSearch(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]._name, "Timothy Allen")
 
+    def test_find_patron_by_name_case_insensitive(self):
+        """
+        Test the find_patron_by_name function with a name in a different case, with and without the name index.
+
+        This test verifies that the search is case insensitive.
+        """
+        scanned = search.find_patron_by_name("TIMOTHY allen", self.manager._patron_data)
+        indexed = search.find_patron_by_name("TIMOTHY allen", self.manager._patron_data, self.manager._name_index)
+        self.assertEqual(len(scanned), 1)
+        self.assertEqual(scanned, indexed)
+
+    def test_find_patron_by_similar_name(self):
+        """
+        Test the find_patron_by_similar_name function with a mistyped name, with and without the name index.
+
+        This test verifies that "Timothy Alen" finds "Timothy Allen" first.
+        """
+        scanned = search.find_patron_by_similar_name("Timothy Alen", self.manager._patron_data)
+        indexed = search.find_patron_by_similar_name("Timothy Alen", self.manager._patron_data, self.manager._name_index)
+        self.assertEqual(scanned[0]._name, "Timothy Allen")
+        self.assertEqual(scanned, indexed)
+
     def test_find_patron_by_valid_age(self):
         """
         Test the find_patron_by_age function with a valid age.
@@ -47,6 +76,18 @@ class TestSearch(unittest.TestCase):
         self.assertEqual(result[0]._age, 15)
         self.assertEqual(result[0]._name, "Leon Kelly")
 
+    def test_find_patron_by_age_range(self):
+        """
+        Test the find_patron_by_age_range function with and without the age index.
+
+        This test verifies that the index finds the same patrons as the scan for the range 65 to 89.
+        """
+        scanned = search.find_patron_by_age_range(65, 89, self.manager._patron_data)
+        indexed = search.find_patron_by_age_range(65, 89, self.manager._patron_data, self.manager._age_index)
+        self.assertTrue(len(scanned) > 0)
+        self.assertTrue(all(65 <= p._age <= 89 for p in indexed))
+        self.assertCountEqual(scanned, indexed)
+
     def test_find_patron_by_valid_name_and_age(self):
         """
         Test the find_patron_by_name_and_age function with a valid name and age.
@@ -57,6 +98,17 @@ class TestSearch(unittest.TestCase):
         self.assertEqual(result._name, "Timothy Allen")
         self.assertEqual(result._age, 13)
 
+    def test_find_patron_by_name_and_age_index(self):
+        """
+        Test the find_patron_by_name_and_age function with the name and age index.
+
+        This test verifies that the index lookup is case insensitive and finds the same patron as the scan.
+        """
+        scanned = search.find_patron_by_name_and_age("timothy ALLEN", 13, self.manager._patron_data)
+        indexed = search.find_patron_by_name_and_age("timothy ALLEN", 13, self.manager._patron_data, self.manager._patron_index)
+        self.assertEqual(indexed._name, "Timothy Allen")
+        self.assertIs(scanned, indexed)
+
     def test_find_patron_by_invalid_name(self):
         """
         Test the find_patron_by_name function with an invalid name.
@@ -84,6 +136,60 @@ class TestSearch(unittest.TestCase):
         result = search.find_patron_by_name_and_age("Timothy Thumpkin", 1000, self.manager._patron_data)
         self.assertEqual(result, None)
 
+    def test_find_item_by_valid_id(self):
+        """
+        Test the find_item_by_id function with a valid ID.
+
+        This test verifies that the scan and the ID index find the same item.
+        """
+        scanned = search.find_item_by_id(3, self.manager._catalogue_data)
+        indexed = search.find_item_by_id(3, self.manager._catalogue_data, self.manager._catalogue_index)
+        self.assertEqual(scanned._id, 3)
+        self.assertIs(scanned, indexed)
+
+    def test_find_item_by_invalid_id(self):
+        """
+        Test the find_item_by_id function with an invalid ID.
+
+        This test verifies that the function returns None when the ID 1000 is not in the catalogue.
+        """
+        self.assertEqual(search.find_item_by_id(1000, self.manager._catalogue_data), None)
+        self.assertEqual(search.find_item_by_id(1000, self.manager._catalogue_data, self.manager._catalogue_index), None)
+
+    def test_find_borrowers_of_item(self):
+        """
+        Test the find_borrowers_of_item function with and without the loan index.
+
+        This test verifies that John Doe is the only patron borrowing item 3, and nobody is borrowing item 2.
+        """
+        scanned = search.find_borrowers_of_item(3, self.manager._patron_data)
+        indexed = search.find_borrowers_of_item(3, self.manager._patron_data, self.manager._loan_index)
+        self.assertEqual([p._name for p in scanned], ["John Doe"])
+        self.assertEqual(scanned, indexed)
+        self.assertEqual(search.find_borrowers_of_item(2, self.manager._patron_data, self.manager._loan_index), [])
+
+    def test_find_overdue_loans(self):
+        """
+        Test the find_overdue_loans function with and without the due date index.
+
+        This test verifies that only John Doe's loan of item 3 (due 15/06/2024) is overdue on 01/07/2024.
+        """
+        scanned = search.find_overdue_loans(date(2024, 7, 1), self.manager._patron_data)
+        indexed = search.find_overdue_loans(date(2024, 7, 1), self.manager._patron_data, self.manager._due_index)
+        self.assertEqual([(p._name, l._item._id) for p, l in scanned], [("John Doe", 3)])
+        self.assertEqual(scanned, indexed)
+
+    def test_find_loans_due_soon(self):
+        """
+        Test the find_loans_due_soon function with and without the due date index.
+
+        This test verifies that only John Doe's loan of item 1 (due 22/08/2024) is due in the 21 days from 01/08/2024.
+        """
+        scanned = search.find_loans_due_soon(date(2024, 8, 1), 21, self.manager._patron_data)
+        indexed = search.find_loans_due_soon(date(2024, 8, 1), 21, self.manager._patron_data, self.manager._due_index)
+        self.assertEqual([(p._name, l._item._id) for p, l in scanned], [("John Doe", 1)])
+        self.assertEqual(scanned, indexed)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
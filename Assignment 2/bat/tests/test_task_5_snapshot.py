@@ -0,0 +1,118 @@
+import unittest
+from unittest import mock
+import os
+import pickle
+import shutil
+import tempfile
+from src.data_mgmt import DataManager, SNAPSHOT_CLASSES
+from src.patron import Patron
+import src.snapshot as snapshot
+import src.config as config
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Unit tests for the snapshot cache used to start BAT quickly.
+
+    This test suite aims to validate that the data manager loads from a snapshot only while the data
+    files are unchanged, and that data loaded from a snapshot matches data loaded from the files.
+
+    The following are tested:
+    - fingerprint and class_layout: Identify the contents of the data files, and the layout of the classes
+      stored in a snapshot.
+    - load_snapshot and save_snapshot (through DataManager): Load and save snapshots of the loaded data.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method copies the data files and points the snapshot at a temporary directory.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config.PATRON_DATA = shutil.copy("data/patrons.json", self.temp_dir.name)
+        config.CATALOGUE_DATA = shutil.copy("data/catalogue.json", self.temp_dir.name)
+        config.SNAPSHOT_DATA = os.path.join(self.temp_dir.name, "snapshot.pickle")
+
+    def tearDown(self):
+        """
+        Restore the data file paths and remove the temporary directory after each test method.
+        """
+        config.PATRON_DATA = "data/patrons.json"
+        config.CATALOGUE_DATA = "data/catalogue.json"
+        config.SNAPSHOT_DATA = "data/snapshot.pickle"
+        self.temp_dir.cleanup()
+
+    def test_snapshot_used(self):
+        """
+        Test starting with an up to date snapshot.
+
+        This test verifies that the data files are not parsed, and the loaded data and indexes match.
+        """
+        first = DataManager()
+        self.assertTrue(os.path.exists(config.SNAPSHOT_DATA))
+
+        with mock.patch('src.data_mgmt.DataManager.load_patrons') as load_patrons:
+            second = DataManager()
+            load_patrons.assert_not_called()
+
+        encode = DataManager.PatronEncoder.to_record
+        self.assertEqual([encode(p) for p in second._patron_data], [encode(p) for p in first._patron_data])
+        self.assertEqual(len(second._catalogue_data), 7)
+        # loans are linked to the same item objects as the catalogue
+        john = second._patron_index[("john doe", 95)]
+        self.assertIs(john._loans[0]._item, second._catalogue_index[john._loans[0]._item._id])
+
+    def test_snapshot_invalidated(self):
+        """
+        Test starting after a data file has changed.
+
+        This test verifies that the changed file is parsed rather than using the out of date snapshot.
+        """
+        DataManager()
+        manager = DataManager()
+        manager.register_patron("Er Jun Yet", 25)
+        manager.save_patrons()
+
+        reloaded = DataManager()
+        self.assertEqual(len(reloaded._patron_data), 101)
+
+    def test_fingerprint_changes(self):
+        """
+        Test the fingerprint of a file whose contents change without its size changing.
+
+        This test verifies that the fingerprints differ.
+        """
+        before = snapshot.fingerprint([config.PATRON_DATA])
+        with open(config.PATRON_DATA, 'r+') as f:
+            text = f.read()
+            f.seek(0)
+            f.write(text.replace("John Doe", "Jane Doe", 1))
+        self.assertNotEqual(snapshot.fingerprint([config.PATRON_DATA]), before)
+
+
+    def test_snapshot_from_other_code(self):
+        """
+        Test starting with a snapshot made by a different version of the code.
+
+        This test verifies that the data files are parsed rather than using a snapshot whose classes had a
+        different layout, and that a snapshot which can not be unpickled is also ignored.
+        """
+        DataManager()
+        with mock.patch.object(Patron, "__slots__", Patron.__slots__ + ("_extra",)):
+            with mock.patch('src.data_mgmt.DataManager.load_patrons') as load_patrons:
+                DataManager()
+                load_patrons.assert_called_once()
+
+        source_fingerprint = snapshot.fingerprint([config.CATALOGUE_DATA, config.PATRON_DATA], SNAPSHOT_CLASSES)
+        with open(config.SNAPSHOT_DATA, 'wb') as f:
+            pickle.dump(source_fingerprint, f)
+            f.write(b"\x80\x05not a pickle")
+        self.assertIsNone(snapshot.load_snapshot(config.SNAPSHOT_DATA, source_fingerprint))
+        manager = DataManager()
+        self.assertEqual(len(manager._patron_data), 100)
+        self.assertIsNotNone(snapshot.load_snapshot(config.SNAPSHOT_DATA, source_fingerprint))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+from unittest import mock
+import os
+import tempfile
+from src.data_mgmt import DataManager
+from src.sqlite_store import migrate_json
+from src.business_logic import process_loan, process_loans, process_return
+from datetime import date
+import src.search as search
+import src.config as config
+
+
+class TestSqliteStore(unittest.TestCase):
+    """
+    Unit tests for the SQLite storage backend.
+
+    This test suite aims to validate that data migrated from the JSON files loads the same as the JSON
+    files themselves, and that changes made through the DataManager are written to the database as they
+    happen.
+
+    The following are tested:
+    - migrate_json: Copies JSON patron and catalogue data into a new database.
+    - SqliteItems and SqlitePatrons (through DataManager): Load data from the database as it is looked up.
+    - SqlitePatronKeys and the Sqlite*Index classes (through search): Find patrons and loans with the
+      database's indexes.
+    - SqliteStore.add_patrons, add_loans, and remove_loan (through DataManager): Write changes to the database.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test method.
+
+        This method migrates the JSON data into a database in a temporary directory, and selects the
+        SQLite backend.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config.SQLITE_DATA = os.path.join(self.temp_dir.name, "bat.db")
+        self.migrated = migrate_json("data/patrons.json", "data/catalogue.json", config.SQLITE_DATA)
+        config.STORAGE_BACKEND = "sqlite"
+
+    def tearDown(self):
+        """
+        Restore the JSON backend and remove the temporary directory after each test method.
+        """
+        config.STORAGE_BACKEND = "json"
+        config.SQLITE_DATA = "data/bat.db"
+        self.temp_dir.cleanup()
+
+    def test_migrated_data_matches(self):
+        """
+        Test loading migrated data.
+
+        This test verifies that every patron, item, and loan loaded from the database matches the JSON data.
+        """
+        self.assertEqual(self.migrated, (100, 7))
+        manager = DataManager()
+        config.STORAGE_BACKEND = "json"
+        expected = DataManager()
+
+        encode = DataManager.PatronEncoder.to_record
+        self.assertEqual([encode(p) for p in manager._patron_data], [encode(p) for p in expected._patron_data])
+        encode = DataManager.BorrowableItemEncoder.to_record
+        self.assertEqual([encode(i) for i in manager._catalogue_data], [encode(i) for i in expected._catalogue_data])
+        manager._store.close()
+
+    @mock.patch('src.business_logic.can_borrow')
+    def test_changes_written_through(self, mock_can_borrow):
+        """
+        Test that changes are written to the database without saving.
+
+        This test verifies that a registration, loan, and return are present when the database is next loaded,
+        and that quitting has nothing left to save.
+        """
+        mock_can_borrow.return_value = True
+        manager = DataManager()
+        manager.register_patron("Er Jun Yet", 25)
+        patron = manager._patron_data[-1]
+        process_loan(patron, manager._catalogue_index[2], 7, manager)
+        process_loan(patron, manager._catalogue_index[4], 7, manager)
+        process_return(patron, 4, manager)
+        self.assertFalse(manager.has_changes())
+        manager._store.close()
+
+        reloaded = DataManager()
+        patron = reloaded._patron_data[-1]
+        self.assertEqual((patron._id, patron._name, patron._age), (101, "Er Jun Yet", 25))
+        self.assertEqual([l._item._id for l in patron._loans], [2])
+        self.assertEqual(reloaded._catalogue_index[2]._on_loan, manager._catalogue_index[2]._on_loan)
+        reloaded._store.close()
+
+    def test_checkout_written_through(self):
+        """
+        Test that the loan of several items at once is written to the database without saving.
+
+        This test verifies that every loan and "on loan" count is present when the database is next loaded.
+        """
+        manager = DataManager()
+        patron = manager.register_patrons([("Er Jun Yet", 25)])[0]
+        books = [manager._catalogue_index[1], manager._catalogue_index[2]]
+        self.assertEqual(process_loans(patron, [(books[0], 7), (books[1], 7)], manager), [])
+        self.assertFalse(manager.has_changes())
+        manager._store.close()
+
+        reloaded = DataManager()
+        self.assertEqual([l._item._id for l in reloaded._patron_data[-1]._loans], [1, 2])
+        self.assertEqual([reloaded._catalogue_index[i]._on_loan for i in (1, 2)], [b._on_loan for b in books])
+        reloaded._store.close()
+
+    def test_queries_load_only_found(self):
+        """
+        Test searching the database directly.
+
+        This test verifies that searches by name and age, age, name, item, and due date find the same patrons
+        and loans as the JSON data, and that nothing is loaded up front and only the patrons found are loaded.
+        """
+        manager = DataManager()
+        config.STORAGE_BACKEND = "json"
+        expected = DataManager()
+        self.assertEqual(manager._patron_data._loaded, {})
+        self.assertEqual(manager._catalogue_index._loaded, {})
+
+        target = expected._patron_data[10]
+        found = search.find_patron_by_name_and_age(target._name.upper(), target._age, manager._patron_data, manager._patron_index)
+        self.assertEqual(found._id, target._id)
+        self.assertEqual(list(manager._patron_data._loaded), [target._id])
+        self.assertIsNone(search.find_patron_by_name_and_age(target._name, -1, manager._patron_data, manager._patron_index))
+        self.assertEqual(search.find_item_by_id(3, manager._catalogue_data, manager._catalogue_index)._id, 3)
+
+        ids = lambda patrons: [p._id for p in patrons]
+        self.assertEqual(ids(search.find_patron_by_age(target._age, manager._patron_data, manager._age_index)),
+                         ids(expected._age_index.find(target._age)))
+        self.assertEqual(ids(search.find_patron_by_name(target._name, manager._patron_data, manager._name_index)),
+                         ids(expected._name_index.find(target._name)))
+        self.assertEqual(ids(manager._name_index.find_prefix(target._name[:2])), ids(expected._name_index.find_prefix(target._name[:2])))
+        self.assertEqual(manager._age_index.count_range(20, 40), expected._age_index.count_range(20, 40))
+        self.assertEqual(ids(search.find_patron_by_similar_name(target._name, manager._patron_data, manager._name_index)),
+                         ids(expected._name_index.find_similar(target._name)))
+        self.assertLess(len(manager._patron_data._loaded), len(expected._patron_data))
+
+        pairs = lambda found: [(p._id, l._item._id, l._due_date) for p, l in found]
+        for item in expected._catalogue_data:
+            self.assertEqual(sorted(ids(search.find_borrowers_of_item(item._id, manager._patron_data, manager._loan_index))),
+                             sorted(p._id for p, l in expected._loan_index.find(item._id)))
+        as_of = date(2024, 7, 1)
+        self.assertEqual(pairs(search.find_overdue_loans(as_of, manager._patron_data, manager._due_index)),
+                         [(1, 3, date(2024, 6, 15))])
+        self.assertEqual(pairs(search.find_loans_due_soon(as_of, 60, manager._patron_data, manager._due_index)),
+                         [(1, 1, date(2024, 8, 22))])
+        manager._store.close()
+
+    def test_missing_database(self):
+        """
+        Test loading from a database which does not exist.
+
+        This test verifies that the program exits rather than creating an empty database.
+        """
+        config.SQLITE_DATA = os.path.join(self.temp_dir.name, "missing.db")
+        with self.assertRaises(SystemExit):
+            DataManager()
+        self.assertFalse(os.path.exists(config.SQLITE_DATA))
+
+
+if __name__ == '__main__':
+    unittest.main()